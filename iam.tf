@@ -38,6 +38,81 @@ data "aws_iam_policy_document" "vpc_auto_peering_lambda_policy" {
       "logs:PutLogEvents"
     ]
   }
+
+  dynamic "statement" {
+    for_each = var.use_queue_trigger ? [1] : []
+
+    content {
+      effect = "Allow"
+      resources = [aws_sqs_queue.infrastructure_events[0].arn]
+
+      actions = [
+        "sqs:ReceiveMessage",
+        "sqs:DeleteMessage",
+        "sqs:GetQueueAttributes"
+      ]
+    }
+  }
+
+  dynamic "statement" {
+    for_each = var.discovery_mode == "bucket" ? [1] : []
+
+    content {
+      effect = "Allow"
+      resources = ["arn:aws:s3:::${var.infrastructure_events_bucket_name}"]
+
+      actions = [
+        "s3:ListBucket"
+      ]
+    }
+  }
+
+  dynamic "statement" {
+    for_each = var.discovery_mode == "bucket" ? [1] : []
+
+    content {
+      effect = "Allow"
+      resources = ["arn:aws:s3:::${var.infrastructure_events_bucket_name}/${var.infrastructure_events_prefix}*"]
+
+      actions = [
+        "s3:GetObject"
+      ]
+    }
+  }
+
+  dynamic "statement" {
+    for_each = var.topology_snapshot_store == "s3" ? [1] : []
+
+    content {
+      effect = "Allow"
+      resources = ["arn:aws:s3:::${var.topology_snapshot_bucket}/${var.topology_snapshot_key}"]
+
+      actions = [
+        "s3:GetObject",
+        "s3:PutObject"
+      ]
+    }
+  }
+
+  dynamic "statement" {
+    for_each = var.skip_assume_role_in_current_account ? [1] : []
+
+    content {
+      effect = "Allow"
+      resources = ["*"]
+
+      actions = [
+        "ec2:DescribeVpcs",
+        "ec2:DescribeVpcPeeringConnections",
+        "ec2:CreateVpcPeeringConnection",
+        "ec2:AcceptVpcPeeringConnection",
+        "ec2:DeleteVpcPeeringConnection",
+        "ec2:DescribeRouteTables",
+        "ec2:CreateRoute",
+        "ec2:DeleteRoute"
+      ]
+    }
+  }
 }
 
 resource "aws_iam_role" "vpc_auto_peering_lambda" {
@@ -7,7 +7,7 @@ data "archive_file" "auto_peering_lambda_zip" {
 resource "aws_lambda_function" "auto_peering" {
   filename = data.archive_file.auto_peering_lambda_zip.output_path
   function_name = "vpc-auto-peering-lambda-${var.region}-${var.deployment_identifier}"
-  handler = "vpc_auto_peering_lambda.peer_vpcs_for"
+  handler = var.use_queue_trigger ? "vpc_auto_peering_lambda.peer_vpcs_for_queue_messages" : "vpc_auto_peering_lambda.peer_vpcs_for"
   role = aws_iam_role.vpc_auto_peering_lambda.arn
   runtime = "python3.6"
   timeout = 300
@@ -18,7 +18,26 @@ resource "aws_lambda_function" "auto_peering" {
     variables = {
       AWS_SEARCH_REGIONS = join(",", var.search_regions)
       AWS_SEARCH_ACCOUNTS = join(",", var.search_accounts)
+      AWS_SEARCH_CONCURRENCY = var.search_concurrency
+      AWS_EC2_MAX_POOL_CONNECTIONS = var.ec2_max_pool_connections
+      AWS_ROUTE_MUTATION_CONCURRENCY = var.route_mutation_concurrency
+      AWS_LINK_CONCURRENCY = var.link_concurrency
+      AWS_LINK_REGION_CONCURRENCY = var.link_region_concurrency
+      AWS_DISCOVERY_MODE = var.discovery_mode
+      AWS_INFRASTRUCTURE_EVENTS_BUCKET = var.infrastructure_events_bucket_name
+      AWS_INFRASTRUCTURE_EVENTS_PREFIX = var.infrastructure_events_prefix
+      AWS_READ_INFRASTRUCTURE_EVENTS_METADATA = var.read_infrastructure_events_metadata
+      AWS_PROVISIONING_MODE = var.provisioning_mode
+      AWS_COALESCING_WINDOW_SECONDS = var.coalescing_window_seconds
+      AWS_EVENT_STORE = var.event_store
+      AWS_EVENT_STORE_PATH = var.event_store_path
+      AWS_TOPOLOGY_CACHE_TTL_SECONDS = var.topology_cache_ttl_seconds
+      AWS_TOPOLOGY_SNAPSHOT_STORE = var.topology_snapshot_store
+      AWS_TOPOLOGY_SNAPSHOT_BUCKET = var.topology_snapshot_bucket
+      AWS_TOPOLOGY_SNAPSHOT_KEY = var.topology_snapshot_key
       AWS_PEERING_ROLE_NAME = var.peering_role_name
+      AWS_SKIP_ASSUME_ROLE_IN_CURRENT_ACCOUNT = var.skip_assume_role_in_current_account
+      AWS_STS_REGIONAL_ENDPOINTS = "regional"
     }
   }
 }
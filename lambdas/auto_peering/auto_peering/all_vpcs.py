@@ -1,62 +1,171 @@
+import logging
 from functools import lru_cache
 
+from botocore.exceptions import BotoCoreError, ClientError
+
+from auto_peering.concurrency import map_concurrently, first_concurrently
+from auto_peering.utils import hyphenated_splits
 from auto_peering.vpc import VPC
+from auto_peering.vpc_topology import VPCTopology
+
+DEFAULT_SEARCH_CONCURRENCY = 10
+MAX_FILTER_VALUES = 200
+
+FULL_DISCOVERY = 'full'
+TARGETED_DISCOVERY = 'targeted'
+BUCKET_DISCOVERY = 'bucket'
+DEFAULT_DISCOVERY_MODE = FULL_DISCOVERY
+
+
+def tag_filters_for(component_instance_identifiers):
+    splits = [
+        split
+        for identifier in component_instance_identifiers
+        for split in hyphenated_splits(identifier)
+    ]
+    return [
+        {'Name': 'tag:Component',
+         'Values': sorted(set(component for component, _ in splits))},
+        {'Name': 'tag:DeploymentIdentifier',
+         'Values': sorted(set(
+             deployment_identifier
+             for _, deployment_identifier in splits))}
+    ]
 
 
 class AllVPCs(object):
-    def __init__(self, ec2_gateways):
+    def __init__(self, ec2_gateways, logger=None,
+                 search_concurrency=DEFAULT_SEARCH_CONCURRENCY,
+                 discovery_mode=DEFAULT_DISCOVERY_MODE,
+                 vpcs=None):
         self.ec2_gateways = ec2_gateways
+        self.logger = logger or logging.getLogger(__name__)
+        self.search_concurrency = search_concurrency
+        self.discovery_mode = discovery_mode
+        self.vpcs = vpcs
+
+    def __vpcs_in(self, gateway_and_lister):
+        ec2_gateway, list_vpcs = gateway_and_lister
+        try:
+            return [
+                VPC(vpc_response,
+                    ec2_gateway.account_id,
+                    ec2_gateway.region)
+                for vpc_response in list_vpcs(ec2_gateway.resource())
+            ]
+        except (BotoCoreError, ClientError) as error:
+            self.logger.warn(
+                "Could not list VPCs in account: '%s' and region: '%s'. "
+                "Error was: %s",
+                ec2_gateway.account_id, ec2_gateway.region, error)
+            return []
+
+    def __first_vpc_in(self, gateway_and_lister):
+        return next(iter(self.__vpcs_in(gateway_and_lister)), None)
+
+    def __discover(self, ec2_gateways,
+                   list_vpcs=lambda ec2_resource: ec2_resource.vpcs.all()):
+        vpcs_by_gateway = map_concurrently(
+            self.__vpcs_in,
+            [(ec2_gateway, list_vpcs) for ec2_gateway in ec2_gateways],
+            self.search_concurrency)
+
+        return [vpc for vpcs in vpcs_by_gateway for vpc in vpcs]
 
     @lru_cache(maxsize=1)
     def find_all(self):
-        return [
-            VPC(vpc_response,
-                ec2_gateway.account_id,
-                ec2_gateway.region)
-            for ec2_gateway in self.ec2_gateways.all()
-            for vpc_response in ec2_gateway.resource().vpcs.all()
-        ]
+        if self.vpcs is not None:
+            return list(self.vpcs)
+        return self.__discover(self.ec2_gateways.all())
 
     @lru_cache(maxsize=32)
     def find_by_account_id(self, account_id):
-        return [
-            VPC(vpc_response,
-                ec2_gateway.account_id,
-                ec2_gateway.region)
-            for ec2_gateway in self.ec2_gateways.by_account_id(account_id)
-            for vpc_response in ec2_gateway.resource().vpcs.all()
+        if self.vpcs is not None:
+            return [vpc for vpc in self.vpcs if vpc.account_id == account_id]
+        return self.__discover(self.ec2_gateways.by_account_id(account_id))
+
+    def __find_by_vpc_id_in(self, ec2_gateways, vpc_id):
+        filters = [{'Name': 'vpc-id', 'Values': [vpc_id]}]
+        gateways_and_listers = [
+            (ec2_gateway,
+             lambda ec2_resource: ec2_resource.vpcs.filter(Filters=filters))
+            for ec2_gateway in ec2_gateways
         ]
 
+        return first_concurrently(
+            self.__first_vpc_in,
+            gateways_and_listers,
+            self.search_concurrency)
+
+    def fetch_by_account_id_and_vpc_id(self, account_id, vpc_id):
+        return self.__find_by_vpc_id_in(
+            self.ec2_gateways.by_account_id(account_id), vpc_id)
+
+    def fetch_by_account_id_and_vpc_ids(self, account_id, vpc_ids):
+        vpc_ids = sorted(vpc_ids)
+        ec2_gateways = self.ec2_gateways.by_account_id(account_id)
+
+        vpcs = []
+        for index in range(0, len(vpc_ids), MAX_FILTER_VALUES):
+            filters = [{'Name': 'vpc-id',
+                        'Values': vpc_ids[index:index + MAX_FILTER_VALUES]}]
+            vpcs.extend(self.__discover(
+                ec2_gateways,
+                lambda ec2_resource: ec2_resource.vpcs.filter(
+                    Filters=filters)))
+        return vpcs
+
     @lru_cache(maxsize=32)
     def find_by_account_id_and_vpc_id(self, account_id, vpc_id):
+        if self.discovery_mode == TARGETED_DISCOVERY:
+            return self.fetch_by_account_id_and_vpc_id(account_id, vpc_id)
         return next(
             (vpc
              for vpc in self.find_by_account_id(account_id)
              if vpc.id == vpc_id),
             None)
 
+    @lru_cache(maxsize=1)
+    def topology(self):
+        return VPCTopology(self.find_all())
+
     @lru_cache(maxsize=32)
     def find_by_component_instance_identifier(self, identifier):
-        return next(
-            (vpc
-             for vpc in self.find_all()
-             if vpc.component_instance_identifier == identifier),
-            None)
+        return self.topology().find_by_component_instance_identifier(
+            identifier)
+
+    def __find_dependencies_by_tag_filters_of(self, vpc):
+        if not vpc.dependencies:
+            return []
+
+        filters = tag_filters_for(vpc.dependencies)
+        candidate_vpcs = self.__discover(
+            self.ec2_gateways.all(),
+            lambda ec2_resource: ec2_resource.vpcs.filter(Filters=filters))
+
+        return VPCTopology(candidate_vpcs).find_dependencies_of(vpc)
 
     @lru_cache(maxsize=32)
     def find_dependencies_of(self, vpc):
-        return [
-            self.find_by_component_instance_identifier(
-                component_instance_identifier)
-            for component_instance_identifier in vpc.dependencies
-            if self.find_by_component_instance_identifier(
-                component_instance_identifier) is not None
-        ]
+        if self.discovery_mode == TARGETED_DISCOVERY:
+            return self.__find_dependencies_by_tag_filters_of(vpc)
+        return self.topology().find_dependencies_of(vpc)
+
+    def __find_dependents_by_tag_filters_of(self, vpc):
+        # The wildcard also matches identifiers that merely contain the
+        # target's, so candidates are verified against their parsed
+        # Dependencies tag.
+        filters = [{'Name': 'tag:Dependencies',
+                    'Values': ['*{}*'.format(
+                        vpc.component_instance_identifier)]}]
+        candidate_vpcs = self.__discover(
+            self.ec2_gateways.all(),
+            lambda ec2_resource: ec2_resource.vpcs.filter(Filters=filters))
+
+        return VPCTopology(candidate_vpcs).find_dependents_of(vpc)
 
     @lru_cache(maxsize=32)
     def find_dependents_of(self, vpc):
-        return [
-            dependent_vpc
-            for dependent_vpc in self.find_all()
-            if vpc.component_instance_identifier in dependent_vpc.dependencies
-        ]
+        if self.discovery_mode == TARGETED_DISCOVERY:
+            return self.__find_dependents_by_tag_filters_of(vpc)
+        return self.topology().find_dependents_of(vpc)
@@ -0,0 +1,126 @@
+import logging
+
+from botocore.exceptions import BotoCoreError, ClientError
+
+from auto_peering.all_vpcs import AllVPCs, DEFAULT_SEARCH_CONCURRENCY
+from auto_peering.concurrency import map_concurrently
+from auto_peering.topology_snapshots import SnapshotVPCResponse
+from auto_peering.vpc import VPC
+
+DEFAULT_INVENTORY_PREFIX = 'vpc-existence/'
+
+REQUIRED_METADATA = [
+    'region',
+    'cidr-block',
+    'component',
+    'deployment-identifier'
+]
+
+
+def tags_from(metadata):
+    return [
+        {'Key': 'Component', 'Value': metadata['component']},
+        {'Key': 'DeploymentIdentifier',
+         'Value': metadata['deployment-identifier']},
+        {'Key': 'Dependencies', 'Value': metadata.get('dependencies', '')}
+    ]
+
+
+class BucketVPCs(object):
+    def __init__(self, s3_client, bucket, ec2_gateways, logger=None,
+                 prefix=DEFAULT_INVENTORY_PREFIX,
+                 read_metadata=False,
+                 search_concurrency=DEFAULT_SEARCH_CONCURRENCY):
+        self.s3_client = s3_client
+        self.bucket = bucket
+        self.ec2_gateways = ec2_gateways
+        self.logger = logger or logging.getLogger(__name__)
+        self.prefix = prefix
+        self.read_metadata = read_metadata
+        self.search_concurrency = search_concurrency
+        self.all_vpcs = AllVPCs(
+            ec2_gateways, self.logger,
+            search_concurrency=search_concurrency)
+
+    def __keys(self):
+        paginator = self.s3_client.get_paginator('list_objects_v2')
+        return [
+            s3_object['Key']
+            for page in paginator.paginate(
+                Bucket=self.bucket, Prefix=self.prefix)
+            for s3_object in page.get('Contents', [])
+        ]
+
+    def __locations_in(self, keys, account_ids):
+        locations = []
+        for key in keys:
+            parts = key[len(self.prefix):].split('/')
+            if len(parts) != 2 or not all(parts):
+                self.logger.info(
+                    "Ignoring object with unexpected key: '%s'.", key)
+                continue
+            account_id, vpc_id = parts
+            if account_id in account_ids:
+                locations.append((key, account_id, vpc_id))
+        return locations
+
+    def __metadata_for(self, location):
+        key, _, _ = location
+        try:
+            return self.s3_client.head_object(
+                Bucket=self.bucket, Key=key)['Metadata']
+        except (BotoCoreError, ClientError) as error:
+            self.logger.warn(
+                "Could not read metadata of object: '%s'. Error was: %s",
+                key, error)
+            return {}
+
+    def __vpc_from(self, account_id, vpc_id, metadata):
+        region = metadata['region']
+        return VPC(
+            SnapshotVPCResponse(
+                self.ec2_gateways.by_account_id_and_region(
+                    account_id, region),
+                vpc_id, metadata['cidr-block'], tags_from(metadata)),
+            account_id, region)
+
+    def find_all(self):
+        searched = set(
+            (ec2_gateway.account_id, ec2_gateway.region)
+            for ec2_gateway in self.ec2_gateways.all())
+
+        try:
+            keys = self.__keys()
+        except (BotoCoreError, ClientError) as error:
+            self.logger.warn(
+                "Could not list objects in bucket: '%s'. Error was: %s",
+                self.bucket, error)
+            return None
+
+        locations = self.__locations_in(
+            keys, set(account_id for account_id, _ in searched))
+        metadatas = \
+            map_concurrently(
+                self.__metadata_for, locations, self.search_concurrency) \
+            if self.read_metadata \
+            else [{} for _ in locations]
+
+        vpcs = []
+        missing_vpc_ids = {}
+        for (_, account_id, vpc_id), metadata in zip(locations, metadatas):
+            if not all(name in metadata for name in REQUIRED_METADATA):
+                missing_vpc_ids.setdefault(account_id, set()).add(vpc_id)
+            elif (account_id, metadata['region']) in searched:
+                vpcs.append(self.__vpc_from(account_id, vpc_id, metadata))
+
+        for account_id, vpc_ids in sorted(missing_vpc_ids.items()):
+            vpcs.extend(self.all_vpcs.fetch_by_account_id_and_vpc_ids(
+                account_id, vpc_ids))
+
+        self.logger.info(
+            "Found %d VPCs in bucket: '%s', %d of which were looked up in "
+            "EC2 due to missing metadata.",
+            len(vpcs), self.bucket,
+            sum(len(vpc_ids) for vpc_ids in missing_vpc_ids.values()))
+
+        return vpcs
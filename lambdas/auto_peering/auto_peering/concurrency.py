@@ -0,0 +1,48 @@
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from threading import BoundedSemaphore, Lock
+
+
+def map_concurrently(function, items, max_workers):
+    items = list(items)
+    if max_workers <= 1 or len(items) <= 1:
+        return [function(item) for item in items]
+
+    with ThreadPoolExecutor(
+            max_workers=min(max_workers, len(items))) as executor:
+        return list(executor.map(function, items))
+
+
+def first_concurrently(function, items, max_workers):
+    items = list(items)
+    if max_workers <= 1 or len(items) <= 1:
+        return next(
+            (result
+             for result in (function(item) for item in items)
+             if result is not None),
+            None)
+
+    executor = ThreadPoolExecutor(max_workers=min(max_workers, len(items)))
+    futures = [executor.submit(function, item) for item in items]
+    try:
+        for future in as_completed(futures):
+            result = future.result()
+            if result is not None:
+                return result
+        return None
+    finally:
+        for future in futures:
+            future.cancel()
+        executor.shutdown(wait=False)
+
+
+class ConcurrencyLimits(object):
+    def __init__(self, limit):
+        self.limit = max(limit, 1)
+        self.__lock = Lock()
+        self.__semaphores = {}
+
+    def for_key(self, key):
+        with self.__lock:
+            if key not in self.__semaphores:
+                self.__semaphores[key] = BoundedSemaphore(self.limit)
+            return self.__semaphores[key]
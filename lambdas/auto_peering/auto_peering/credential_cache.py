@@ -0,0 +1,32 @@
+from threading import Lock
+
+from botocore.credentials import RefreshableCredentials
+
+
+class CredentialCache(object):
+    def __init__(self):
+        self.__credentials = {}
+        self.__lock = Lock()
+
+    def get(self, key, fetch):
+        with self.__lock:
+            credentials = self.__credentials.get(key)
+        if credentials is not None:
+            return credentials
+
+        # Refreshable credentials renew themselves ahead of expiry, in the
+        # advisory window without blocking other threads, so a cached entry
+        # remains usable for the lifetime of the process.
+        credentials = RefreshableCredentials.create_from_metadata(
+            metadata=fetch(),
+            refresh_using=fetch,
+            method='assume-role')
+        with self.__lock:
+            return self.__credentials.setdefault(key, credentials)
+
+    def clear(self):
+        with self.__lock:
+            self.__credentials.clear()
+
+
+credential_cache = CredentialCache()
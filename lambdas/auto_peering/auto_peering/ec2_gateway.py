@@ -1,14 +1,48 @@
+from threading import Lock, local
+
+from botocore.config import Config
+
+DEFAULT_MAX_POOL_CONNECTIONS = 10
+
+
 class EC2Gateway(object):
-    def __init__(self, session, account_id, region):
+    def __init__(self, session, account_id, region,
+                 max_pool_connections=DEFAULT_MAX_POOL_CONNECTIONS):
         self.session = session
         self.account_id = account_id
         self.region = region
+        self.max_pool_connections = max_pool_connections
+        self.__resource = None
+        self.__thread_resources = local()
+        self.__lock = Lock()
 
     def client(self):
-        return self.session.client('ec2', self.region)
+        # The resource's client shares its connection pool, so there is
+        # only ever one pool per account and region.
+        return self.__shared_resource().meta.client
+
+    def __shared_resource(self):
+        with self.__lock:
+            if self.__resource is None:
+                self.__resource = self.session.resource(
+                    'ec2', self.region,
+                    config=Config(
+                        max_pool_connections=self.max_pool_connections))
+                self.__thread_resources.resource = self.__resource
+            return self.__resource
 
     def resource(self):
-        return self.session.resource('ec2', self.region)
+        # boto3 clients are thread-safe but resources are not, so each thread
+        # gets its own resource wrapping the one shared client. Code running
+        # on worker threads should call this rather than be handed a
+        # resource built on another thread.
+        if not hasattr(self.__thread_resources, 'resource'):
+            shared_resource = self.__shared_resource()
+            if not hasattr(self.__thread_resources, 'resource'):
+                self.__thread_resources.resource = \
+                    shared_resource.__class__(
+                        client=shared_resource.meta.client)
+        return self.__thread_resources.resource
 
     def _to_dict(self):
         return {
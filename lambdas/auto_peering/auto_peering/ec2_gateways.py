@@ -1,30 +1,41 @@
-from auto_peering.ec2_gateway import EC2Gateway
+from threading import Lock
+
+from auto_peering.ec2_gateway import EC2Gateway, DEFAULT_MAX_POOL_CONNECTIONS
 
 
 class EC2Gateways(object):
-    def __init__(self, session_store, account_ids, regions):
+    def __init__(self, session_store, account_ids, regions,
+                 max_pool_connections=DEFAULT_MAX_POOL_CONNECTIONS):
         self.session_store = session_store
         self.account_ids = account_ids
         self.regions = regions
+        self.max_pool_connections = max_pool_connections
+        self.__ec2_gateways = {}
+        self.__lock = Lock()
 
     def all(self):
         return [
-            EC2Gateway(
-                self.session_store.get_session_for(account_id),
-                account_id,
-                region)
+            self.by_account_id_and_region(account_id, region)
             for account_id in self.account_ids
             for region in self.regions]
 
     def by_account_id_and_region(self, account_id, region):
-        return EC2Gateway(
-            self.session_store.get_session_for(account_id), account_id, region)
+        key = (account_id, region)
+        with self.__lock:
+            ec2_gateway = self.__ec2_gateways.get(key)
+        if ec2_gateway is not None:
+            return ec2_gateway
+
+        ec2_gateway = EC2Gateway(
+            self.session_store.get_session_for(account_id),
+            account_id,
+            region,
+            max_pool_connections=self.max_pool_connections)
+        with self.__lock:
+            return self.__ec2_gateways.setdefault(key, ec2_gateway)
 
     def by_account_id(self, account_id):
         return [
-            EC2Gateway(
-                self.session_store.get_session_for(account_id),
-                account_id,
-                region)
+            self.by_account_id_and_region(account_id, region)
             for region in self.regions
         ]
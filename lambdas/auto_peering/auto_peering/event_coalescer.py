@@ -0,0 +1,86 @@
+import time
+
+DEFAULT_COALESCING_WINDOW_SECONDS = 0
+
+COALESCED_ACTIONS = ['provision', 'destroy']
+
+
+class EventCoalescer(object):
+    def __init__(self, store, logger,
+                 window_seconds=DEFAULT_COALESCING_WINDOW_SECONDS,
+                 clock=time.time):
+        self.store = store
+        self.logger = logger
+        self.window_seconds = window_seconds
+        self.clock = clock
+
+    def __fold(self, targets):
+        actions_by_key = {}
+        keys = []
+        for account_id, vpc_id, action in targets:
+            if action not in COALESCED_ACTIONS:
+                self.logger.info(
+                    "Dropping unsupported '%s' event for '%s'.",
+                    action, vpc_id)
+                continue
+            key = (account_id, vpc_id)
+            if key not in actions_by_key:
+                keys.append(key)
+            actions_by_key.setdefault(key, []).append(action)
+        return keys, actions_by_key
+
+    def __recently_recorded(self, key, now):
+        recorded = self.store.get(key)
+        if recorded is None:
+            return None
+        action, recorded_at = recorded
+        if now - recorded_at > self.window_seconds:
+            return None
+        return action
+
+    def coalesce(self, targets):
+        if self.window_seconds <= 0:
+            return list(targets)
+
+        now = self.clock()
+        self.store.prune(now - self.window_seconds)
+
+        keys, actions_by_key = self.__fold(targets)
+        coalesced = []
+        for key in keys:
+            account_id, vpc_id = key
+            actions = actions_by_key[key]
+            action = actions[-1]
+            recorded_action = self.__recently_recorded(key, now)
+
+            if actions[0] == 'provision' and action == 'destroy' and \
+                    recorded_action != 'provision':
+                self.logger.info(
+                    "Dropping '%s' events for '%s' as it was created and "
+                    "destroyed within the coalescing window.",
+                    ', '.join(actions), vpc_id)
+                continue
+            # A repeated provision is kept, as a VPC's object is rewritten
+            # when its tags change and its new dependencies need peering.
+            if action == 'destroy' and recorded_action == 'destroy':
+                self.logger.info(
+                    "Dropping '%s' event for '%s' as it was already "
+                    "processed within the coalescing window.",
+                    action, vpc_id)
+                continue
+            if len(actions) > 1:
+                self.logger.info(
+                    "Coalesced %d events for '%s' into '%s'.",
+                    len(actions), vpc_id, action)
+
+            coalesced.append((account_id, vpc_id, action))
+
+        return coalesced
+
+    def record(self, targets):
+        if self.window_seconds <= 0:
+            return
+
+        now = self.clock()
+        for account_id, vpc_id, action in targets:
+            self.store.put((account_id, vpc_id), action, now)
@@ -0,0 +1,78 @@
+import sqlite3
+from functools import lru_cache
+from threading import Lock
+
+MEMORY_EVENT_STORE = 'memory'
+SQLITE_EVENT_STORE = 'sqlite'
+DEFAULT_EVENT_STORE = MEMORY_EVENT_STORE
+DEFAULT_EVENT_STORE_PATH = '/tmp/vpc-auto-peering-events.sqlite'
+
+
+class InMemoryEventStore(object):
+    def __init__(self):
+        self.__events = {}
+        self.__lock = Lock()
+
+    def get(self, key):
+        with self.__lock:
+            return self.__events.get(key)
+
+    def put(self, key, action, recorded_at):
+        with self.__lock:
+            self.__events[key] = (action, recorded_at)
+
+    def prune(self, recorded_before):
+        with self.__lock:
+            for key, (_, recorded_at) in list(self.__events.items()):
+                if recorded_at < recorded_before:
+                    del self.__events[key]
+
+
+class SQLiteEventStore(object):
+    def __init__(self, path):
+        self.path = path
+        self.__lock = Lock()
+        self.__connection = sqlite3.connect(path, check_same_thread=False)
+        with self.__connection:
+            self.__connection.execute(
+                'CREATE TABLE IF NOT EXISTS events ('
+                'account_id TEXT NOT NULL, '
+                'vpc_id TEXT NOT NULL, '
+                'action TEXT NOT NULL, '
+                'recorded_at REAL NOT NULL, '
+                'PRIMARY KEY (account_id, vpc_id))')
+
+    def get(self, key):
+        account_id, vpc_id = key
+        with self.__lock:
+            row = self.__connection.execute(
+                'SELECT action, recorded_at FROM events '
+                'WHERE account_id = ? AND vpc_id = ?',
+                (account_id, vpc_id)).fetchone()
+        return tuple(row) if row else None
+
+    def put(self, key, action, recorded_at):
+        account_id, vpc_id = key
+        with self.__lock, self.__connection:
+            self.__connection.execute(
+                'INSERT OR REPLACE INTO events '
+                '(account_id, vpc_id, action, recorded_at) '
+                'VALUES (?, ?, ?, ?)',
+                (account_id, vpc_id, action, recorded_at))
+
+    def prune(self, recorded_before):
+        with self.__lock, self.__connection:
+            self.__connection.execute(
+                'DELETE FROM events WHERE recorded_at < ?',
+                (recorded_before,))
+
+    def close(self):
+        with self.__lock:
+            self.__connection.close()
+
+
+@lru_cache(maxsize=None)
+def event_store_for(kind, path=DEFAULT_EVENT_STORE_PATH):
+    if kind == SQLITE_EVENT_STORE:
+        return SQLiteEventStore(path)
+    return InMemoryEventStore()
@@ -0,0 +1,81 @@
+import logging
+from threading import Lock
+
+from botocore.exceptions import BotoCoreError, ClientError
+
+from auto_peering.all_vpcs import (
+    DEFAULT_SEARCH_CONCURRENCY,
+    MAX_FILTER_VALUES)
+from auto_peering.concurrency import map_concurrently
+
+
+class PrivateRouteTables(object):
+    def __init__(self, ec2_gateways, logger=None,
+                 search_concurrency=DEFAULT_SEARCH_CONCURRENCY):
+        self.ec2_gateways = ec2_gateways
+        self.logger = logger or logging.getLogger(__name__)
+        self.search_concurrency = search_concurrency
+        self.__pending_vpc_ids = {}
+        self.__included_vpc_ids = set()
+        self.__route_tables_by_vpc_id = {}
+        self.__lock = Lock()
+        self.__load_lock = Lock()
+
+    def include(self, vpcs):
+        with self.__lock:
+            for vpc in vpcs:
+                if vpc.id not in self.__included_vpc_ids:
+                    self.__included_vpc_ids.add(vpc.id)
+                    self.__pending_vpc_ids.setdefault(
+                        (vpc.account_id, vpc.region), set()).add(vpc.id)
+
+    def __route_tables_in(self, gateway_and_vpc_ids):
+        ec2_gateway, vpc_ids = gateway_and_vpc_ids
+        ec2_resource = ec2_gateway.resource()
+        try:
+            return list(ec2_resource.route_tables.filter(
+                Filters=[
+                    {'Name': 'vpc-id', 'Values': vpc_ids},
+                    {'Name': 'tag:Tier', 'Values': ['private']}]))
+        except (BotoCoreError, ClientError) as error:
+            self.logger.warn(
+                "Could not list route tables in account: '%s' and region: "
+                "'%s'. Error was: %s",
+                ec2_gateway.account_id, ec2_gateway.region, error)
+            return []
+
+    def load(self):
+        # Loads are serialised so that a lookup never observes a VPC as
+        # loaded while its route tables are still being fetched.
+        with self.__load_lock:
+            with self.__lock:
+                pending_vpc_ids = sorted(self.__pending_vpc_ids.items())
+                self.__pending_vpc_ids = {}
+
+            gateways_and_vpc_ids = []
+            for (account_id, region), vpc_ids in pending_vpc_ids:
+                ec2_gateway = self.ec2_gateways.by_account_id_and_region(
+                    account_id, region)
+                vpc_ids = sorted(vpc_ids)
+                for index in range(0, len(vpc_ids), MAX_FILTER_VALUES):
+                    gateways_and_vpc_ids.append(
+                        (ec2_gateway,
+                         vpc_ids[index:index + MAX_FILTER_VALUES]))
+
+            route_tables_by_chunk = map_concurrently(
+                self.__route_tables_in,
+                gateways_and_vpc_ids,
+                self.search_concurrency)
+
+            with self.__lock:
+                for route_tables in route_tables_by_chunk:
+                    for route_table in route_tables:
+                        self.__route_tables_by_vpc_id.setdefault(
+                            route_table.vpc_id, []).append(route_table)
+
+    def find_for(self, vpc):
+        self.include([vpc])
+        self.load()
+
+        with self.__lock:
+            return list(self.__route_tables_by_vpc_id.get(vpc.id, []))
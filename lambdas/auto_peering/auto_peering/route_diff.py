@@ -0,0 +1,57 @@
+UP_TO_DATE = 'up-to-date'
+MISSING = 'missing'
+STALE = 'stale'
+CONFLICTING = 'conflicting'
+
+
+def route_to(route_table, destination_cidr_block):
+    return next(
+        (route
+         for route in route_table.routes_attribute or []
+         if route.get('DestinationCidrBlock') == destination_cidr_block),
+        None)
+
+
+def route_state_for(route_table, destination_cidr_block,
+                    vpc_peering_connection_id):
+    route = route_to(route_table, destination_cidr_block)
+    if route is None:
+        return MISSING
+    if route.get('State') == 'blackhole':
+        return STALE
+    if route.get('VpcPeeringConnectionId') == vpc_peering_connection_id:
+        return UP_TO_DATE
+    return CONFLICTING
+
+
+class RouteDiff(object):
+    def __init__(self, route_tables, destination_cidr_block,
+                 vpc_peering_connection_id):
+        self.route_tables_by_state = {
+            UP_TO_DATE: [],
+            MISSING: [],
+            STALE: [],
+            CONFLICTING: []
+        }
+        for route_table in route_tables:
+            self.route_tables_by_state[
+                route_state_for(
+                    route_table,
+                    destination_cidr_block,
+                    vpc_peering_connection_id)].append(route_table)
+
+    @property
+    def up_to_date(self):
+        return self.route_tables_by_state[UP_TO_DATE]
+
+    @property
+    def missing(self):
+        return self.route_tables_by_state[MISSING]
+
+    @property
+    def stale(self):
+        return self.route_tables_by_state[STALE]
+
+    @property
+    def conflicting(self):
+        return self.route_tables_by_state[CONFLICTING]
@@ -2,13 +2,23 @@ import json
 import re
 
 
+def s3_events_in(event):
+    return [
+        json.loads(sns_record['Sns']['Message'])
+        for sns_record in event.get('Records', [])
+    ]
+
+
 class S3EventSNSMessage(object):
-    def __init__(self, event):
+    def __init__(self, event, sns_record_index=0, s3_record_index=0):
         self.event = event
+        self.sns_record_index = sns_record_index
+        self.s3_record_index = s3_record_index
 
     def __s3_event(self):
-        sns_message = self.event['Records'][0]['Sns']['Message']
-        s3_event = json.loads(sns_message)['Records'][0]
+        sns_message = \
+            self.event['Records'][self.sns_record_index]['Sns']['Message']
+        s3_event = json.loads(sns_message)['Records'][self.s3_record_index]
         return s3_event
 
     def __s3_event_name(self):
@@ -37,3 +47,28 @@ class S3EventSNSMessage(object):
 
     def vpc_id(self):
         return self.__s3_object_key_parts()[2]
+
+    def target(self):
+        return self.account_id(), self.vpc_id(), self.action()
+
+
+class S3EventSNSMessages(object):
+    def __init__(self, event):
+        self.event = event
+
+    def all(self):
+        return [
+            S3EventSNSMessage(self.event, sns_record_index, s3_record_index)
+            for sns_record_index, s3_event
+            in enumerate(s3_events_in(self.event))
+            for s3_record_index, _
+            in enumerate(s3_event.get('Records', []))
+        ]
+
+    def targets(self):
+        targets = []
+        for message in self.all():
+            target = message.target()
+            if target not in targets:
+                targets.append(target)
+        return targets
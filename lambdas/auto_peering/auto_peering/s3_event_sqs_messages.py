@@ -0,0 +1,72 @@
+import json
+import logging
+
+from auto_peering.s3_event_sns_message import S3EventSNSMessages
+
+
+def s3_event_message_in(sqs_record):
+    body = sqs_record['body']
+    notification = json.loads(body)
+    if 'Message' in notification and 'Records' not in notification:
+        return notification['Message']
+    return body
+
+
+class S3EventSQSMessages(object):
+    def __init__(self, event, logger=None):
+        self.event = event
+        self.logger = logger or logging.getLogger(__name__)
+
+    def __targets_in(self, sqs_record):
+        try:
+            return S3EventSNSMessages(
+                {'Records': [
+                    {'Sns': {'Message': s3_event_message_in(sqs_record)}}
+                ]}).targets()
+        except (ValueError, KeyError, IndexError, TypeError) as error:
+            self.logger.warn(
+                "Could not parse message: '%s'. Error was: %s",
+                sqs_record.get('messageId'), error)
+            return None
+
+    def all(self):
+        return [
+            (sqs_record['messageId'], self.__targets_in(sqs_record))
+            for sqs_record in self.event.get('Records', [])
+        ]
+
+    def process_with(self, manage_peering_for):
+        # Messages are reported as failed, and so redelivered, when they
+        # could not be parsed or when any of their targets failed. Targets
+        # dropped during processing, for example by coalescing, succeed.
+        messages = self.all()
+        targets = []
+        for _, message_targets in messages:
+            for target in message_targets or []:
+                if target not in targets:
+                    targets.append(target)
+
+        try:
+            failed_targets = manage_peering_for(targets) if targets else []
+        except Exception as error:
+            self.logger.warn(
+                "Could not process %d messages. Error was: %s",
+                len(messages), error)
+            failed_targets = targets
+
+        failed_message_ids = [
+            message_id
+            for message_id, message_targets in messages
+            if message_targets is None or
+            any(target in failed_targets for target in message_targets)
+        ]
+        self.logger.info(
+            "Processed %d messages. Failed: %d.",
+            len(messages), len(failed_message_ids))
+
+        return {
+            'batchItemFailures': [
+                {'itemIdentifier': message_id}
+                for message_id in failed_message_ids
+            ]
+        }
@@ -1,25 +1,145 @@
 import boto3
-from functools import lru_cache
+import botocore.session
+from botocore.credentials import CredentialProvider, CredentialResolver
+from botocore.exceptions import BotoCoreError, ClientError
+from botocore.loaders import create_loader
+from functools import lru_cache, partial
+from threading import Lock
+
+from auto_peering.concurrency import map_concurrently
+from auto_peering.credential_cache import credential_cache
 
 
 def role_arn_for(account_id, peering_role_name):
     return "arn:aws:iam::%s:role/%s" % (account_id, peering_role_name)
 
 
+def iso8601_for(timestamp):
+    if hasattr(timestamp, 'isoformat'):
+        return timestamp.isoformat()
+    return timestamp
+
+
+@lru_cache(maxsize=1)
+def shared_data_loader():
+    return create_loader()
+
+
+shared_data_loader_lock = Lock()
+
+
+def botocore_session_with_shared_data_loader():
+    botocore_session = botocore.session.get_session()
+    botocore_session.register_component('data_loader', shared_data_loader())
+    return botocore_session
+
+
+def assume_role_in(client, account_id, peering_role_name):
+    assumed_role_response = \
+        client.assume_role(
+            RoleArn=role_arn_for(account_id, peering_role_name),
+            RoleSessionName="vpc-auto-peering-lambda")
+    credentials = assumed_role_response['Credentials']
+
+    return {
+        'access_key': credentials['AccessKeyId'],
+        'secret_key': credentials['SecretAccessKey'],
+        'token': credentials['SessionToken'],
+        'expiry_time': iso8601_for(credentials['Expiration'])
+    }
+
+
+class StaticCredentialProvider(CredentialProvider):
+    METHOD = 'vpc-auto-peering-assume-role'
+
+    def __init__(self, credentials):
+        super(StaticCredentialProvider, self).__init__()
+        self.credentials = credentials
+
+    def load(self):
+        return self.credentials
+
+
+def use_credentials(botocore_session, credentials):
+    botocore_session.register_component(
+        'credential_provider',
+        CredentialResolver(providers=[StaticCredentialProvider(credentials)]))
+    return botocore_session
+
+
+def boto3_session_for(botocore_session):
+    # Every boto3 session appends its own data directory to the loader's
+    # search paths, so they are deduplicated to keep the shared loader from
+    # growing with each session built in a warm process.
+    with shared_data_loader_lock:
+        session = boto3.session.Session(botocore_session=botocore_session)
+        search_paths = \
+            botocore_session.get_component('data_loader').search_paths
+        search_paths[:] = [
+            search_path
+            for index, search_path in enumerate(search_paths)
+            if search_path not in search_paths[:index]
+        ]
+    return session
+
+
 class SessionStore(object):
-    def __init__(self, client, peering_role_name):
+    def __init__(self, client, peering_role_name, credentials=None,
+                 ambient_account_id=None):
         self.client = client
         self.peering_role_name = peering_role_name
+        self.credentials = credentials or credential_cache
+        self.ambient_account_id = ambient_account_id
+        self.__sessions = {}
+        self.__lock = Lock()
+
+    def get_credentials_for(self, account_id):
+        # The refresh function is bound to the client rather than the store,
+        # so cached credentials do not keep a discarded store's sessions.
+        return self.credentials.get(
+            (account_id, self.peering_role_name),
+            partial(
+                assume_role_in, self.client, account_id,
+                self.peering_role_name))
+
+    def __try_get_credentials_for(self, account_id):
+        try:
+            self.get_credentials_for(account_id)
+            return None
+        except (BotoCoreError, ClientError) as error:
+            return account_id, error
+
+    def prefetch_credentials_for(self, account_ids, concurrency):
+        return [
+            failure
+            for failure in map_concurrently(
+                self.__try_get_credentials_for,
+                [account_id
+                 for account_id in account_ids
+                 if account_id != self.ambient_account_id],
+                concurrency)
+            if failure is not None
+        ]
+
+    def __build_session_for(self, account_id):
+        botocore_session = botocore_session_with_shared_data_loader()
+        if account_id == self.ambient_account_id:
+            return boto3_session_for(botocore_session)
+
+        use_credentials(
+            botocore_session, self.get_credentials_for(account_id))
+
+        return boto3_session_for(botocore_session)
 
-    @lru_cache(maxsize=32)
     def get_session_for(self, account_id):
-        assumed_role_response = \
-            self.client.assume_role(
-                RoleArn=role_arn_for(account_id, self.peering_role_name),
-                RoleSessionName="vpc-auto-peering-lambda")
-        credentials = assumed_role_response['Credentials']
-
-        return boto3.session.Session(
-            aws_access_key_id=credentials['AccessKeyId'],
-            aws_secret_access_key=credentials['SecretAccessKey'],
-            aws_session_token=credentials['SessionToken'])
+        # Sessions live only as long as the store, which the handler builds
+        # per invocation; the credentials behind them outlive it in the
+        # credential cache.
+        with self.__lock:
+            session = self.__sessions.get(account_id)
+        if session is not None:
+            return session
+
+        session = self.__build_session_for(account_id)
+        with self.__lock:
+            return self.__sessions.setdefault(account_id, session)
@@ -0,0 +1,58 @@
+import os
+import tempfile
+
+from botocore.exceptions import ClientError
+
+NO_SNAPSHOT_STORE = 'none'
+FILESYSTEM_SNAPSHOT_STORE = 'filesystem'
+S3_SNAPSHOT_STORE = 's3'
+DEFAULT_SNAPSHOT_STORE = NO_SNAPSHOT_STORE
+DEFAULT_SNAPSHOT_PATH = '/tmp/vpc-auto-peering-topology.json.gz'
+DEFAULT_SNAPSHOT_KEY = 'vpc-auto-peering/topology.json.gz'
+
+
+class FileSystemSnapshotStore(object):
+    def __init__(self, path):
+        self.path = path
+
+    def read(self):
+        try:
+            with open(self.path, 'rb') as snapshot_file:
+                return snapshot_file.read()
+        except FileNotFoundError:
+            return None
+
+    def write(self, data):
+        # Written to a sibling file and renamed so that a concurrent reader
+        # never sees a partially written snapshot.
+        directory = os.path.dirname(os.path.abspath(self.path))
+        descriptor, temporary_path = tempfile.mkstemp(dir=directory)
+        try:
+            with os.fdopen(descriptor, 'wb') as snapshot_file:
+                snapshot_file.write(data)
+            os.replace(temporary_path, self.path)
+        except Exception:
+            os.remove(temporary_path)
+            raise
+
+
+class S3SnapshotStore(object):
+    def __init__(self, s3_client, bucket, key=DEFAULT_SNAPSHOT_KEY):
+        self.s3_client = s3_client
+        self.bucket = bucket
+        self.key = key
+
+    def read(self):
+        try:
+            response = self.s3_client.get_object(
+                Bucket=self.bucket, Key=self.key)
+        except ClientError as error:
+            if error.response['Error']['Code'] in ('NoSuchKey', '404'):
+                return None
+            raise
+        return response['Body'].read()
+
+    def write(self, data):
+        self.s3_client.put_object(
+            Bucket=self.bucket, Key=self.key, Body=data,
+            ContentType='application/gzip')
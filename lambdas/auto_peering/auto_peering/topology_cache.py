@@ -0,0 +1,103 @@
+import time
+from threading import Lock
+
+DEFAULT_TOPOLOGY_CACHE_TTL_SECONDS = 0
+
+
+def vpc_state_for(vpc):
+    return (vpc.account_id, vpc.region, vpc.cidr_block, vpc.tags)
+
+
+class CachedTopology(object):
+    def __init__(self, key, vpcs, peering_connections, built_at):
+        self.key = key
+        self.vpcs = vpcs
+        self.peering_connections = peering_connections
+        self.built_at = built_at
+
+
+class TopologyCache(object):
+    def __init__(self, clock=time.time):
+        self.clock = clock
+        self.__topology = None
+        self.__dirty = False
+        self.__saved_peering_revision = None
+        self.__lock = Lock()
+
+    def get(self, key, ttl_seconds):
+        with self.__lock:
+            topology = self.__topology
+            if topology is None or topology.key != key:
+                return None
+            if self.clock() - topology.built_at > ttl_seconds:
+                self.__topology = None
+                return None
+            return topology
+
+    def put(self, key, vpcs, peering_connections, built_at=None):
+        with self.__lock:
+            # A topology given its own build time was restored from a
+            # snapshot, so it only needs saving once it has been patched.
+            self.__topology = CachedTopology(
+                key, vpcs, peering_connections,
+                self.clock() if built_at is None else built_at)
+            self.__dirty = built_at is None
+            self.__saved_peering_revision = peering_connections.revision
+            return self.__topology
+
+    def update(self, vpcs):
+        # Incoming VPCs replace cached ones with the same id, in place, so
+        # changes to their tags or CIDR are picked up before the TTL expires.
+        with self.__lock:
+            if self.__topology is None or self.__topology.vpcs is None:
+                return
+            vpcs_by_id = dict((vpc.id, vpc) for vpc in vpcs)
+            cached_states_by_id = dict(
+                (vpc.id, vpc_state_for(vpc)) for vpc in self.__topology.vpcs)
+            self.__topology.vpcs = [
+                vpcs_by_id.get(vpc.id, vpc)
+                for vpc in self.__topology.vpcs
+            ] + [
+                vpc for vpc in vpcs if vpc.id not in cached_states_by_id
+            ]
+            if any(cached_states_by_id.get(vpc.id) != vpc_state_for(vpc)
+                   for vpc in vpcs):
+                self.__dirty = True
+
+    def evict(self, vpc_ids):
+        vpc_ids = set(vpc_ids)
+        with self.__lock:
+            if self.__topology is None or self.__topology.vpcs is None:
+                return
+            remaining_vpcs = [
+                vpc for vpc in self.__topology.vpcs
+                if vpc.id not in vpc_ids]
+            if len(remaining_vpcs) != len(self.__topology.vpcs):
+                self.__dirty = True
+            self.__topology.vpcs = remaining_vpcs
+
+    @property
+    def dirty(self):
+        # Peering connections are patched in place by the links using them,
+        # so their revision is compared against the one last saved.
+        with self.__lock:
+            if self.__topology is None:
+                return False
+            return self.__dirty or \
+                self.__topology.peering_connections.revision != \
+                self.__saved_peering_revision
+
+    def mark_saved(self):
+        with self.__lock:
+            if self.__topology is None:
+                return
+            self.__dirty = False
+            self.__saved_peering_revision = \
+                self.__topology.peering_connections.revision
+
+    def clear(self):
+        with self.__lock:
+            self.__topology = None
+
+
+topology_cache = TopologyCache()
@@ -0,0 +1,217 @@
+import gzip
+import json
+import logging
+
+from botocore.exceptions import BotoCoreError, ClientError
+
+from auto_peering.all_vpcs import DEFAULT_SEARCH_CONCURRENCY
+from auto_peering.topology_cache import CachedTopology
+from auto_peering.vpc import VPC
+from auto_peering.vpc_peering_connections import (
+    VPCPeeringConnections,
+    status_for)
+
+SNAPSHOT_FORMAT_VERSION = 1
+
+
+def tag_pairs_for(tags):
+    return [[tag['Key'], tag['Value']] for tag in tags or []]
+
+
+def tags_for(tag_pairs):
+    return [{'Key': key, 'Value': value} for key, value in tag_pairs]
+
+
+def vpc_info_record_for(vpc_info):
+    return [vpc_info['VpcId'], vpc_info.get('OwnerId'), vpc_info.get('Region')]
+
+
+def vpc_info_for(vpc_info_record):
+    vpc_id, owner_id, region = vpc_info_record
+    return {'VpcId': vpc_id, 'OwnerId': owner_id, 'Region': region}
+
+
+class SnapshotVPCResponse(object):
+    def __init__(self, ec2_gateway, id, cidr_block, tags):
+        self.ec2_gateway = ec2_gateway
+        self.id = id
+        self.cidr_block = cidr_block
+        self.tags = tags
+
+    def request_vpc_peering_connection(self, **kwargs):
+        return self.ec2_gateway.resource().Vpc(self.id) \
+            .request_vpc_peering_connection(**kwargs)
+
+    def _to_dict(self):
+        return {
+            'id': self.id,
+            'cidr_block': self.cidr_block,
+            'tags': self.tags
+        }
+
+    def __repr__(self):
+        return "<%s.%s object at %s: %s>" % (
+            self.__class__.__module__,
+            self.__class__.__name__,
+            hex(id(self)),
+            repr(self._to_dict()))
+
+    def __eq__(self, other):
+        if isinstance(other, self.__class__):
+            return self._to_dict() == other._to_dict()
+        return NotImplemented
+
+    def __ne__(self, other):
+        if isinstance(other, self.__class__):
+            return not self.__eq__(other)
+        return NotImplemented
+
+    def __hash__(self):
+        return hash(self.id)
+
+
+class SnapshotVPCPeeringConnection(object):
+    def __init__(self, ec2_gateway, id, requester_vpc_info,
+                 accepter_vpc_info, status):
+        self.ec2_gateway = ec2_gateway
+        self.id = id
+        self.requester_vpc_info = requester_vpc_info
+        self.accepter_vpc_info = accepter_vpc_info
+        self.status = status
+
+    @property
+    def requester_vpc(self):
+        return self.ec2_gateway.resource().Vpc(
+            self.requester_vpc_info['VpcId'])
+
+    @property
+    def accepter_vpc(self):
+        return self.ec2_gateway.resource().Vpc(
+            self.accepter_vpc_info['VpcId'])
+
+    def accept(self):
+        return self.ec2_gateway.resource() \
+            .VpcPeeringConnection(self.id).accept()
+
+    def delete(self):
+        return self.ec2_gateway.resource() \
+            .VpcPeeringConnection(self.id).delete()
+
+
+class TopologySnapshots(object):
+    def __init__(self, store, ec2_gateways, logger=None,
+                 search_concurrency=DEFAULT_SEARCH_CONCURRENCY):
+        self.store = store
+        self.ec2_gateways = ec2_gateways
+        self.logger = logger or logging.getLogger(__name__)
+        self.search_concurrency = search_concurrency
+
+    def encode(self, topology):
+        peering_connections = topology.peering_connections
+        document = {
+            'version': SNAPSHOT_FORMAT_VERSION,
+            'key': topology.key,
+            'built_at': topology.built_at,
+            'vpcs': None if topology.vpcs is None else [
+                [vpc.id, vpc.account_id, vpc.region, vpc.cidr_block,
+                 tag_pairs_for(vpc.tags)]
+                for vpc in topology.vpcs
+            ],
+            'peering': {
+                'vpc_ids': sorted(peering_connections.loaded_vpc_ids()),
+                'connections': [
+                    [connection.id,
+                     vpc_info_record_for(connection.requester_vpc_info),
+                     vpc_info_record_for(connection.accepter_vpc_info),
+                     status_for(connection)]
+                    for connection in peering_connections.all()
+                ]
+            }
+        }
+        return gzip.compress(json.dumps(
+            document, separators=(',', ':'), sort_keys=True).encode('utf-8'))
+
+    def __decode(self, data):
+        try:
+            return json.loads(gzip.decompress(data).decode('utf-8'))
+        except (OSError, ValueError) as error:
+            self.logger.warn(
+                "Could not decode topology snapshot. Error was: %s", error)
+            return None
+
+    def __vpcs_from(self, vpc_records):
+        return [
+            VPC(SnapshotVPCResponse(
+                self.ec2_gateways.by_account_id_and_region(
+                    account_id, region),
+                vpc_id, cidr_block, tags_for(tag_pairs)),
+                account_id, region)
+            for vpc_id, account_id, region, cidr_block, tag_pairs
+            in vpc_records
+        ]
+
+    def __peering_connections_from(self, peering_record):
+        peering_connections = VPCPeeringConnections(
+            self.ec2_gateways, self.logger,
+            search_concurrency=self.search_concurrency)
+        peering_connections.seed(
+            peering_record['vpc_ids'],
+            [SnapshotVPCPeeringConnection(
+                self.ec2_gateways.by_account_id_and_region(
+                    accepter_vpc_info_record[1], accepter_vpc_info_record[2]),
+                connection_id,
+                vpc_info_for(requester_vpc_info_record),
+                vpc_info_for(accepter_vpc_info_record),
+                {'Code': status})
+             for connection_id, requester_vpc_info_record,
+                 accepter_vpc_info_record, status
+             in peering_record['connections']])
+        return peering_connections
+
+    def load(self, key, ttl_seconds, now):
+        try:
+            data = self.store.read()
+        except (BotoCoreError, ClientError, OSError) as error:
+            self.logger.warn(
+                "Could not read topology snapshot. Error was: %s", error)
+            return None
+        if data is None:
+            self.logger.info("No topology snapshot found.")
+            return None
+
+        document = self.__decode(data)
+        if document is None:
+            return None
+        if document.get('version') != SNAPSHOT_FORMAT_VERSION:
+            self.logger.info(
+                "Ignoring topology snapshot with unsupported version: %s.",
+                document.get('version'))
+            return None
+        if document['key'] != json.loads(json.dumps(key)):
+            self.logger.info(
+                "Ignoring topology snapshot built for a different search "
+                "configuration.")
+            return None
+        if now - document['built_at'] > ttl_seconds:
+            self.logger.info("Ignoring expired topology snapshot.")
+            return None
+
+        vpcs = None if document['vpcs'] is None \
+            else self.__vpcs_from(document['vpcs'])
+        peering_connections = self.__peering_connections_from(
+            document['peering'])
+        self.logger.info(
+            "Loaded topology snapshot with %s VPCs and %d peering "
+            "connections.",
+            'no' if vpcs is None else len(vpcs),
+            len(document['peering']['connections']))
+
+        return CachedTopology(
+            key, vpcs, peering_connections, document['built_at'])
+
+    def save(self, topology):
+        try:
+            self.store.write(self.encode(topology))
+        except (BotoCoreError, ClientError, OSError) as error:
+            self.logger.warn(
+                "Could not write topology snapshot. Error was: %s", error)
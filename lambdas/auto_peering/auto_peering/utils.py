@@ -4,3 +4,11 @@ def split_and_strip(comma_separated_tag_value):
         (tag_value.strip()
          for tag_value
          in comma_separated_tag_value.split(','))))
+
+
+def hyphenated_splits(hyphenated_value):
+    parts = hyphenated_value.split('-')
+    return [
+        ('-'.join(parts[:index]), '-'.join(parts[index:]))
+        for index in range(1, len(parts))
+    ]
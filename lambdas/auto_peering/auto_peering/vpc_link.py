@@ -3,18 +3,23 @@ from auto_peering.vpc_peering_route import VPCPeeringRoute
 
 
 class VPCLink(object):
-    def __init__(self, ec2_gateways, logger, between, routes):
+    def __init__(self, ec2_gateways, logger, between, routes,
+                 peering_connections=None, route_tables=None,
+                 mutation_limits=None):
         self.between = between
         self.peering_relationship = VPCPeeringRelationship(
             ec2_gateways,
             logger,
-            between=between)
+            between=between,
+            peering_connections=peering_connections)
         self.peering_routes = [
             VPCPeeringRoute(
                 ec2_gateways,
                 logger,
                 between=route,
-                peering_relationship=self.peering_relationship)
+                peering_relationship=self.peering_relationship,
+                route_tables=route_tables,
+                mutation_limits=mutation_limits)
             for route in routes
         ]
 
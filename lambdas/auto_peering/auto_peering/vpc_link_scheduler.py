@@ -0,0 +1,168 @@
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+DEFAULT_LINK_CONCURRENCY = 5
+DEFAULT_LINK_REGION_CONCURRENCY = 3
+
+SUCCEEDED = 'succeeded'
+FAILED = 'failed'
+SKIPPED = 'skipped'
+
+
+class Task(object):
+    def __init__(self, index, name, region, vpc_ids, function):
+        self.index = index
+        self.name = name
+        self.region = region
+        self.vpc_ids = vpc_ids
+        self.function = function
+        self.dependents = []
+        self.pending_dependencies = 0
+        self.outcome = None
+
+    def depends_on(self, task):
+        task.dependents.append(self)
+        self.pending_dependencies += 1
+
+
+class VPCLinkScheduler(object):
+    def __init__(self, logger,
+                 concurrency=DEFAULT_LINK_CONCURRENCY,
+                 region_concurrency=DEFAULT_LINK_REGION_CONCURRENCY):
+        self.logger = logger
+        self.concurrency = max(concurrency, 1)
+        self.region_concurrency = max(region_concurrency, 1)
+
+    def __relationship_task(self, index, vpc_link, action,
+                            perform_relationship):
+        vpc1, vpc2 = vpc_link.between
+        relationship = vpc_link.peering_relationship
+
+        def manage_relationship():
+            if perform_relationship:
+                self.logger.info(
+                    "Managing peering relationship between '%s' and '%s'.",
+                    vpc1.id, vpc2.id)
+                relationship.perform(action)
+            if action == 'provision' and relationship.fetch() is None:
+                return FAILED
+            return SUCCEEDED
+
+        return Task(
+            index,
+            "peering relationship between '%s' and '%s'" % (vpc1.id, vpc2.id),
+            vpc1.region,
+            (vpc1.id, vpc2.id),
+            manage_relationship)
+
+    def __route_task(self, index, route, action):
+        def manage_routes():
+            self.logger.info(
+                "Managing peering routes between '%s' and '%s'.",
+                route.vpc1.id, route.vpc2.id)
+            counts = route.perform(action)
+            if counts and counts.get('failed'):
+                return FAILED
+            return SUCCEEDED
+
+        return Task(
+            index,
+            "peering routes from '%s' to '%s'" % (route.vpc1.id, route.vpc2.id),
+            route.vpc1.region,
+            (route.vpc1.id, route.vpc2.id),
+            manage_routes)
+
+    def __tasks_for(self, vpc_links, action, perform_relationships):
+        tasks = []
+        for vpc_link in sorted(
+                vpc_links,
+                key=lambda link: tuple(vpc.id for vpc in link.between)):
+            relationship_task = self.__relationship_task(
+                len(tasks), vpc_link, action, perform_relationships)
+            tasks.append(relationship_task)
+            for route in vpc_link.peering_routes:
+                route_task = self.__route_task(len(tasks), route, action)
+                tasks.append(route_task)
+                if action == 'destroy':
+                    relationship_task.depends_on(route_task)
+                else:
+                    route_task.depends_on(relationship_task)
+        return tasks
+
+    def __run(self, task):
+        try:
+            return task.function()
+        except Exception as error:
+            self.logger.warn(
+                "Managing %s failed. Error was: %s", task.name, error)
+            return FAILED
+
+    def __skip(self, task):
+        task.outcome = SKIPPED
+        for dependent in task.dependents:
+            self.__skip(dependent)
+
+    def __release_dependents_of(self, task, ready):
+        for dependent in task.dependents:
+            if task.outcome != SUCCEEDED:
+                self.__skip(dependent)
+                continue
+            dependent.pending_dependencies -= 1
+            if dependent.pending_dependencies == 0 and \
+                    dependent.outcome is None:
+                ready.append(dependent)
+        ready.sort(key=lambda ready_task: ready_task.index)
+
+    def __launch(self, executor, ready, running, running_by_region):
+        for task in list(ready):
+            if len(running) >= self.concurrency:
+                return
+            if running_by_region[task.region] >= self.region_concurrency:
+                continue
+            ready.remove(task)
+            running_by_region[task.region] += 1
+            running[executor.submit(self.__run, task)] = task
+
+    def __log_summary_of(self, tasks, action):
+        for task in tasks:
+            self.logger.info("Task '%s' for %s %s.",
+                             action, task.name, task.outcome)
+
+        outcomes = Counter(task.outcome for task in tasks)
+        summary = {
+            SUCCEEDED: outcomes[SUCCEEDED],
+            FAILED: outcomes[FAILED],
+            SKIPPED: outcomes[SKIPPED],
+            'failed_vpc_ids': sorted(set(
+                vpc_id
+                for task in tasks
+                if task.outcome != SUCCEEDED
+                for vpc_id in task.vpc_ids))
+        }
+        self.logger.info(
+            "Completed %d '%s' tasks. Succeeded: %d, failed: %d, "
+            "skipped: %d.",
+            len(tasks), action,
+            summary[SUCCEEDED], summary[FAILED], summary[SKIPPED])
+
+        return summary
+
+    def run(self, vpc_links, action, perform_relationships=True):
+        tasks = self.__tasks_for(vpc_links, action, perform_relationships)
+
+        ready = [task for task in tasks if task.pending_dependencies == 0]
+        running = {}
+        running_by_region = Counter()
+
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            while ready or running:
+                self.__launch(executor, ready, running, running_by_region)
+                done, _ = wait(list(running), return_when=FIRST_COMPLETED)
+                for future in sorted(
+                        done, key=lambda finished: running[finished].index):
+                    task = running.pop(future)
+                    running_by_region[task.region] -= 1
+                    task.outcome = future.result()
+                    self.__release_dependents_of(task, ready)
+
+        return self.__log_summary_of(tasks, action)
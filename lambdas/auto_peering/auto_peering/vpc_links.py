@@ -1,15 +1,51 @@
-from auto_peering.all_vpcs import AllVPCs
+from auto_peering.all_vpcs import (
+    AllVPCs,
+    DEFAULT_SEARCH_CONCURRENCY,
+    DEFAULT_DISCOVERY_MODE)
+from auto_peering.concurrency import ConcurrencyLimits
+from auto_peering.private_route_tables import PrivateRouteTables
 from auto_peering.vpc_link import VPCLink
+from auto_peering.vpc_peering_connections import VPCPeeringConnections
+from auto_peering.vpc_peering_relationships import VPCPeeringRelationships
+from auto_peering.vpc_peering_route import DEFAULT_ROUTE_MUTATION_CONCURRENCY
 
 
 class VPCLinks(object):
-    def __init__(self, ec2_gateways, logger):
+    def __init__(self, ec2_gateways, logger,
+                 search_concurrency=DEFAULT_SEARCH_CONCURRENCY,
+                 discovery_mode=DEFAULT_DISCOVERY_MODE,
+                 route_mutation_concurrency=DEFAULT_ROUTE_MUTATION_CONCURRENCY,
+                 vpcs=None,
+                 peering_connections=None):
         self.ec2_gateways = ec2_gateways
-        self.all_vpcs = AllVPCs(self.ec2_gateways)
+        self.all_vpcs = AllVPCs(
+            self.ec2_gateways,
+            logger,
+            search_concurrency=search_concurrency,
+            discovery_mode=discovery_mode,
+            vpcs=vpcs)
+        self.peering_connections = peering_connections or \
+            VPCPeeringConnections(
+                self.ec2_gateways,
+                logger,
+                search_concurrency=search_concurrency)
+        self.route_tables = PrivateRouteTables(
+            self.ec2_gateways,
+            logger,
+            search_concurrency=search_concurrency)
+        self.mutation_limits = ConcurrencyLimits(route_mutation_concurrency)
+        self.peering_relationships = VPCPeeringRelationships(
+            self.ec2_gateways,
+            logger,
+            mutation_limits=self.mutation_limits)
         self.logger = logger
 
     def __vpc_link(self, between, routes):
-        return VPCLink(self.ec2_gateways, self.logger, between, routes)
+        return VPCLink(
+            self.ec2_gateways, self.logger, between, routes,
+            peering_connections=self.peering_connections,
+            route_tables=self.route_tables,
+            mutation_limits=self.mutation_limits)
 
     def resolve_for(self, target_account_id, target_vpc_id):
         self.logger.info(
@@ -52,6 +88,10 @@ class VPCLinks(object):
                     dependent_vpc.id)
                 for dependent_vpc in dependent_vpcs]))
 
+        linked_vpcs = [target_vpc] + dependency_vpcs + dependent_vpcs
+        self.peering_connections.include(linked_vpcs)
+        self.route_tables.include(linked_vpcs)
+
         bidirectional_vpc_links = [
             self.__vpc_link(
                 between=[target_vpc, dependency_vpc],
@@ -84,3 +124,14 @@ class VPCLinks(object):
             dependent_only_vpc_links
 
         return frozenset(vpc_links)
+
+    def resolve_for_all(self, targets):
+        vpc_links = {}
+        for target_account_id, target_vpc_id in targets:
+            for vpc_link in sorted(
+                    self.resolve_for(target_account_id, target_vpc_id),
+                    key=lambda link: tuple(vpc.id for vpc in link.between)):
+                vpc_links.setdefault(
+                    frozenset(vpc.id for vpc in vpc_link.between), vpc_link)
+
+        return frozenset(vpc_links.values())
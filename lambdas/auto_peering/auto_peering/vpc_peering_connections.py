@@ -0,0 +1,150 @@
+import logging
+from threading import Lock
+
+from botocore.exceptions import BotoCoreError, ClientError
+
+from auto_peering.all_vpcs import (
+    DEFAULT_SEARCH_CONCURRENCY,
+    MAX_FILTER_VALUES)
+from auto_peering.concurrency import map_concurrently
+
+LIVE_STATUSES = [
+    'active',
+    'pending-acceptance',
+    'provisioning',
+    'initiating-request'
+]
+
+
+def vpc_pair_for(vpc_peering_connection):
+    return frozenset([
+        vpc_peering_connection.requester_vpc_info['VpcId'],
+        vpc_peering_connection.accepter_vpc_info['VpcId']])
+
+
+def status_for(vpc_peering_connection):
+    return vpc_peering_connection.status['Code']
+
+
+class VPCPeeringConnections(object):
+    def __init__(self, ec2_gateways, logger=None,
+                 search_concurrency=DEFAULT_SEARCH_CONCURRENCY):
+        self.ec2_gateways = ec2_gateways
+        self.logger = logger or logging.getLogger(__name__)
+        self.search_concurrency = search_concurrency
+        self.__pending_vpc_ids = {}
+        self.__included_vpc_ids = set()
+        self.__connections = {}
+        self.__revision = 0
+        self.__lock = Lock()
+        self.__load_lock = Lock()
+
+    @property
+    def revision(self):
+        with self.__lock:
+            return self.__revision
+
+    def __add(self, vpc_peering_connection):
+        key = (vpc_pair_for(vpc_peering_connection),
+               status_for(vpc_peering_connection))
+        if key not in self.__connections:
+            self.__connections[key] = vpc_peering_connection
+            self.__revision += 1
+
+    def include(self, vpcs):
+        with self.__lock:
+            for vpc in vpcs:
+                if vpc.id not in self.__included_vpc_ids:
+                    self.__included_vpc_ids.add(vpc.id)
+                    self.__pending_vpc_ids.setdefault(
+                        (vpc.account_id, vpc.region), set()).add(vpc.id)
+
+    def __connections_accepted_by(self, gateway_and_vpc_ids):
+        ec2_gateway, vpc_ids = gateway_and_vpc_ids
+        ec2_resource = ec2_gateway.resource()
+        try:
+            return list(ec2_resource.vpc_peering_connections.filter(
+                Filters=[{'Name': 'accepter-vpc-info.vpc-id',
+                          'Values': vpc_ids}]))
+        except (BotoCoreError, ClientError) as error:
+            self.logger.warn(
+                "Could not list VPC peering connections in account: '%s' "
+                "and region: '%s'. Error was: %s",
+                ec2_gateway.account_id, ec2_gateway.region, error)
+            return []
+
+    def load(self):
+        # Loads are serialised so that a lookup never observes a VPC as
+        # loaded while its connections are still being fetched.
+        with self.__load_lock:
+            with self.__lock:
+                pending_vpc_ids = sorted(self.__pending_vpc_ids.items())
+                self.__pending_vpc_ids = {}
+
+            gateways_and_vpc_ids = []
+            for (account_id, region), vpc_ids in pending_vpc_ids:
+                ec2_gateway = self.ec2_gateways.by_account_id_and_region(
+                    account_id, region)
+                vpc_ids = sorted(vpc_ids)
+                for index in range(0, len(vpc_ids), MAX_FILTER_VALUES):
+                    gateways_and_vpc_ids.append(
+                        (ec2_gateway,
+                         vpc_ids[index:index + MAX_FILTER_VALUES]))
+
+            connections_by_chunk = map_concurrently(
+                self.__connections_accepted_by,
+                gateways_and_vpc_ids,
+                self.search_concurrency)
+
+            with self.__lock:
+                for connections in connections_by_chunk:
+                    for connection in connections:
+                        self.__add(connection)
+                if pending_vpc_ids:
+                    self.__revision += 1
+
+    def seed(self, vpc_ids, vpc_peering_connections):
+        # Seeded VPCs are treated as already loaded, so their connections
+        # are served from the seed rather than fetched again.
+        with self.__lock:
+            self.__included_vpc_ids.update(vpc_ids)
+            for vpc_peering_connection in vpc_peering_connections:
+                self.__add(vpc_peering_connection)
+            self.__revision += 1
+
+    def loaded_vpc_ids(self):
+        with self.__lock:
+            pending_vpc_ids = set(
+                vpc_id
+                for vpc_ids in self.__pending_vpc_ids.values()
+                for vpc_id in vpc_ids)
+            return self.__included_vpc_ids - pending_vpc_ids
+
+    def all(self):
+        with self.__lock:
+            return list(self.__connections.values())
+
+    def add(self, vpc_peering_connection):
+        with self.__lock:
+            self.__add(vpc_peering_connection)
+
+    def remove(self, vpc_peering_connection):
+        with self.__lock:
+            pair = vpc_pair_for(vpc_peering_connection)
+            for status in LIVE_STATUSES:
+                if self.__connections.get((pair, status)) is \
+                        vpc_peering_connection:
+                    del self.__connections[(pair, status)]
+                    self.__revision += 1
+
+    def find_between(self, vpc1, vpc2):
+        self.include([vpc1, vpc2])
+        self.load()
+
+        pair = frozenset([vpc1.id, vpc2.id])
+        with self.__lock:
+            return next(
+                (self.__connections[(pair, status)]
+                 for status in LIVE_STATUSES
+                 if (pair, status) in self.__connections),
+                None)
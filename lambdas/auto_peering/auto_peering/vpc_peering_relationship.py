@@ -1,12 +1,19 @@
+from threading import Lock
+
 from botocore.exceptions import ClientError
 
 
 class VPCPeeringRelationship(object):
-    def __init__(self, ec2_gateways, logger, between):
+    def __init__(self, ec2_gateways, logger, between,
+                 peering_connections=None):
         self.vpc1 = between[0]
         self.vpc2 = between[1]
         self.ec2_gateways = ec2_gateways
         self.logger = logger
+        self.peering_connections = peering_connections
+        self.__cached_peering_connection = None
+        self.__cached = False
+        self.__cache_lock = Lock()
 
     def __peering_connection_for(self, vpc1, vpc2):
         ec2_gateway = \
@@ -22,7 +29,20 @@ class VPCPeeringRelationship(object):
                           'Values': [vpc2.id]}])),
             None)
 
-    def fetch(self):
+    def __cache(self, peering_connection):
+        with self.__cache_lock:
+            self.__cached_peering_connection = peering_connection
+            self.__cached = True
+
+    def __invalidate(self):
+        with self.__cache_lock:
+            self.__cached_peering_connection = None
+            self.__cached = False
+
+    def __lookup(self):
+        if self.peering_connections is not None:
+            return self.peering_connections.find_between(self.vpc1, self.vpc2)
+
         peering_connection = self.__peering_connection_for(
             self.vpc1, self.vpc2)
         if peering_connection:
@@ -35,24 +55,62 @@ class VPCPeeringRelationship(object):
 
         return None
 
-    def provision(self):
-        vpc1_id = self.vpc1.id
-        vpc2_id = self.vpc2.id
+    def fetch(self):
+        with self.__cache_lock:
+            if self.__cached:
+                return self.__cached_peering_connection
+
+        peering_connection = self.__lookup()
+        self.__cache(peering_connection)
+
+        return peering_connection
 
-        vpc2_region = self.vpc2.region
-        vpc2_account_id = self.vpc2.account_id
+    @property
+    def accepter_account_id(self):
+        return self.vpc2.account_id
 
+    @property
+    def accepter_region(self):
+        return self.vpc2.region
+
+    def request(self):
         self.logger.info(
             "Requesting peering connection between: '%s' and: '%s'.",
-            vpc1_id, vpc2_id)
-        requester_vpc_peering_connection = self. \
-            vpc1.request_vpc_peering_connection(PeerOwnerId=vpc2_account_id,
-                                                PeerVpcId=vpc2_id,
-                                                PeerRegion=vpc2_region)
+            self.vpc1.id, self.vpc2.id)
+        return self.vpc1.request_vpc_peering_connection(
+            PeerOwnerId=self.vpc2.account_id,
+            PeerVpcId=self.vpc2.id,
+            PeerRegion=self.vpc2.region)
+
+    def accept(self, requester_vpc_peering_connection,
+               acceptor_vpc_peering_connection):
+        self.logger.info(
+            "Accepting peering connection between: '%s' and: '%s'.",
+            self.vpc1.id, self.vpc2.id)
+        try:
+            acceptor_vpc_peering_connection.accept()
+        except ClientError as error:
+            self.abandon(requester_vpc_peering_connection, error)
+            return
+
+        if self.peering_connections is not None:
+            self.peering_connections.add(acceptor_vpc_peering_connection)
+        self.__cache(acceptor_vpc_peering_connection)
+
+    def abandon(self, requester_vpc_peering_connection, error):
+        self.logger.warn(
+            "Could not accept peering connection between: '%s' and: '%s'. "
+            "Error was: %s",
+            self.vpc1.id, self.vpc2.id, error)
+        requester_vpc_peering_connection.delete()
+        self.__invalidate()
+
+    def provision(self):
+        requester_vpc_peering_connection = self.request()
 
         try:
-            ec2_gateway = self.ec2_gateways.\
-                by_account_id_and_region(vpc2_account_id, vpc2_region)
+            ec2_gateway = self.ec2_gateways.by_account_id_and_region(
+                self.accepter_account_id, self.accepter_region)
             ec2_resource = ec2_gateway.resource()
             ec2_client = ec2_gateway.client()
 
@@ -61,28 +119,23 @@ class VPCPeeringRelationship(object):
             self.logger.info(
                 "Waiting for peering connection between: '%s' and: '%s' to "
                 "exist.",
-                vpc1_id, vpc2_id)
+                self.vpc1.id, self.vpc2.id)
             waiter = ec2_client.get_waiter('vpc_peering_connection_exists')
             waiter.wait(
                 VpcPeeringConnectionIds=[vpc_peering_connection_id],
                 WaiterConfig={'Delay': 2, 'MaxAttempts': 10})
 
-            self.logger.info(
-                "Accepting peering connection between: '%s' and: '%s'.",
-                vpc1_id, vpc2_id)
-
             acceptor_vpc_peering_connection = next(iter(
                 ec2_resource.vpc_peering_connections.filter(
                     VpcPeeringConnectionIds=[
                         vpc_peering_connection_id
                     ])), None)
-            acceptor_vpc_peering_connection.accept()
         except ClientError as error:
-            self.logger.warn(
-                "Could not accept peering connection between: '%s' and: '%s'. "
-                "Error was: %s",
-                vpc1_id, vpc2_id, error)
-            requester_vpc_peering_connection.delete()
+            self.abandon(requester_vpc_peering_connection, error)
+            return
+
+        self.accept(
+            requester_vpc_peering_connection, acceptor_vpc_peering_connection)
 
     def destroy(self):
         vpc_peering_connection = self.fetch()
@@ -92,6 +145,10 @@ class VPCPeeringRelationship(object):
                 vpc_peering_connection.requester_vpc.id,
                 vpc_peering_connection.accepter_vpc.id)
             vpc_peering_connection.delete()
+
+            if self.peering_connections is not None:
+                self.peering_connections.remove(vpc_peering_connection)
+            self.__invalidate()
         else:
             self.logger.info(
                 "No peering connection to destroy between: '%s' and: '%s'.",
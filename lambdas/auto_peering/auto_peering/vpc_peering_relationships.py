@@ -0,0 +1,168 @@
+import time
+
+from botocore.exceptions import BotoCoreError, ClientError
+
+from auto_peering.concurrency import map_concurrently, ConcurrencyLimits
+
+SERIAL_PROVISIONING = 'serial'
+BATCHED_PROVISIONING = 'batched'
+DEFAULT_PROVISIONING_MODE = SERIAL_PROVISIONING
+
+DEFAULT_PEERING_CONCURRENCY = 5
+
+READY_STATUSES = ('pending-acceptance', 'active')
+DEAD_STATUSES = ('failed', 'rejected', 'expired', 'deleted', 'deleting')
+
+
+class VPCPeeringRelationships(object):
+    def __init__(self, ec2_gateways, logger,
+                 mutation_limits=None,
+                 wait_delay=2,
+                 wait_max_attempts=10,
+                 sleep=time.sleep):
+        self.ec2_gateways = ec2_gateways
+        self.logger = logger
+        self.mutation_limits = mutation_limits or \
+            ConcurrencyLimits(DEFAULT_PEERING_CONCURRENCY)
+        self.wait_delay = wait_delay
+        self.wait_max_attempts = wait_max_attempts
+        self.sleep = sleep
+
+    def __request(self, relationship):
+        try:
+            return relationship, relationship.request()
+        except (BotoCoreError, ClientError) as error:
+            self.logger.warn(
+                "Could not request peering connection between: '%s' and: "
+                "'%s'. Error was: %s",
+                relationship.vpc1.id, relationship.vpc2.id, error)
+            return relationship, None
+
+    def __statuses_of(self, ec2_client, vpc_peering_connection_ids):
+        response = ec2_client.describe_vpc_peering_connections(
+            Filters=[{'Name': 'vpc-peering-connection-id',
+                      'Values': sorted(vpc_peering_connection_ids)}])
+        return {
+            vpc_peering_connection['VpcPeeringConnectionId']:
+                vpc_peering_connection['Status']['Code']
+            for vpc_peering_connection
+            in response['VpcPeeringConnections']
+        }
+
+    def __wait_for(self, ec2_client, vpc_peering_connection_ids):
+        pending = set(vpc_peering_connection_ids)
+        ready = set()
+
+        for attempt in range(self.wait_max_attempts):
+            if attempt > 0:
+                self.sleep(self.wait_delay)
+            try:
+                statuses = self.__statuses_of(ec2_client, pending)
+            except (BotoCoreError, ClientError) as error:
+                self.logger.warn(
+                    "Could not describe peering connections: [%s]. "
+                    "Error was: %s",
+                    ', '.join(sorted(pending)), error)
+                continue
+
+            for vpc_peering_connection_id, status in statuses.items():
+                if status in READY_STATUSES:
+                    ready.add(vpc_peering_connection_id)
+                    pending.discard(vpc_peering_connection_id)
+                elif status in DEAD_STATUSES:
+                    pending.discard(vpc_peering_connection_id)
+            if not pending:
+                break
+
+        return ready
+
+    def __wait_in(self, group):
+        (account_id, region), requested = group
+        ec2_client = self.ec2_gateways.\
+            by_account_id_and_region(account_id, region).client()
+
+        self.logger.info(
+            "Waiting for %d peering connections in account: '%s' and "
+            "region: '%s' to exist.",
+            len(requested), account_id, region)
+
+        return self.__wait_for(
+            ec2_client,
+            [requester_vpc_peering_connection.id
+             for _, requester_vpc_peering_connection in requested])
+
+    def __acceptors_in(self, account_id, region, vpc_peering_connection_ids):
+        if not vpc_peering_connection_ids:
+            return {}
+
+        ec2_resource = self.ec2_gateways.\
+            by_account_id_and_region(account_id, region).resource()
+        try:
+            return {
+                vpc_peering_connection.id: vpc_peering_connection
+                for vpc_peering_connection
+                in ec2_resource.vpc_peering_connections.filter(
+                    VpcPeeringConnectionIds=sorted(
+                        vpc_peering_connection_ids))
+            }
+        except (BotoCoreError, ClientError) as error:
+            self.logger.warn(
+                "Could not load peering connections in account: '%s' and "
+                "region: '%s'. Error was: %s",
+                account_id, region, error)
+            return {}
+
+    def __accept(self, pending_acceptance):
+        relationship, requester_vpc_peering_connection, \
+            acceptor_vpc_peering_connection = pending_acceptance
+        limit = self.mutation_limits.for_key(
+            (relationship.accepter_account_id, relationship.accepter_region))
+        with limit:
+            relationship.accept(
+                requester_vpc_peering_connection,
+                acceptor_vpc_peering_connection)
+
+    def provision(self, relationships):
+        requested = [
+            (relationship, requester_vpc_peering_connection)
+            for relationship, requester_vpc_peering_connection
+            in map_concurrently(
+                self.__request, relationships, self.mutation_limits.limit)
+            if requester_vpc_peering_connection is not None
+        ]
+
+        groups = {}
+        for relationship, requester_vpc_peering_connection in requested:
+            groups.setdefault(
+                (relationship.accepter_account_id,
+                 relationship.accepter_region),
+                []).append(
+                (relationship, requester_vpc_peering_connection))
+        groups = sorted(groups.items(), key=lambda group: group[0])
+
+        ready_ids = map_concurrently(
+            self.__wait_in, groups, self.mutation_limits.limit)
+
+        pending_acceptance = []
+        for ((account_id, region), group), ready in zip(groups, ready_ids):
+            acceptor_vpc_peering_connections = \
+                self.__acceptors_in(account_id, region, ready)
+
+            for relationship, requester_vpc_peering_connection in group:
+                acceptor_vpc_peering_connection = \
+                    acceptor_vpc_peering_connections.get(
+                        requester_vpc_peering_connection.id)
+                if acceptor_vpc_peering_connection is None:
+                    relationship.abandon(
+                        requester_vpc_peering_connection,
+                        "Peering connection: '%s' did not become ready "
+                        "for acceptance." %
+                        requester_vpc_peering_connection.id)
+                else:
+                    pending_acceptance.append(
+                        (relationship,
+                         requester_vpc_peering_connection,
+                         acceptor_vpc_peering_connection))
+
+        map_concurrently(
+            self.__accept, pending_acceptance, self.mutation_limits.limit)
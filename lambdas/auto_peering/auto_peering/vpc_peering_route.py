@@ -1,19 +1,45 @@
 from botocore.exceptions import ClientError
 
+from auto_peering.concurrency import map_concurrently, ConcurrencyLimits
+from auto_peering.route_diff import RouteDiff, route_to
+
+DEFAULT_ROUTE_MUTATION_CONCURRENCY = 5
+
 
 class VPCPeeringRoute(object):
     def __init__(self,
                  ec2_gateways,
                  logger,
                  between,
-                 peering_relationship):
+                 peering_relationship,
+                 route_tables=None,
+                 mutation_limits=None):
         self.vpc1 = between[0]
         self.vpc2 = between[1]
         self.vpc_peering_relationship = peering_relationship
         self.ec2_gateways = ec2_gateways
         self.logger = logger
+        self.route_tables = route_tables
+        self.mutation_limits = mutation_limits or \
+            ConcurrencyLimits(DEFAULT_ROUTE_MUTATION_CONCURRENCY)
+
+    def __ec2_client_for(self, vpc):
+        return self.ec2_gateways.\
+            by_account_id_and_region(vpc.account_id, vpc.region).client()
+
+    def __mutate_concurrently(self, mutation, items, vpc):
+        limit = self.mutation_limits.for_key((vpc.account_id, vpc.region))
+
+        def limited(item):
+            with limit:
+                return mutation(item)
+
+        return map_concurrently(limited, items, self.mutation_limits.limit)
 
     def __private_route_tables_for(self, vpc):
+        if self.route_tables is not None:
+            return self.route_tables.find_for(vpc)
+
         ec2_gateway = self.ec2_gateways.\
             by_account_id_and_region(vpc.account_id, vpc.region)
 
@@ -22,20 +48,95 @@ class VPCPeeringRoute(object):
                 {'Name': 'vpc-id', 'Values': [vpc.id]},
                 {'Name': 'tag:Tier', 'Values': ['private']}])
 
-    def __create_routes_in(self, route_tables, destination_vpc,
+    def __create_route_in(self, route_table, ec2_client, destination_vpc,
+                          vpc_peering_connection):
+        try:
+            ec2_client.create_route(
+                RouteTableId=route_table.id,
+                DestinationCidrBlock=destination_vpc.cidr_block,
+                VpcPeeringConnectionId=vpc_peering_connection.id)
+            self.logger.info(
+                "Route creation succeeded for '%s'. Continuing.",
+                route_table.id)
+            return 'created'
+        except ClientError as error:
+            self.logger.warn(
+                "Route creation failed for '%s'. Error was: %s",
+                route_table.id, error)
+            return 'failed'
+
+    def __replace_route_in(self, route_table, ec2_client, destination_vpc,
                            vpc_peering_connection):
-        for route_table in route_tables:
-            try:
-                route_table.create_route(
-                    DestinationCidrBlock=destination_vpc.cidr_block,
-                    VpcPeeringConnectionId=vpc_peering_connection.id)
-                self.logger.info(
-                    "Route creation succeeded for '%s'. Continuing.",
-                    route_table.id)
-            except ClientError as error:
-                self.logger.warn(
-                    "Route creation failed for '%s'. Error was: %s",
-                    route_table.id, error)
+        try:
+            ec2_client.replace_route(
+                RouteTableId=route_table.id,
+                DestinationCidrBlock=destination_vpc.cidr_block,
+                VpcPeeringConnectionId=vpc_peering_connection.id)
+            self.logger.info(
+                "Route replacement succeeded for '%s'. Continuing.",
+                route_table.id)
+            return 'replaced'
+        except ClientError as error:
+            self.logger.warn(
+                "Route replacement failed for '%s'. Error was: %s",
+                route_table.id, error)
+            return 'failed'
+
+    def __create_routes_in(self, route_tables, source_vpc, destination_vpc,
+                           vpc_peering_connection):
+        route_diff = RouteDiff(
+            route_tables,
+            destination_vpc.cidr_block,
+            vpc_peering_connection.id)
+        counts = {
+            'created': 0,
+            'replaced': 0,
+            'skipped': len(route_diff.up_to_date),
+            'conflicting': len(route_diff.conflicting),
+            'failed': 0
+        }
+
+        for route_table in route_diff.up_to_date:
+            self.logger.info(
+                "Route creation skipped for '%s' as route already exists. "
+                "Continuing.",
+                route_table.id)
+        for route_table in route_diff.conflicting:
+            self.logger.warn(
+                "Route creation skipped for '%s' as route for '%s' already "
+                "targets something other than VPC peering connection '%s'. "
+                "Continuing.",
+                route_table.id, destination_vpc.cidr_block,
+                vpc_peering_connection.id)
+
+        ec2_client = self.__ec2_client_for(source_vpc)
+
+        def mutate(route_table_and_action):
+            route_table, action = route_table_and_action
+            if action == 'replace':
+                return self.__replace_route_in(
+                    route_table, ec2_client, destination_vpc,
+                    vpc_peering_connection)
+            return self.__create_route_in(
+                route_table, ec2_client, destination_vpc,
+                vpc_peering_connection)
+
+        outcomes = self.__mutate_concurrently(
+            mutate,
+            [(route_table, 'create') for route_table in route_diff.missing] +
+            [(route_table, 'replace') for route_table in route_diff.stale],
+            source_vpc)
+        for outcome in outcomes:
+            counts[outcome] += 1
+
+        self.logger.info(
+            "Route reconciliation in: '%s' for '%s' complete. Created: %d, "
+            "replaced: %d, skipped: %d, conflicting: %d, failed: %d.",
+            source_vpc.id, destination_vpc.cidr_block,
+            counts['created'], counts['replaced'], counts['skipped'],
+            counts['conflicting'], counts['failed'])
+
+        return counts
 
     def __create_routes_for(self, source_vpc, destination_vpc,
                             vpc_peering_connection):
@@ -44,34 +145,76 @@ class VPCPeeringRoute(object):
             source_vpc.id, destination_vpc.id, destination_vpc.cidr_block,
             vpc_peering_connection.id)
 
-        self.__create_routes_in(
+        return self.__create_routes_in(
             self.__private_route_tables_for(source_vpc),
-            destination_vpc, vpc_peering_connection)
+            source_vpc, destination_vpc, vpc_peering_connection)
+
+    def __route_tables_routing_via(self, source_vpc, vpc_peering_connection):
+        ec2_gateway = self.ec2_gateways.\
+            by_account_id_and_region(source_vpc.account_id, source_vpc.region)
+
+        return ec2_gateway.resource().route_tables.filter(
+            Filters=[
+                {'Name': 'vpc-id', 'Values': [source_vpc.id]},
+                {'Name': 'tag:Tier', 'Values': ['private']},
+                {'Name': 'route.vpc-peering-connection-id',
+                 'Values': [vpc_peering_connection.id]}])
+
+    def __delete_route_in(self, route_table_and_client, destination_vpc):
+        route_table, ec2_client = route_table_and_client
+        try:
+            ec2_client.delete_route(
+                RouteTableId=route_table.id,
+                DestinationCidrBlock=destination_vpc.cidr_block)
+            self.logger.info(
+                "Route deletion succeeded for '%s'. Continuing.",
+                route_table.id)
+            return 'deleted'
+        except ClientError as error:
+            self.logger.warn(
+                "Route deletion failed for '%s'. Error was: %s",
+                route_table.id, error)
+            return 'failed'
 
     def __delete_routes_in(self, route_tables, source_vpc, destination_vpc,
                            vpc_peering_connection):
+        ec2_client = self.__ec2_client_for(source_vpc)
+
+        route_tables_to_delete_from = []
         for route_table in route_tables:
-            try:
-                ec2_gateway = self.ec2_gateways.\
-                    by_account_id_and_region(source_vpc.account_id,
-                                             source_vpc.region)
-                ec2_resource = ec2_gateway.resource()
-                route = ec2_resource.Route(
-                    route_table.id, destination_vpc.cidr_block)
-                if route.vpc_peering_connection_id == vpc_peering_connection.id:
-                    route.delete()
-                    self.logger.info(
-                        "Route deletion succeeded for '%s'. Continuing.",
-                         route_table.id)
-                else:
-                    self.logger.info(
-                        "Route deletion skipped for '%s' as route does not "
-                        "pertain to VPC peering connection '%s'. Continuing.",
-                        route_table.id, vpc_peering_connection.id)
-            except ClientError as error:
-                self.logger.warn(
-                    "Route deletion failed for '%s'. Error was: %s",
-                    route_table.id, error)
+            route = route_to(route_table, destination_vpc.cidr_block)
+            if route is not None and \
+                    route.get('VpcPeeringConnectionId') == \
+                    vpc_peering_connection.id:
+                route_tables_to_delete_from.append(route_table)
+            else:
+                self.logger.info(
+                    "Route deletion skipped for '%s' as route does not "
+                    "pertain to VPC peering connection '%s'. Continuing.",
+                    route_table.id, vpc_peering_connection.id)
+
+        counts = {
+            'deleted': 0,
+            'skipped': len(route_tables) - len(route_tables_to_delete_from),
+            'failed': 0
+        }
+
+        outcomes = self.__mutate_concurrently(
+            lambda route_table_and_client: self.__delete_route_in(
+                route_table_and_client, destination_vpc),
+            [(route_table, ec2_client)
+             for route_table in route_tables_to_delete_from],
+            source_vpc)
+        for outcome in outcomes:
+            counts[outcome] += 1
+
+        self.logger.info(
+            "Route removal in: '%s' for '%s' complete. Deleted: %d, "
+            "skipped: %d, failed: %d.",
+            source_vpc.id, destination_vpc.cidr_block,
+            counts['deleted'], counts['skipped'], counts['failed'])
+
+        return counts
 
     def __delete_routes_for(self, source_vpc, destination_vpc,
                             vpc_peering_connection):
@@ -81,24 +224,39 @@ class VPCPeeringRoute(object):
             source_vpc.id, destination_vpc.id, destination_vpc.cidr_block,
             vpc_peering_connection.id)
 
-        self.__delete_routes_in(
-            self.__private_route_tables_for(source_vpc),
+        return self.__delete_routes_in(
+            list(self.__route_tables_routing_via(
+                source_vpc, vpc_peering_connection)),
             source_vpc,
             destination_vpc,
             vpc_peering_connection)
 
     def provision(self):
         vpc_peering_connection = self.vpc_peering_relationship.fetch()
+        if vpc_peering_connection is None:
+            self.logger.warn(
+                "No peering connection between: '%s' and: '%s'. Skipping "
+                "route creation.",
+                self.vpc1.id, self.vpc2.id)
+            return None
 
-        self.__create_routes_for(self.vpc1, self.vpc2, vpc_peering_connection)
+        return self.__create_routes_for(
+            self.vpc1, self.vpc2, vpc_peering_connection)
 
     def destroy(self):
         vpc_peering_connection = self.vpc_peering_relationship.fetch()
+        if vpc_peering_connection is None:
+            self.logger.warn(
+                "No peering connection between: '%s' and: '%s'. Skipping "
+                "route deletion.",
+                self.vpc1.id, self.vpc2.id)
+            return None
 
-        self.__delete_routes_for(self.vpc1, self.vpc2, vpc_peering_connection)
+        return self.__delete_routes_for(
+            self.vpc1, self.vpc2, vpc_peering_connection)
 
     def perform(self, action):
-        getattr(self, action)()
+        return getattr(self, action)()
 
     def _to_dict(self):
         return {
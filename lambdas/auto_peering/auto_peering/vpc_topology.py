@@ -0,0 +1,32 @@
+class VPCTopology(object):
+    def __init__(self, vpcs):
+        self.vpcs = list(vpcs)
+        self.vpcs_by_component_instance_identifier = {}
+        self.dependents_by_component_instance_identifier = {}
+
+        for vpc in self.vpcs:
+            self.vpcs_by_component_instance_identifier.setdefault(
+                vpc.component_instance_identifier, vpc)
+            for dependency in vpc.dependencies:
+                dependents = self.dependents_by_component_instance_identifier.\
+                    setdefault(dependency, [])
+                if vpc not in dependents:
+                    dependents.append(vpc)
+
+    def find_by_component_instance_identifier(self, identifier):
+        return self.vpcs_by_component_instance_identifier.get(identifier)
+
+    def find_dependencies_of(self, vpc):
+        return [
+            dependency_vpc
+            for dependency_vpc in (
+                self.find_by_component_instance_identifier(
+                    component_instance_identifier)
+                for component_instance_identifier in vpc.dependencies)
+            if dependency_vpc is not None
+        ]
+
+    def find_dependents_of(self, vpc):
+        return list(
+            self.dependents_by_component_instance_identifier.get(
+                vpc.component_instance_identifier, []))
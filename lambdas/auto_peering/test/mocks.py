@@ -7,7 +7,7 @@ def build_sts_client_mock():
     return mock.Mock(name="STS client")
 
 
-def build_sts_assume_role_mock():
+def build_sts_assume_role_mock(**kwargs):
     credentials = randoms.credentials()
 
     assume_role_mock = mock.Mock(
@@ -15,7 +15,8 @@ def build_sts_assume_role_mock():
         return_value=responses.sts_assume_role_response_for(
             access_key_id=credentials.access_key,
             secret_access_key=credentials.secret_key,
-            session_token=credentials.token
+            session_token=credentials.token,
+            **kwargs
         ))
 
     return credentials, assume_role_mock
@@ -66,3 +67,24 @@ class EC2Gateway(object):
 
     def resource(self):
         return self.resource_mock
+
+
+def build_vpc_peering_connection_mock(requester_vpc, accepter_vpc, **kwargs):
+    vpc_peering_connection = mock.Mock(
+        name=kwargs.get('name', 'VPC peering connection'))
+    vpc_peering_connection.id = kwargs.get(
+        'id', randoms.peering_connection_id())
+    vpc_peering_connection.requester_vpc_info = {'VpcId': requester_vpc.id}
+    vpc_peering_connection.accepter_vpc_info = {'VpcId': accepter_vpc.id}
+    vpc_peering_connection.status = {'Code': kwargs.get('status', 'active')}
+
+    return vpc_peering_connection
+
+
+def build_route_table_mock(**kwargs):
+    route_table = mock.Mock(name=kwargs.get('name', 'Route table'))
+    route_table.id = kwargs.get('id', randoms.route_table_id())
+    route_table.vpc_id = kwargs.get('vpc_id', randoms.vpc_id())
+    route_table.routes_attribute = kwargs.get('routes', [])
+
+    return route_table
@@ -1,3 +1,5 @@
+from datetime import datetime, timedelta, timezone
+
 import test.randoms as randoms
 
 
@@ -13,7 +15,7 @@ def sts_assume_role_response_for(**kwargs):
         randoms.session_token())
     expiration = kwargs.get(
         'expiration',
-        "2022-01-06T15:29:47Z")
+        datetime.now(timezone.utc) + timedelta(hours=1))
 
     return {
         'Credentials': {
@@ -1,7 +1,8 @@
 import unittest
 from unittest import mock
+from botocore.exceptions import ClientError
 
-from auto_peering.all_vpcs import AllVPCs
+from auto_peering.all_vpcs import AllVPCs, TARGETED_DISCOVERY, tag_filters_for
 from auto_peering.vpc import VPC
 
 from test import randoms, mocks, builders
@@ -247,3 +248,351 @@ class TestAllVPCs(unittest.TestCase):
                 VPC(vpc_4_response, account_2_id, region_1_id)
             }
         )
+
+    def test_find_all_merges_vpcs_in_gateway_order(self):
+        account_1_id = randoms.account_id()
+        account_2_id = randoms.account_id()
+        region_1_id = randoms.region()
+        region_2_id = randoms.region()
+
+        vpc_1_response = mocks.build_vpc_response_mock(name="VPC 1")
+        vpc_2_response = mocks.build_vpc_response_mock(name="VPC 2")
+        vpc_3_response = mocks.build_vpc_response_mock(name="VPC 3")
+
+        ec2_gateway_1_1 = mocks.EC2Gateway(account_1_id, region_1_id)
+        ec2_gateway_1_2 = mocks.EC2Gateway(account_1_id, region_2_id)
+        ec2_gateway_2_1 = mocks.EC2Gateway(account_2_id, region_1_id)
+
+        ec2_gateways = mocks.EC2Gateways([
+            ec2_gateway_1_1, ec2_gateway_1_2, ec2_gateway_2_1
+        ])
+
+        ec2_gateway_1_1.resource().vpcs.all = \
+            mock.Mock(
+                name="Account 1 region 1 VPCs",
+                return_value=[vpc_1_response])
+        ec2_gateway_1_2.resource().vpcs.all = \
+            mock.Mock(
+                name="Account 1 region 2 VPCs",
+                return_value=[])
+        ec2_gateway_2_1.resource().vpcs.all = \
+            mock.Mock(
+                name="Account 2 region 1 VPCs",
+                return_value=[vpc_2_response, vpc_3_response])
+
+        all_vpcs = AllVPCs(ec2_gateways, search_concurrency=3)
+
+        found_vpcs = all_vpcs.find_all()
+
+        self.assertEqual(
+            found_vpcs,
+            [
+                VPC(vpc_1_response, account_1_id, region_1_id),
+                VPC(vpc_2_response, account_2_id, region_1_id),
+                VPC(vpc_3_response, account_2_id, region_1_id)
+            ])
+
+    def test_find_all_isolates_failing_gateways(self):
+        account_id = randoms.account_id()
+        region_1_id = randoms.region()
+        region_2_id = randoms.region()
+
+        vpc_1_response = mocks.build_vpc_response_mock(name="VPC 1")
+
+        ec2_gateway_1 = mocks.EC2Gateway(account_id, region_1_id)
+        ec2_gateway_2 = mocks.EC2Gateway(account_id, region_2_id)
+
+        ec2_gateways = mocks.EC2Gateways([ec2_gateway_1, ec2_gateway_2])
+
+        list_error = ClientError(
+            {'Error': {'Code': 'RequestLimitExceeded'}}, 'DescribeVpcs')
+        ec2_gateway_1.resource().vpcs.all = \
+            mock.Mock(
+                name="Region 1 VPCs",
+                side_effect=list_error)
+        ec2_gateway_2.resource().vpcs.all = \
+            mock.Mock(
+                name="Region 2 VPCs",
+                return_value=[vpc_1_response])
+
+        logger = mock.Mock(name="Logger")
+
+        all_vpcs = AllVPCs(ec2_gateways, logger, search_concurrency=2)
+
+        found_vpcs = all_vpcs.find_all()
+
+        self.assertEqual(
+            found_vpcs,
+            [VPC(vpc_1_response, account_id, region_2_id)])
+        logger.warn.assert_any_call(
+            "Could not list VPCs in account: '%s' and region: '%s'. "
+            "Error was: %s",
+            account_id, region_1_id, list_error)
+
+    def test_builds_tag_filters_covering_all_identifier_splits(self):
+        filters = tag_filters_for(['web-gold', 'customer-service-silver'])
+
+        self.assertEqual(
+            filters,
+            [
+                {'Name': 'tag:Component',
+                 'Values': ['customer', 'customer-service', 'web']},
+                {'Name': 'tag:DeploymentIdentifier',
+                 'Values': ['gold', 'service-silver', 'silver']}
+            ])
+
+    def test_find_dependencies_of_vpc_using_tag_filters(self):
+        account_1_id = randoms.account_id()
+        account_2_id = randoms.account_id()
+        region_1_id = randoms.region()
+
+        target_vpc = VPC(mocks.build_vpc_response_mock(
+            name="Target VPC",
+            tags=builders.build_vpc_tags(
+                dependencies=[
+                    "component-1-deployment-2",
+                    "component-4-default"
+                ])), account_1_id, region_1_id)
+
+        vpc_1_response = mocks.build_vpc_response_mock(
+            name="VPC 1",
+            tags=builders.build_vpc_tags(
+                component="component-1",
+                deployment_identifier="default"))
+        vpc_2_response = mocks.build_vpc_response_mock(
+            name="VPC 2",
+            tags=builders.build_vpc_tags(
+                component="component-1",
+                deployment_identifier="deployment-2"))
+        vpc_4_response = mocks.build_vpc_response_mock(
+            name="VPC 4",
+            tags=builders.build_vpc_tags(
+                component="component-4",
+                deployment_identifier="default"))
+
+        ec2_gateway_1 = mocks.EC2Gateway(account_1_id, region_1_id)
+        ec2_gateway_2 = mocks.EC2Gateway(account_2_id, region_1_id)
+
+        ec2_gateways = mocks.EC2Gateways([ec2_gateway_1, ec2_gateway_2])
+
+        ec2_gateway_1.resource().vpcs.filter = \
+            mock.Mock(
+                name="Account 1 filtered VPCs",
+                return_value=[vpc_1_response, vpc_2_response])
+        ec2_gateway_2.resource().vpcs.filter = \
+            mock.Mock(
+                name="Account 2 filtered VPCs",
+                return_value=[vpc_4_response])
+
+        all_vpcs = AllVPCs(
+            ec2_gateways, discovery_mode=TARGETED_DISCOVERY)
+
+        found_vpcs = all_vpcs.find_dependencies_of(target_vpc)
+
+        self.assertEqual(
+            found_vpcs,
+            [
+                VPC(vpc_2_response, account_1_id, region_1_id),
+                VPC(vpc_4_response, account_2_id, region_1_id)
+            ])
+        ec2_gateway_1.resource().vpcs.filter.assert_called_once_with(
+            Filters=tag_filters_for(target_vpc.dependencies))
+        ec2_gateway_1.resource().vpcs.all.assert_not_called()
+
+    def test_find_dependencies_of_vpc_without_dependencies_makes_no_calls(
+            self):
+        account_id = randoms.account_id()
+        region_id = randoms.region()
+
+        target_vpc = VPC(mocks.build_vpc_response_mock(
+            name="Target VPC",
+            tags=builders.build_vpc_tags(dependencies=[])),
+            account_id, region_id)
+
+        ec2_gateway = mocks.EC2Gateway(account_id, region_id)
+        ec2_gateways = mocks.EC2Gateways([ec2_gateway])
+
+        all_vpcs = AllVPCs(
+            ec2_gateways, discovery_mode=TARGETED_DISCOVERY)
+
+        found_vpcs = all_vpcs.find_dependencies_of(target_vpc)
+
+        self.assertEqual(found_vpcs, [])
+        ec2_gateway.resource().vpcs.filter.assert_not_called()
+
+    def test_find_by_account_id_and_vpc_id_using_vpc_id_filter(self):
+        account_1_id = randoms.account_id()
+        account_2_id = randoms.account_id()
+        region_1_id = randoms.region()
+        region_2_id = randoms.region()
+
+        vpc_id = randoms.vpc_id()
+
+        vpc_response = mocks.build_vpc_response_mock(name="VPC", id=vpc_id)
+
+        ec2_gateway_1_1 = mocks.EC2Gateway(account_1_id, region_1_id)
+        ec2_gateway_2_1 = mocks.EC2Gateway(account_2_id, region_1_id)
+        ec2_gateway_2_2 = mocks.EC2Gateway(account_2_id, region_2_id)
+
+        ec2_gateways = mocks.EC2Gateways([
+            ec2_gateway_1_1, ec2_gateway_2_1, ec2_gateway_2_2,
+        ])
+
+        ec2_gateway_2_1.resource().vpcs.filter = \
+            mock.Mock(
+                name="Account 2 region 1 VPCs",
+                return_value=[])
+        ec2_gateway_2_2.resource().vpcs.filter = \
+            mock.Mock(
+                name="Account 2 region 2 VPCs",
+                return_value=[vpc_response])
+
+        all_vpcs = AllVPCs(
+            ec2_gateways, discovery_mode=TARGETED_DISCOVERY)
+
+        found_vpc = all_vpcs.find_by_account_id_and_vpc_id(
+            account_2_id, vpc_id)
+
+        self.assertEqual(found_vpc, VPC(vpc_response, account_2_id, region_2_id))
+        ec2_gateway_2_2.resource().vpcs.filter.assert_called_once_with(
+            Filters=[{'Name': 'vpc-id', 'Values': [vpc_id]}])
+        ec2_gateway_1_1.resource().vpcs.filter.assert_not_called()
+        ec2_gateway_2_2.resource().vpcs.all.assert_not_called()
+
+    def test_find_by_account_id_and_missing_vpc_id_using_vpc_id_filter(self):
+        account_id = randoms.account_id()
+        region_1_id = randoms.region()
+        region_2_id = randoms.region()
+
+        ec2_gateway_1 = mocks.EC2Gateway(account_id, region_1_id)
+        ec2_gateway_2 = mocks.EC2Gateway(account_id, region_2_id)
+
+        ec2_gateways = mocks.EC2Gateways([ec2_gateway_1, ec2_gateway_2])
+
+        ec2_gateway_1.resource().vpcs.filter = \
+            mock.Mock(name="Region 1 VPCs", return_value=[])
+        ec2_gateway_2.resource().vpcs.filter = \
+            mock.Mock(name="Region 2 VPCs", return_value=[])
+
+        all_vpcs = AllVPCs(
+            ec2_gateways, discovery_mode=TARGETED_DISCOVERY)
+
+        found_vpc = all_vpcs.find_by_account_id_and_vpc_id(
+            account_id, randoms.vpc_id())
+
+        self.assertIsNone(found_vpc)
+
+    def test_find_dependents_of_vpc_using_wildcard_tag_filter(self):
+        account_1_id = randoms.account_id()
+        account_2_id = randoms.account_id()
+        region_1_id = randoms.region()
+
+        target_vpc = VPC(mocks.build_vpc_response_mock(
+            name="Target VPC",
+            tags=builders.build_vpc_tags(
+                component="target",
+                deployment_identifier="default"
+            )), account_1_id, region_1_id)
+
+        vpc_1_response = mocks.build_vpc_response_mock(
+            name="VPC 1",
+            tags=builders.build_vpc_tags(
+                dependencies=["target-default", "other-thing"]))
+        vpc_2_response = mocks.build_vpc_response_mock(
+            name="VPC 2",
+            tags=builders.build_vpc_tags(
+                dependencies=["other-target-default"]))
+        vpc_3_response = mocks.build_vpc_response_mock(
+            name="VPC 3",
+            tags=builders.build_vpc_tags(
+                dependencies=["other-thing", "target-default"]))
+
+        ec2_gateway_1 = mocks.EC2Gateway(account_1_id, region_1_id)
+        ec2_gateway_2 = mocks.EC2Gateway(account_2_id, region_1_id)
+
+        ec2_gateways = mocks.EC2Gateways([ec2_gateway_1, ec2_gateway_2])
+
+        ec2_gateway_1.resource().vpcs.filter = \
+            mock.Mock(
+                name="Account 1 filtered VPCs",
+                return_value=[vpc_1_response, vpc_2_response])
+        ec2_gateway_2.resource().vpcs.filter = \
+            mock.Mock(
+                name="Account 2 filtered VPCs",
+                return_value=[vpc_3_response])
+
+        all_vpcs = AllVPCs(
+            ec2_gateways, discovery_mode=TARGETED_DISCOVERY)
+
+        found_vpcs = all_vpcs.find_dependents_of(target_vpc)
+
+        self.assertEqual(
+            found_vpcs,
+            [
+                VPC(vpc_1_response, account_1_id, region_1_id),
+                VPC(vpc_3_response, account_2_id, region_1_id)
+            ])
+        ec2_gateway_1.resource().vpcs.filter.assert_called_once_with(
+            Filters=[{'Name': 'tag:Dependencies',
+                      'Values': ['*target-default*']}])
+        ec2_gateway_1.resource().vpcs.all.assert_not_called()
+
+    def test_finds_vpcs_in_provided_vpcs_without_listing(self):
+        account_1_id = randoms.account_id()
+        account_2_id = randoms.account_id()
+        region_id = randoms.region()
+
+        vpc_1 = VPC(
+            mocks.build_vpc_response_mock(name="VPC 1"),
+            account_1_id, region_id)
+        vpc_2 = VPC(
+            mocks.build_vpc_response_mock(name="VPC 2"),
+            account_2_id, region_id)
+
+        ec2_gateway_1 = mocks.EC2Gateway(account_1_id, region_id)
+        ec2_gateway_2 = mocks.EC2Gateway(account_2_id, region_id)
+
+        ec2_gateways = mocks.EC2Gateways([ec2_gateway_1, ec2_gateway_2])
+
+        all_vpcs = AllVPCs(ec2_gateways, vpcs=[vpc_1, vpc_2])
+
+        self.assertEqual(all_vpcs.find_all(), [vpc_1, vpc_2])
+        self.assertEqual(all_vpcs.find_by_account_id(account_2_id), [vpc_2])
+        self.assertEqual(
+            all_vpcs.find_by_account_id_and_vpc_id(account_1_id, vpc_1.id),
+            vpc_1)
+        ec2_gateway_1.resource().vpcs.all.assert_not_called()
+        ec2_gateway_2.resource().vpcs.all.assert_not_called()
+
+    def test_fetch_by_account_id_and_vpc_ids_using_chunked_vpc_id_filters(
+            self):
+        account_id = randoms.account_id()
+        region_id = randoms.region()
+
+        vpc_ids = sorted(randoms.vpc_id() for _ in range(201))
+        vpc_1_response = mocks.build_vpc_response_mock(
+            name="VPC 1", id=vpc_ids[0])
+        vpc_2_response = mocks.build_vpc_response_mock(
+            name="VPC 2", id=vpc_ids[200])
+
+        ec2_gateway = mocks.EC2Gateway(account_id, region_id)
+        ec2_gateways = mocks.EC2Gateways([ec2_gateway])
+
+        ec2_gateway.resource().vpcs.filter = \
+            mock.Mock(
+                name="VPCs",
+                side_effect=[[vpc_1_response], [vpc_2_response]])
+
+        all_vpcs = AllVPCs(ec2_gateways)
+
+        found_vpcs = all_vpcs.fetch_by_account_id_and_vpc_ids(
+            account_id, reversed(vpc_ids))
+
+        self.assertEqual(
+            found_vpcs,
+            [VPC(vpc_1_response, account_id, region_id),
+             VPC(vpc_2_response, account_id, region_id)])
+        self.assertEqual(
+            ec2_gateway.resource().vpcs.filter.call_args_list,
+            [mock.call(Filters=[{'Name': 'vpc-id', 'Values': vpc_ids[:200]}]),
+             mock.call(Filters=[{'Name': 'vpc-id', 'Values': vpc_ids[200:]}])])
@@ -0,0 +1,142 @@
+import unittest
+from unittest.mock import Mock
+
+from botocore.exceptions import ClientError
+
+from auto_peering.bucket_vpcs import BucketVPCs
+from auto_peering.vpc import VPC
+from test import randoms, mocks
+
+
+def s3_client_listing(*pages):
+    s3_client = Mock(name="S3 client")
+    s3_client.get_paginator.return_value.paginate = Mock(
+        return_value=[
+            {'Contents': [{'Key': key} for key in keys]} for keys in pages])
+    return s3_client
+
+
+class TestBucketVPCs(unittest.TestCase):
+    def setUp(self):
+        self.account_1_id = randoms.account_id()
+        self.account_2_id = randoms.account_id()
+
+        self.ec2_gateway_1_1 = mocks.EC2Gateway(self.account_1_id, 'eu-west-1')
+        self.ec2_gateway_1_2 = mocks.EC2Gateway(self.account_1_id, 'eu-west-2')
+        self.ec2_gateway_2_1 = mocks.EC2Gateway(self.account_2_id, 'eu-west-1')
+        self.ec2_gateways = mocks.EC2Gateways([
+            self.ec2_gateway_1_1, self.ec2_gateway_1_2, self.ec2_gateway_2_1])
+
+    def test_builds_vpcs_from_object_metadata(self):
+        vpc_1_id = randoms.vpc_id()
+        vpc_2_id = randoms.vpc_id()
+        s3_client = s3_client_listing(
+            ['vpc-existence/%s/%s' % (self.account_1_id, vpc_1_id)],
+            ['vpc-existence/%s/%s' % (self.account_2_id, vpc_2_id)])
+        metadata = {
+            'vpc-existence/%s/%s' % (self.account_1_id, vpc_1_id): {
+                'region': 'eu-west-2', 'cidr-block': '10.1.0.0/16',
+                'component': 'network', 'deployment-identifier': 'production',
+                'dependencies': 'shared-services'},
+            'vpc-existence/%s/%s' % (self.account_2_id, vpc_2_id): {
+                'region': 'eu-west-1', 'cidr-block': '10.2.0.0/16',
+                'component': 'shared', 'deployment-identifier': 'services'}
+        }
+        s3_client.head_object = Mock(
+            side_effect=lambda Bucket, Key: {'Metadata': metadata[Key]})
+
+        vpcs = BucketVPCs(
+            s3_client, 'infrastructure-events', self.ec2_gateways, Mock(),
+            read_metadata=True).find_all()
+
+        self.assertEqual(
+            [(vpc.id, vpc.account_id, vpc.region, vpc.cidr_block,
+              vpc.component_instance_identifier, vpc.dependencies)
+             for vpc in vpcs],
+            [(vpc_1_id, self.account_1_id, 'eu-west-2', '10.1.0.0/16',
+              'network-production', ['shared-services']),
+             (vpc_2_id, self.account_2_id, 'eu-west-1', '10.2.0.0/16',
+              'shared-services', [])])
+        s3_client.get_paginator.assert_called_once_with('list_objects_v2')
+        s3_client.get_paginator.return_value.paginate.assert_called_once_with(
+            Bucket='infrastructure-events', Prefix='vpc-existence/')
+        self.ec2_gateway_1_1.resource().vpcs.filter.assert_not_called()
+        self.ec2_gateway_1_1.resource().vpcs.all.assert_not_called()
+
+    def test_looks_up_vpcs_with_missing_metadata_in_ec2(self):
+        vpc_1_id = randoms.vpc_id()
+        vpc_2_id = randoms.vpc_id()
+        vpc_2_response = mocks.build_vpc_response_mock(id=vpc_2_id)
+        s3_client = s3_client_listing([
+            'vpc-existence/%s/%s' % (self.account_1_id, vpc_1_id),
+            'vpc-existence/%s/%s' % (self.account_1_id, vpc_2_id)])
+        s3_client.head_object = Mock(side_effect=[
+            {'Metadata': {
+                'region': 'eu-west-1', 'cidr-block': '10.1.0.0/16',
+                'component': 'network', 'deployment-identifier': 'production'}},
+            {'Metadata': {'region': 'eu-west-1'}}])
+
+        self.ec2_gateway_1_1.resource().vpcs.filter = Mock(return_value=[])
+        self.ec2_gateway_1_2.resource().vpcs.filter = Mock(
+            return_value=[vpc_2_response])
+
+        vpcs = BucketVPCs(
+            s3_client, 'infrastructure-events', self.ec2_gateways, Mock(),
+            read_metadata=True, search_concurrency=1).find_all()
+
+        self.assertEqual([vpc.id for vpc in vpcs], [vpc_1_id, vpc_2_id])
+        self.assertEqual(
+            vpcs[1], VPC(vpc_2_response, self.account_1_id, 'eu-west-2'))
+        self.ec2_gateway_1_2.resource().vpcs.filter.assert_called_once_with(
+            Filters=[{'Name': 'vpc-id', 'Values': [vpc_2_id]}])
+        self.ec2_gateway_2_1.resource().vpcs.filter.assert_not_called()
+
+    def test_looks_up_all_vpcs_in_ec2_without_reading_metadata(self):
+        vpc_id = randoms.vpc_id()
+        vpc_response = mocks.build_vpc_response_mock(id=vpc_id)
+        s3_client = s3_client_listing(
+            ['vpc-existence/%s/%s' % (self.account_2_id, vpc_id)])
+
+        self.ec2_gateway_2_1.resource().vpcs.filter = Mock(
+            return_value=[vpc_response])
+
+        vpcs = BucketVPCs(
+            s3_client, 'infrastructure-events', self.ec2_gateways,
+            Mock()).find_all()
+
+        self.assertEqual(
+            vpcs, [VPC(vpc_response, self.account_2_id, 'eu-west-1')])
+        s3_client.head_object.assert_not_called()
+
+    def test_ignores_unsearched_accounts_and_regions_and_malformed_keys(self):
+        vpc_id = randoms.vpc_id()
+        s3_client = s3_client_listing([
+            'vpc-existence/%s/%s' % (randoms.account_id(), randoms.vpc_id()),
+            'vpc-existence/%s' % self.account_1_id,
+            'vpc-existence/%s/%s' % (self.account_1_id, vpc_id)])
+        s3_client.head_object = Mock(return_value={'Metadata': {
+            'region': 'us-east-1', 'cidr-block': '10.1.0.0/16',
+            'component': 'network', 'deployment-identifier': 'production'}})
+
+        vpcs = BucketVPCs(
+            s3_client, 'infrastructure-events', self.ec2_gateways, Mock(),
+            read_metadata=True).find_all()
+
+        self.assertEqual(vpcs, [])
+        s3_client.head_object.assert_called_once_with(
+            Bucket='infrastructure-events',
+            Key='vpc-existence/%s/%s' % (self.account_1_id, vpc_id))
+
+    def test_returns_none_when_bucket_cannot_be_listed(self):
+        logger = Mock()
+        s3_client = Mock(name="S3 client")
+        s3_client.get_paginator.return_value.paginate = Mock(
+            side_effect=ClientError(
+                {'Error': {'Code': 'AccessDenied'}}, 'ListObjectsV2'))
+
+        vpcs = BucketVPCs(
+            s3_client, 'infrastructure-events', self.ec2_gateways,
+            logger).find_all()
+
+        self.assertIsNone(vpcs)
+        logger.warn.assert_called_once()
@@ -0,0 +1,122 @@
+import threading
+import unittest
+
+from auto_peering.concurrency import (
+    map_concurrently,
+    first_concurrently,
+    ConcurrencyLimits)
+
+
+class TestMapConcurrently(unittest.TestCase):
+    def test_returns_results_in_item_order(self):
+        results = map_concurrently(lambda item: item * 2, [3, 1, 2], 3)
+
+        self.assertEqual(results, [6, 2, 4])
+
+    def test_runs_serially_on_calling_thread_when_single_worker(self):
+        calling_thread = threading.current_thread()
+        threads = []
+
+        def record_thread(item):
+            threads.append(threading.current_thread())
+            return item
+
+        map_concurrently(record_thread, [1, 2, 3], 1)
+
+        self.assertEqual(threads, [calling_thread] * 3)
+
+    def test_runs_on_worker_threads_when_multiple_workers(self):
+        calling_thread = threading.current_thread()
+        threads = []
+
+        def record_thread(item):
+            threads.append(threading.current_thread())
+            return item
+
+        map_concurrently(record_thread, [1, 2, 3], 2)
+
+        self.assertNotIn(calling_thread, threads)
+
+    def test_handles_no_items(self):
+        self.assertEqual(map_concurrently(lambda item: item, [], 5), [])
+
+
+class TestFirstConcurrently(unittest.TestCase):
+    def test_returns_first_non_none_result(self):
+        result = first_concurrently(
+            lambda item: item if item == 'b' else None, ['a', 'b', 'c'], 3)
+
+        self.assertEqual(result, 'b')
+
+    def test_returns_none_when_no_item_yields_a_result(self):
+        result = first_concurrently(lambda item: None, ['a', 'b'], 2)
+
+        self.assertIsNone(result)
+
+    def test_stops_at_first_result_when_single_worker(self):
+        calls = []
+
+        def record_call(item):
+            calls.append(item)
+            return item
+
+        result = first_concurrently(record_call, ['a', 'b', 'c'], 1)
+
+        self.assertEqual(result, 'a')
+        self.assertEqual(calls, ['a'])
+
+    def test_does_not_wait_for_slower_items_once_result_found(self):
+        release = threading.Event()
+
+        def find(item):
+            if item == 'slow':
+                release.wait(5)
+                return None
+            return item
+
+        try:
+            result = first_concurrently(find, ['slow', 'fast'], 2)
+            self.assertFalse(release.is_set())
+        finally:
+            release.set()
+
+        self.assertEqual(result, 'fast')
+
+
+class TestConcurrencyLimits(unittest.TestCase):
+    def test_returns_same_semaphore_for_same_key(self):
+        limits = ConcurrencyLimits(2)
+
+        self.assertIs(
+            limits.for_key(('123456789012', 'eu-west-1')),
+            limits.for_key(('123456789012', 'eu-west-1')))
+
+    def test_returns_different_semaphores_for_different_keys(self):
+        limits = ConcurrencyLimits(2)
+
+        self.assertIsNot(
+            limits.for_key(('123456789012', 'eu-west-1')),
+            limits.for_key(('123456789012', 'eu-west-2')))
+
+    def test_bounds_concurrent_holders_of_a_key_to_limit(self):
+        limits = ConcurrencyLimits(2)
+        lock = threading.Lock()
+        active = [0]
+        peak = [0]
+
+        def hold(item):
+            with limits.for_key('key'):
+                with lock:
+                    active[0] += 1
+                    peak[0] = max(peak[0], active[0])
+                threading.Event().wait(0.02)
+                with lock:
+                    active[0] -= 1
+            return item
+
+        map_concurrently(hold, range(6), 6)
+
+        self.assertEqual(peak[0], 2)
+
+    def test_treats_limits_below_one_as_one(self):
+        self.assertEqual(ConcurrencyLimits(0).limit, 1)
@@ -0,0 +1,91 @@
+import unittest
+from datetime import datetime, timedelta, timezone
+from unittest import mock
+
+from auto_peering.credential_cache import CredentialCache
+
+from test import randoms
+
+
+def credentials_metadata_expiring_in(delta):
+    return {
+        'access_key': randoms.temporary_access_key_id(),
+        'secret_key': randoms.secret_access_key(),
+        'token': randoms.session_token(),
+        'expiry_time': (datetime.now(timezone.utc) + delta).isoformat()
+    }
+
+
+class TestCredentialCache(unittest.TestCase):
+    def test_fetches_credentials_on_first_use(self):
+        metadata = credentials_metadata_expiring_in(timedelta(hours=1))
+        fetch = mock.Mock(name='Fetch', return_value=metadata)
+
+        credential_cache = CredentialCache()
+
+        credentials = credential_cache.get(('account', 'role'), fetch)
+
+        self.assertEqual(credentials.access_key, metadata['access_key'])
+        self.assertEqual(credentials.secret_key, metadata['secret_key'])
+        self.assertEqual(credentials.token, metadata['token'])
+        self.assertEqual(len(fetch.mock_calls), 1)
+
+    def test_reuses_unexpired_credentials_for_key(self):
+        fetch = mock.Mock(
+            name='Fetch',
+            return_value=credentials_metadata_expiring_in(timedelta(hours=1)))
+
+        credential_cache = CredentialCache()
+
+        first_credentials = credential_cache.get(('account', 'role'), fetch)
+        second_credentials = credential_cache.get(('account', 'role'), fetch)
+        second_credentials.get_frozen_credentials()
+
+        self.assertIs(first_credentials, second_credentials)
+        self.assertEqual(len(fetch.mock_calls), 1)
+
+    def test_keeps_separate_credentials_per_key(self):
+        fetch = mock.Mock(
+            name='Fetch',
+            side_effect=lambda: credentials_metadata_expiring_in(
+                timedelta(hours=1)))
+
+        credential_cache = CredentialCache()
+
+        first_credentials = credential_cache.get(('account-1', 'role'), fetch)
+        second_credentials = credential_cache.get(('account-2', 'role'), fetch)
+
+        self.assertIsNot(first_credentials, second_credentials)
+        self.assertEqual(len(fetch.mock_calls), 2)
+
+    def test_refreshes_credentials_before_they_expire(self):
+        expiring_metadata = \
+            credentials_metadata_expiring_in(timedelta(minutes=5))
+        refreshed_metadata = \
+            credentials_metadata_expiring_in(timedelta(hours=1))
+        fetch = mock.Mock(
+            name='Fetch',
+            side_effect=[expiring_metadata, refreshed_metadata])
+
+        credential_cache = CredentialCache()
+
+        credentials = credential_cache.get(('account', 'role'), fetch)
+
+        self.assertEqual(
+            credentials.get_frozen_credentials().access_key,
+            refreshed_metadata['access_key'])
+        self.assertEqual(len(fetch.mock_calls), 2)
+
+    def test_fetches_again_after_clear(self):
+        fetch = mock.Mock(
+            name='Fetch',
+            side_effect=lambda: credentials_metadata_expiring_in(
+                timedelta(hours=1)))
+
+        credential_cache = CredentialCache()
+
+        credential_cache.get(('account', 'role'), fetch)
+        credential_cache.clear()
+        credential_cache.get(('account', 'role'), fetch)
+
+        self.assertEqual(len(fetch.mock_calls), 2)
@@ -1,3 +1,4 @@
+import threading
 import unittest
 import unittest.mock as mock
 
@@ -7,29 +8,24 @@ from test import randoms
 
 
 class TestEC2Gateway(unittest.TestCase):
-    def test_returns_ec2_client_for_region_from_session(self):
+    def test_returns_ec2_client_sharing_connection_pool_with_resource(self):
         session = mock.Mock(name='Session')
         account_id = randoms.account_id()
         region = randoms.region()
 
+        expected_resource = mock.Mock(name='EC2 Resource')
         expected_client = mock.Mock(name='EC2 Client')
-        session.client = mock.Mock(
-            name='Client',
-            return_value=expected_client)
+        expected_resource.meta.client = expected_client
+        session.resource = mock.Mock(
+            name='Resource',
+            return_value=expected_resource)
 
         ec2_gateway = EC2Gateway(session, account_id, region)
 
         actual_client = ec2_gateway.client()
 
-        session_client_calls = session.client.mock_calls
-        self.assertEqual(len(session_client_calls), 1)
-
-        session_client_call = session_client_calls[0]
-        self.assertEqual(
-            session_client_call,
-            mock.call('ec2', region))
-
         self.assertEqual(actual_client, expected_client)
+        session.client.assert_not_called()
 
     def test_returns_ec2_resource_for_region_from_session(self):
         session = mock.Mock(name='Session')
@@ -49,8 +45,66 @@ class TestEC2Gateway(unittest.TestCase):
         self.assertEqual(len(session_resource_calls), 1)
 
         session_resource_call = session_resource_calls[0]
-        self.assertEqual(
-            session_resource_call,
-            mock.call('ec2', region))
+        self.assertEqual(session_resource_call[1], ('ec2', region))
 
         self.assertEqual(actual_resource, expected_resource)
+
+    def test_configures_max_pool_connections_on_resource(self):
+        session = mock.Mock(name='Session')
+        account_id = randoms.account_id()
+        region = randoms.region()
+
+        ec2_gateway = EC2Gateway(
+            session, account_id, region, max_pool_connections=25)
+
+        ec2_gateway.resource()
+
+        config = session.resource.call_args[1]['config']
+        self.assertEqual(config.max_pool_connections, 25)
+
+    def test_reuses_resource_and_client_across_calls(self):
+        session = mock.Mock(name='Session')
+        account_id = randoms.account_id()
+        region = randoms.region()
+
+        ec2_gateway = EC2Gateway(session, account_id, region)
+
+        first_resource = ec2_gateway.resource()
+        first_client = ec2_gateway.client()
+        second_resource = ec2_gateway.resource()
+        second_client = ec2_gateway.client()
+
+        self.assertEqual(len(session.resource.mock_calls), 1)
+        self.assertIs(first_resource, second_resource)
+        self.assertIs(first_client, second_client)
+
+    def test_gives_each_thread_its_own_resource_sharing_one_client(self):
+        class Resource(object):
+            def __init__(self, client):
+                self.meta = mock.Mock(name='Resource meta')
+                self.meta.client = client
+
+        session = mock.Mock(name='Session')
+        account_id = randoms.account_id()
+        region = randoms.region()
+
+        shared_resource = Resource(mock.Mock(name='EC2 Client'))
+        session.resource = mock.Mock(
+            name='Resource',
+            return_value=shared_resource)
+
+        ec2_gateway = EC2Gateway(session, account_id, region)
+        resource = ec2_gateway.resource()
+
+        thread_resources = []
+        thread = threading.Thread(
+            target=lambda: thread_resources.append(ec2_gateway.resource()))
+        thread.start()
+        thread.join()
+
+        self.assertIsNot(thread_resources[0], shared_resource)
+        self.assertIs(
+            thread_resources[0].meta.client, shared_resource.meta.client)
+        self.assertIs(ec2_gateway.client(), shared_resource.meta.client)
+        self.assertIs(resource, shared_resource)
+        self.assertEqual(len(session.resource.mock_calls), 1)
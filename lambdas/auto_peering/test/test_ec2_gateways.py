@@ -97,3 +97,40 @@ class TestEC2Gateways(unittest.TestCase):
         self.assertEqual(
             ec2_gateway_instance,
             EC2Gateway(session, account_id, region))
+
+    def test_memoizes_ec2_gateway_for_account_and_region(self):
+        session_store = mock.Mock(name="SessionStore")
+
+        account_id = randoms.account_id()
+        region = randoms.region()
+        session = mock.Mock(name="Session for account 1")
+
+        session_store.get_session_for = mock.Mock(
+            name="SessionStore#get_session_for",
+            return_value=session)
+
+        ec2_gateways = EC2Gateways(session_store, [account_id], [region])
+
+        first_ec2_gateway = \
+            ec2_gateways.by_account_id_and_region(account_id, region)
+        second_ec2_gateway = \
+            ec2_gateways.by_account_id_and_region(account_id, region)
+        all_ec2_gateways = ec2_gateways.all()
+
+        self.assertIs(first_ec2_gateway, second_ec2_gateway)
+        self.assertIs(all_ec2_gateways[0], first_ec2_gateway)
+        self.assertEqual(len(session_store.get_session_for.mock_calls), 1)
+
+    def test_passes_max_pool_connections_to_ec2_gateways(self):
+        session_store = mock.Mock(name="SessionStore")
+
+        account_id = randoms.account_id()
+        region = randoms.region()
+
+        ec2_gateways = EC2Gateways(
+            session_store, [account_id], [region], max_pool_connections=50)
+
+        ec2_gateway_instance = \
+            ec2_gateways.by_account_id_and_region(account_id, region)
+
+        self.assertEqual(ec2_gateway_instance.max_pool_connections, 50)
@@ -0,0 +1,106 @@
+import unittest
+from unittest.mock import Mock
+
+from auto_peering.event_coalescer import EventCoalescer
+from auto_peering.event_stores import InMemoryEventStore
+
+ACCOUNT_ID = '111122223333'
+VPC_1_ID = 'vpc-11111111'
+VPC_2_ID = 'vpc-22222222'
+
+
+class TestEventCoalescer(unittest.TestCase):
+    def coalescer(self, store=None, window_seconds=60, now=1000.0):
+        return EventCoalescer(
+            store or InMemoryEventStore(), Mock(name="Logger"),
+            window_seconds=window_seconds,
+            clock=Mock(return_value=now))
+
+    def test_passes_targets_through_when_window_is_disabled(self):
+        targets = [
+            (ACCOUNT_ID, VPC_1_ID, 'provision'),
+            (ACCOUNT_ID, VPC_1_ID, 'destroy')]
+
+        coalesced = self.coalescer(window_seconds=0).coalesce(targets)
+
+        self.assertEqual(coalesced, targets)
+
+    def test_collapses_repeated_creates(self):
+        coalesced = self.coalescer().coalesce([
+            (ACCOUNT_ID, VPC_1_ID, 'provision'),
+            (ACCOUNT_ID, VPC_2_ID, 'provision'),
+            (ACCOUNT_ID, VPC_1_ID, 'provision')])
+
+        self.assertEqual(
+            coalesced,
+            [(ACCOUNT_ID, VPC_1_ID, 'provision'),
+             (ACCOUNT_ID, VPC_2_ID, 'provision')])
+
+    def test_drops_create_destroy_pairs(self):
+        coalesced = self.coalescer().coalesce([
+            (ACCOUNT_ID, VPC_1_ID, 'provision'),
+            (ACCOUNT_ID, VPC_2_ID, 'provision'),
+            (ACCOUNT_ID, VPC_1_ID, 'destroy')])
+
+        self.assertEqual(coalesced, [(ACCOUNT_ID, VPC_2_ID, 'provision')])
+
+    def test_ignores_unsupported_actions_when_folding(self):
+        coalesced = self.coalescer().coalesce([
+            (ACCOUNT_ID, VPC_1_ID, 'provision'),
+            (ACCOUNT_ID, VPC_1_ID, 'update'),
+            (ACCOUNT_ID, VPC_2_ID, 'update')])
+
+        self.assertEqual(coalesced, [(ACCOUNT_ID, VPC_1_ID, 'provision')])
+
+    def test_keeps_destroy_when_create_was_already_processed(self):
+        store = InMemoryEventStore()
+        store.put((ACCOUNT_ID, VPC_1_ID), 'provision', 990.0)
+
+        coalesced = self.coalescer(store).coalesce([
+            (ACCOUNT_ID, VPC_1_ID, 'provision'),
+            (ACCOUNT_ID, VPC_1_ID, 'destroy')])
+
+        self.assertEqual(coalesced, [(ACCOUNT_ID, VPC_1_ID, 'destroy')])
+
+    def test_keeps_create_already_processed_within_window(self):
+        store = InMemoryEventStore()
+        store.put((ACCOUNT_ID, VPC_1_ID), 'provision', 990.0)
+
+        coalesced = self.coalescer(store).coalesce([
+            (ACCOUNT_ID, VPC_1_ID, 'provision')])
+
+        self.assertEqual(coalesced, [(ACCOUNT_ID, VPC_1_ID, 'provision')])
+
+    def test_drops_destroy_already_processed_within_window(self):
+        store = InMemoryEventStore()
+        store.put((ACCOUNT_ID, VPC_1_ID), 'destroy', 990.0)
+
+        coalesced = self.coalescer(store).coalesce([
+            (ACCOUNT_ID, VPC_1_ID, 'destroy')])
+
+        self.assertEqual(coalesced, [])
+
+    def test_keeps_create_processed_before_window(self):
+        store = InMemoryEventStore()
+        store.put((ACCOUNT_ID, VPC_1_ID), 'provision', 900.0)
+
+        coalesced = self.coalescer(store).coalesce([
+            (ACCOUNT_ID, VPC_1_ID, 'provision')])
+
+        self.assertEqual(coalesced, [(ACCOUNT_ID, VPC_1_ID, 'provision')])
+
+    def test_records_processed_targets(self):
+        store = InMemoryEventStore()
+
+        self.coalescer(store).record([(ACCOUNT_ID, VPC_1_ID, 'provision')])
+
+        self.assertEqual(
+            store.get((ACCOUNT_ID, VPC_1_ID)), ('provision', 1000.0))
+
+    def test_does_not_record_when_window_is_disabled(self):
+        store = InMemoryEventStore()
+
+        self.coalescer(store, window_seconds=0).record(
+            [(ACCOUNT_ID, VPC_1_ID, 'provision')])
+
+        self.assertIsNone(store.get((ACCOUNT_ID, VPC_1_ID)))
@@ -0,0 +1,83 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from auto_peering.event_stores import (
+    InMemoryEventStore,
+    SQLiteEventStore,
+    event_store_for,
+    MEMORY_EVENT_STORE,
+    SQLITE_EVENT_STORE)
+
+
+class EventStoreExamples(object):
+    def test_returns_none_for_unknown_key(self):
+        self.assertIsNone(self.store.get(('111122223333', 'vpc-11111111')))
+
+    def test_returns_latest_recorded_action_and_time(self):
+        key = ('111122223333', 'vpc-11111111')
+
+        self.store.put(key, 'provision', 100.0)
+        self.store.put(key, 'destroy', 200.0)
+
+        self.assertEqual(self.store.get(key), ('destroy', 200.0))
+
+    def test_prunes_entries_recorded_before_cutoff(self):
+        old_key = ('111122223333', 'vpc-11111111')
+        new_key = ('111122223333', 'vpc-22222222')
+
+        self.store.put(old_key, 'provision', 100.0)
+        self.store.put(new_key, 'provision', 300.0)
+        self.store.prune(200.0)
+
+        self.assertIsNone(self.store.get(old_key))
+        self.assertEqual(self.store.get(new_key), ('provision', 300.0))
+
+
+class TestInMemoryEventStore(EventStoreExamples, unittest.TestCase):
+    def setUp(self):
+        self.store = InMemoryEventStore()
+
+
+class TestSQLiteEventStore(EventStoreExamples, unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'events.sqlite')
+        self.store = SQLiteEventStore(self.path)
+
+    def tearDown(self):
+        self.store.close()
+        shutil.rmtree(self.directory)
+
+    def test_persists_entries_across_instances(self):
+        key = ('111122223333', 'vpc-11111111')
+
+        self.store.put(key, 'provision', 100.0)
+
+        other_store = SQLiteEventStore(self.path)
+        try:
+            self.assertEqual(other_store.get(key), ('provision', 100.0))
+        finally:
+            other_store.close()
+
+
+class TestEventStoreFor(unittest.TestCase):
+    def test_returns_same_in_memory_store_for_repeated_calls(self):
+        store = event_store_for(MEMORY_EVENT_STORE)
+
+        self.assertIsInstance(store, InMemoryEventStore)
+        self.assertIs(event_store_for(MEMORY_EVENT_STORE), store)
+
+    def test_returns_sqlite_store_at_path(self):
+        directory = tempfile.mkdtemp()
+        try:
+            path = os.path.join(directory, 'events.sqlite')
+
+            store = event_store_for(SQLITE_EVENT_STORE, path)
+
+            self.assertIsInstance(store, SQLiteEventStore)
+            self.assertEqual(store.path, path)
+            store.close()
+        finally:
+            shutil.rmtree(directory)
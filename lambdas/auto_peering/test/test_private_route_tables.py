@@ -0,0 +1,107 @@
+import unittest
+from unittest.mock import Mock, call
+
+from auto_peering.private_route_tables import PrivateRouteTables
+from auto_peering.vpc import VPC
+from test import randoms, mocks
+
+
+class TestPrivateRouteTables(unittest.TestCase):
+    def test_loads_route_tables_once_per_gateway_for_included_vpcs(self):
+        account_id = randoms.account_id()
+        region_1 = "eu-west-1"
+        region_2 = "eu-west-2"
+
+        vpc_1 = VPC(mocks.build_vpc_response_mock(), account_id, region_1)
+        vpc_2 = VPC(mocks.build_vpc_response_mock(), account_id, region_1)
+        vpc_3 = VPC(mocks.build_vpc_response_mock(), account_id, region_2)
+
+        ec2_gateway_1 = mocks.EC2Gateway(account_id, region_1)
+        ec2_gateway_2 = mocks.EC2Gateway(account_id, region_2)
+        ec2_gateways = mocks.EC2Gateways([ec2_gateway_1, ec2_gateway_2])
+
+        vpc_1_route_table_1 = mocks.build_route_table_mock(
+            name="VPC 1 RT 1", vpc_id=vpc_1.id)
+        vpc_1_route_table_2 = mocks.build_route_table_mock(
+            name="VPC 1 RT 2", vpc_id=vpc_1.id)
+        vpc_2_route_table = mocks.build_route_table_mock(
+            name="VPC 2 RT", vpc_id=vpc_2.id)
+        vpc_3_route_table = mocks.build_route_table_mock(
+            name="VPC 3 RT", vpc_id=vpc_3.id)
+
+        ec2_gateway_1.resource().route_tables.filter = Mock(
+            name="Region 1 route tables",
+            return_value=iter([
+                vpc_1_route_table_1, vpc_2_route_table, vpc_1_route_table_2]))
+        ec2_gateway_2.resource().route_tables.filter = Mock(
+            name="Region 2 route tables",
+            return_value=iter([vpc_3_route_table]))
+
+        route_tables = PrivateRouteTables(ec2_gateways, Mock(name="Logger"))
+        route_tables.include([vpc_1, vpc_2, vpc_3])
+
+        self.assertEqual(
+            route_tables.find_for(vpc_1),
+            [vpc_1_route_table_1, vpc_1_route_table_2])
+        self.assertEqual(route_tables.find_for(vpc_2), [vpc_2_route_table])
+        self.assertEqual(route_tables.find_for(vpc_3), [vpc_3_route_table])
+
+        ec2_gateway_1.resource().route_tables.filter.assert_called_once_with(
+            Filters=[
+                {'Name': 'vpc-id',
+                 'Values': sorted([vpc_1.id, vpc_2.id])},
+                {'Name': 'tag:Tier', 'Values': ['private']}])
+        ec2_gateway_2.resource().route_tables.filter.assert_called_once_with(
+            Filters=[
+                {'Name': 'vpc-id', 'Values': [vpc_3.id]},
+                {'Name': 'tag:Tier', 'Values': ['private']}])
+
+    def test_loads_vpcs_not_previously_included_on_lookup(self):
+        account_id = randoms.account_id()
+        region = randoms.region()
+
+        vpc = VPC(mocks.build_vpc_response_mock(), account_id, region)
+
+        ec2_gateway = mocks.EC2Gateway(account_id, region)
+        ec2_gateways = mocks.EC2Gateways([ec2_gateway])
+
+        route_table = mocks.build_route_table_mock(
+            name="Route table", vpc_id=vpc.id)
+        ec2_gateway.resource().route_tables.filter = Mock(
+            name="Route tables",
+            return_value=iter([route_table]))
+
+        route_tables = PrivateRouteTables(ec2_gateways, Mock(name="Logger"))
+
+        self.assertEqual(route_tables.find_for(vpc), [route_table])
+        self.assertEqual(route_tables.find_for(vpc), [route_table])
+        self.assertEqual(
+            len(ec2_gateway.resource().route_tables.filter.mock_calls), 1)
+
+    def test_chunks_vpc_id_filters_at_max_filter_values(self):
+        account_id = randoms.account_id()
+        region = randoms.region()
+
+        vpcs = [VPC(mocks.build_vpc_response_mock(), account_id, region)
+                for _ in range(201)]
+        vpc_ids = sorted(vpc.id for vpc in vpcs)
+
+        ec2_gateway = mocks.EC2Gateway(account_id, region)
+        ec2_gateways = mocks.EC2Gateways([ec2_gateway])
+
+        ec2_gateway.resource().route_tables.filter = Mock(
+            name="Route tables",
+            return_value=[])
+
+        route_tables = PrivateRouteTables(ec2_gateways, Mock(name="Logger"))
+        route_tables.include(vpcs)
+        route_tables.load()
+
+        self.assertCountEqual(
+            ec2_gateway.resource().route_tables.filter.call_args_list,
+            [call(Filters=[
+                {'Name': 'vpc-id', 'Values': vpc_ids[:200]},
+                {'Name': 'tag:Tier', 'Values': ['private']}]),
+             call(Filters=[
+                 {'Name': 'vpc-id', 'Values': vpc_ids[200:]},
+                 {'Name': 'tag:Tier', 'Values': ['private']}])])
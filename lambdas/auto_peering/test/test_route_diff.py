@@ -0,0 +1,51 @@
+import unittest
+
+from auto_peering.route_diff import RouteDiff
+from test import randoms, mocks
+
+
+class TestRouteDiff(unittest.TestCase):
+    def test_classifies_route_tables_by_existing_route(self):
+        cidr_block = '10.1.0.0/16'
+        peering_connection_id = randoms.peering_connection_id()
+        other_peering_connection_id = randoms.peering_connection_id()
+
+        missing_route_table = mocks.build_route_table_mock(
+            name="Missing",
+            routes=[{'DestinationCidrBlock': '10.2.0.0/16',
+                     'VpcPeeringConnectionId': peering_connection_id,
+                     'State': 'active'}])
+        up_to_date_route_table = mocks.build_route_table_mock(
+            name="Up to date",
+            routes=[{'DestinationCidrBlock': cidr_block,
+                     'VpcPeeringConnectionId': peering_connection_id,
+                     'State': 'active'}])
+        stale_route_table = mocks.build_route_table_mock(
+            name="Stale",
+            routes=[{'DestinationCidrBlock': cidr_block,
+                     'VpcPeeringConnectionId': other_peering_connection_id,
+                     'State': 'blackhole'}])
+        conflicting_route_table = mocks.build_route_table_mock(
+            name="Conflicting",
+            routes=[{'DestinationCidrBlock': cidr_block,
+                     'GatewayId': 'igw-12345678',
+                     'State': 'active'}])
+
+        route_diff = RouteDiff(
+            [missing_route_table, up_to_date_route_table,
+             stale_route_table, conflicting_route_table],
+            cidr_block,
+            peering_connection_id)
+
+        self.assertEqual(route_diff.missing, [missing_route_table])
+        self.assertEqual(route_diff.up_to_date, [up_to_date_route_table])
+        self.assertEqual(route_diff.stale, [stale_route_table])
+        self.assertEqual(route_diff.conflicting, [conflicting_route_table])
+
+    def test_treats_route_tables_without_routes_as_missing(self):
+        route_table = mocks.build_route_table_mock(routes=None)
+
+        route_diff = RouteDiff(
+            [route_table], '10.1.0.0/16', randoms.peering_connection_id())
+
+        self.assertEqual(route_diff.missing, [route_table])
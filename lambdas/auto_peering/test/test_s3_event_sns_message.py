@@ -1,7 +1,9 @@
 import unittest
 import json
 
-from auto_peering.s3_event_sns_message import S3EventSNSMessage
+from auto_peering.s3_event_sns_message import (
+    S3EventSNSMessage,
+    S3EventSNSMessages)
 
 
 def s3_event_for(event_name, key):
@@ -10,8 +12,10 @@ def s3_event_for(event_name, key):
     ]}
 
 
-def sns_message_containing(s3_event):
-    return {'Records': [{'Sns': {'Message': json.dumps(s3_event)}}]}
+def sns_message_containing(*s3_events):
+    return {'Records': [
+        {'Sns': {'Message': json.dumps(s3_event)}} for s3_event in s3_events
+    ]}
 
 
 class TestS3EventSNSMessage(unittest.TestCase):
@@ -70,5 +74,46 @@ class TestS3EventSNSMessage(unittest.TestCase):
         self.assertEqual(message.vpc_id(), 'vpc-4e1ed427')
 
 
+class TestS3EventSNSMessages(unittest.TestCase):
+    def test_includes_every_s3_record_in_every_sns_record(self):
+        event = sns_message_containing(
+            {'Records': [
+                {'eventName': 'ObjectCreated:Put',
+                 's3': {'object': {
+                     'key': 'vpc-existence/111122223333/vpc-11111111'}}},
+                {'eventName': 'ObjectCreated:Put',
+                 's3': {'object': {
+                     'key': 'vpc-existence/111122223333/vpc-22222222'}}}]},
+            s3_event_for('ObjectRemoved:Delete',
+                         'vpc-existence/444455556666/vpc-33333333'))
+
+        messages = S3EventSNSMessages(event)
+
+        self.assertEqual(
+            [message.target() for message in messages.all()],
+            [('111122223333', 'vpc-11111111', 'provision'),
+             ('111122223333', 'vpc-22222222', 'provision'),
+             ('444455556666', 'vpc-33333333', 'destroy')])
+
+    def test_deduplicates_targets_preserving_order(self):
+        event = sns_message_containing(
+            s3_event_for('ObjectCreated:Put',
+                         'vpc-existence/111122223333/vpc-22222222'),
+            s3_event_for('ObjectCreated:Put',
+                         'vpc-existence/111122223333/vpc-11111111'),
+            s3_event_for('ObjectCreated:Copy',
+                         'vpc-existence/111122223333/vpc-22222222'))
+
+        messages = S3EventSNSMessages(event)
+
+        self.assertEqual(
+            messages.targets(),
+            [('111122223333', 'vpc-22222222', 'provision'),
+             ('111122223333', 'vpc-11111111', 'provision')])
+
+    def test_has_no_targets_for_event_without_records(self):
+        self.assertEqual(S3EventSNSMessages({}).targets(), [])
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,160 @@
+import unittest
+import json
+from unittest.mock import Mock
+
+from auto_peering.s3_event_sqs_messages import S3EventSQSMessages
+
+
+def s3_event_for(event_name, key):
+    return {'Records': [
+        {'eventName': event_name, 's3': {'object': {'key': key}}}
+    ]}
+
+
+def sqs_record(message_id, body):
+    return {'messageId': message_id, 'body': body}
+
+
+def sns_notification_containing(s3_event):
+    return json.dumps(
+        {'Type': 'Notification', 'Message': json.dumps(s3_event)})
+
+
+def vpc_event_record(message_id, event_name, vpc_id):
+    return sqs_record(message_id, sns_notification_containing(
+        s3_event_for(event_name,
+                     'vpc-existence/111122223333/{}'.format(vpc_id))))
+
+
+class TestS3EventSQSMessages(unittest.TestCase):
+    def test_reads_targets_from_sns_notifications(self):
+        event = {'Records': [
+            sqs_record('message-1', sns_notification_containing(
+                s3_event_for('ObjectCreated:Put',
+                             'vpc-existence/111122223333/vpc-11111111'))),
+            sqs_record('message-2', sns_notification_containing(
+                s3_event_for('ObjectRemoved:Delete',
+                             'vpc-existence/111122223333/vpc-22222222')))]}
+
+        messages = S3EventSQSMessages(event)
+
+        self.assertEqual(
+            messages.all(),
+            [('message-1', [('111122223333', 'vpc-11111111', 'provision')]),
+             ('message-2', [('111122223333', 'vpc-22222222', 'destroy')])])
+
+    def test_reads_targets_from_raw_s3_events(self):
+        event = {'Records': [
+            sqs_record('message-1', json.dumps(
+                s3_event_for('ObjectCreated:Put',
+                             'vpc-existence/111122223333/vpc-11111111')))]}
+
+        messages = S3EventSQSMessages(event)
+
+        self.assertEqual(
+            messages.all(),
+            [('message-1', [('111122223333', 'vpc-11111111', 'provision')])])
+
+    def test_has_no_targets_for_s3_test_events(self):
+        event = {'Records': [
+            sqs_record('message-1', sns_notification_containing(
+                {'Service': 'Amazon S3', 'Event': 's3:TestEvent'}))]}
+
+        messages = S3EventSQSMessages(event)
+
+        self.assertEqual(messages.all(), [('message-1', [])])
+
+    def test_has_no_targets_and_logs_for_unparseable_messages(self):
+        logger = Mock()
+        event = {'Records': [sqs_record('message-1', 'not json')]}
+
+        messages = S3EventSQSMessages(event, logger)
+
+        self.assertEqual(messages.all(), [('message-1', None)])
+        logger.warn.assert_called_once()
+
+    def test_reports_messages_with_failed_targets(self):
+        event = {'Records': [
+            vpc_event_record('message-1', 'ObjectCreated:Put', 'vpc-11111111'),
+            vpc_event_record(
+                'message-2', 'ObjectCreated:Put', 'vpc-22222222')]}
+        manage_peering_for = Mock(
+            return_value=[('111122223333', 'vpc-22222222', 'provision')])
+
+        response = S3EventSQSMessages(event, Mock()).process_with(
+            manage_peering_for)
+
+        manage_peering_for.assert_called_once_with(
+            [('111122223333', 'vpc-11111111', 'provision'),
+             ('111122223333', 'vpc-22222222', 'provision')])
+        self.assertEqual(
+            response,
+            {'batchItemFailures': [{'itemIdentifier': 'message-2'}]})
+
+    def test_reports_unparseable_messages(self):
+        event = {'Records': [
+            vpc_event_record('message-1', 'ObjectCreated:Put', 'vpc-11111111'),
+            sqs_record('message-2', 'not json')]}
+        manage_peering_for = Mock(return_value=[])
+
+        response = S3EventSQSMessages(event, Mock()).process_with(
+            manage_peering_for)
+
+        manage_peering_for.assert_called_once_with(
+            [('111122223333', 'vpc-11111111', 'provision')])
+        self.assertEqual(
+            response,
+            {'batchItemFailures': [{'itemIdentifier': 'message-2'}]})
+
+    def test_reports_every_message_when_processing_raises(self):
+        logger = Mock()
+        event = {'Records': [
+            vpc_event_record('message-1', 'ObjectCreated:Put', 'vpc-11111111'),
+            vpc_event_record('message-2', 'ObjectRemoved:Delete',
+                             'vpc-22222222'),
+            sqs_record('message-3', sns_notification_containing(
+                {'Service': 'Amazon S3', 'Event': 's3:TestEvent'}))]}
+        manage_peering_for = Mock(side_effect=Exception("Boom"))
+
+        response = S3EventSQSMessages(event, logger).process_with(
+            manage_peering_for)
+
+        self.assertEqual(
+            response,
+            {'batchItemFailures': [
+                {'itemIdentifier': 'message-1'},
+                {'itemIdentifier': 'message-2'}]})
+        logger.warn.assert_called_once()
+
+    def test_does_not_report_messages_whose_targets_were_coalesced_away(self):
+        event = {'Records': [
+            vpc_event_record('message-1', 'ObjectCreated:Put', 'vpc-11111111'),
+            vpc_event_record('message-2', 'ObjectRemoved:Delete',
+                             'vpc-11111111'),
+            vpc_event_record(
+                'message-3', 'ObjectCreated:Put', 'vpc-11111111')]}
+        manage_peering_for = Mock(return_value=[])
+
+        response = S3EventSQSMessages(event, Mock()).process_with(
+            manage_peering_for)
+
+        manage_peering_for.assert_called_once_with(
+            [('111122223333', 'vpc-11111111', 'provision'),
+             ('111122223333', 'vpc-11111111', 'destroy')])
+        self.assertEqual(response, {'batchItemFailures': []})
+
+    def test_does_not_process_when_no_message_has_targets(self):
+        event = {'Records': [sqs_record('message-1', 'not json')]}
+        manage_peering_for = Mock()
+
+        response = S3EventSQSMessages(event, Mock()).process_with(
+            manage_peering_for)
+
+        manage_peering_for.assert_not_called()
+        self.assertEqual(
+            response,
+            {'batchItemFailures': [{'itemIdentifier': 'message-1'}]})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,7 +1,14 @@
+import gc
 import unittest
 import unittest.mock as mock
+import weakref
+from datetime import datetime, timedelta, timezone
+import botocore.session
+from botocore.credentials import Credentials
+from botocore.exceptions import ClientError
 
-from auto_peering.session_store import SessionStore
+from auto_peering.credential_cache import CredentialCache
+from auto_peering.session_store import SessionStore, use_credentials
 
 from test import mocks, randoms, builders
 
@@ -63,3 +70,232 @@ class TestSessionStore(unittest.TestCase):
 
         self.assertEqual(len(sts_client.assume_role.mock_calls), 1)
         self.assertEqual(first_session, second_session)
+
+    def test_shares_service_model_loader_across_sessions(self):
+        sts_client = mocks.build_sts_client_mock()
+        peering_role_name = randoms.role_name()
+        account_1_id = randoms.account_id()
+        account_2_id = randoms.account_id()
+
+        _, assume_role_mock = mocks.build_sts_assume_role_mock()
+
+        sts_client.assume_role = assume_role_mock
+
+        session_store = SessionStore(sts_client, peering_role_name)
+
+        first_session = session_store.get_session_for(account_1_id)
+        second_session = session_store.get_session_for(account_2_id)
+
+        self.assertIsNot(first_session, second_session)
+        self.assertIs(
+            first_session._session.get_component('data_loader'),
+            second_session._session.get_component('data_loader'))
+
+    def test_does_not_grow_shared_loader_search_paths(self):
+        sts_client = mocks.build_sts_client_mock()
+        peering_role_name = randoms.role_name()
+        account_id = randoms.account_id()
+
+        _, assume_role_mock = mocks.build_sts_assume_role_mock()
+
+        sts_client.assume_role = assume_role_mock
+
+        session = SessionStore(sts_client, peering_role_name) \
+            .get_session_for(account_id)
+        search_paths = \
+            session._session.get_component('data_loader').search_paths
+        search_paths_count = len(search_paths)
+
+        for _ in range(3):
+            SessionStore(sts_client, peering_role_name) \
+                .get_session_for(account_id)
+
+        self.assertEqual(len(search_paths), search_paths_count)
+        self.assertEqual(len(set(search_paths)), search_paths_count)
+
+    def test_reuses_credentials_across_session_stores(self):
+        sts_client = mocks.build_sts_client_mock()
+        peering_role_name = randoms.role_name()
+        account_id = randoms.account_id()
+
+        expected_credentials, assume_role_mock = \
+            mocks.build_sts_assume_role_mock()
+
+        sts_client.assume_role = assume_role_mock
+
+        credentials = CredentialCache()
+
+        first_session_store = SessionStore(
+            sts_client, peering_role_name, credentials)
+        second_session_store = SessionStore(
+            sts_client, peering_role_name, credentials)
+
+        first_session_store.get_session_for(account_id)
+        session = second_session_store.get_session_for(account_id)
+
+        self.assertEqual(len(sts_client.assume_role.mock_calls), 1)
+        self.assertEqual(
+            session.get_credentials().access_key,
+            expected_credentials.access_key)
+
+    def test_does_not_retain_sessions_of_discarded_session_stores(self):
+        sts_client = mocks.build_sts_client_mock()
+        peering_role_name = randoms.role_name()
+        account_ids = [randoms.account_id() for _ in range(3)]
+
+        _, assume_role_mock = mocks.build_sts_assume_role_mock()
+
+        sts_client.assume_role = assume_role_mock
+
+        credentials = CredentialCache()
+
+        session_store_references = []
+        for _ in range(5):
+            session_store = SessionStore(
+                sts_client, peering_role_name, credentials)
+            for account_id in account_ids:
+                session_store.get_session_for(account_id)
+            session_store_references.append(weakref.ref(session_store))
+        del session_store
+        gc.collect()
+
+        self.assertEqual(
+            [reference() for reference in session_store_references],
+            [None] * 5)
+
+    def test_assumes_role_again_when_credentials_near_expiry(self):
+        sts_client = mocks.build_sts_client_mock()
+        peering_role_name = randoms.role_name()
+        account_id = randoms.account_id()
+
+        _, assume_role_mock = mocks.build_sts_assume_role_mock(
+            expiration=datetime.now(timezone.utc) + timedelta(minutes=5))
+        refreshed_credentials, refreshed_assume_role_mock = \
+            mocks.build_sts_assume_role_mock()
+
+        sts_client.assume_role = mock.Mock(
+            name='STS Assume Role',
+            side_effect=[
+                assume_role_mock.return_value,
+                refreshed_assume_role_mock.return_value])
+
+        session_store = SessionStore(
+            sts_client, peering_role_name, CredentialCache())
+
+        session = session_store.get_session_for(account_id)
+
+        actual_credentials = session.get_credentials().get_frozen_credentials()
+
+        self.assertEqual(len(sts_client.assume_role.mock_calls), 2)
+        self.assertEqual(
+            actual_credentials.access_key,
+            refreshed_credentials.access_key)
+
+    def test_prefetches_credentials_for_all_accounts(self):
+        sts_client = mocks.build_sts_client_mock()
+        peering_role_name = randoms.role_name()
+        account_1_id = randoms.account_id()
+        account_2_id = randoms.account_id()
+
+        _, assume_role_mock = mocks.build_sts_assume_role_mock()
+
+        sts_client.assume_role = assume_role_mock
+
+        session_store = SessionStore(
+            sts_client, peering_role_name, CredentialCache())
+
+        failures = session_store.prefetch_credentials_for(
+            [account_1_id, account_2_id], 2)
+        session_store.get_session_for(account_1_id)
+        session_store.get_session_for(account_2_id)
+
+        self.assertEqual(failures, [])
+        self.assertEqual(len(sts_client.assume_role.mock_calls), 2)
+        sts_client.assume_role.assert_any_call(
+            RoleArn=builders.build_role_arn_for(
+                account_1_id, peering_role_name),
+            RoleSessionName="vpc-auto-peering-lambda")
+        sts_client.assume_role.assert_any_call(
+            RoleArn=builders.build_role_arn_for(
+                account_2_id, peering_role_name),
+            RoleSessionName="vpc-auto-peering-lambda")
+
+    def test_reports_accounts_that_could_not_be_prefetched(self):
+        sts_client = mocks.build_sts_client_mock()
+        peering_role_name = randoms.role_name()
+        account_1_id = randoms.account_id()
+        account_2_id = randoms.account_id()
+
+        _, assume_role_mock = mocks.build_sts_assume_role_mock()
+        assume_role_error = ClientError(
+            {'Error': {'Code': 'AccessDenied'}}, 'AssumeRole')
+
+        def assume_role(**kwargs):
+            if account_2_id in kwargs['RoleArn']:
+                raise assume_role_error
+            return assume_role_mock.return_value
+
+        sts_client.assume_role = mock.Mock(
+            name='STS Assume Role', side_effect=assume_role)
+
+        session_store = SessionStore(
+            sts_client, peering_role_name, CredentialCache())
+
+        failures = session_store.prefetch_credentials_for(
+            [account_1_id, account_2_id], 2)
+
+        self.assertEqual(failures, [(account_2_id, assume_role_error)])
+
+    def test_uses_ambient_session_for_ambient_account(self):
+        sts_client = mocks.build_sts_client_mock()
+        peering_role_name = randoms.role_name()
+        account_id = randoms.account_id()
+
+        _, assume_role_mock = mocks.build_sts_assume_role_mock()
+
+        sts_client.assume_role = assume_role_mock
+
+        session_store = SessionStore(
+            sts_client, peering_role_name, CredentialCache(),
+            ambient_account_id=account_id)
+
+        session = session_store.get_session_for(account_id)
+        failures = session_store.prefetch_credentials_for([account_id], 2)
+
+        self.assertIsNotNone(session)
+        self.assertEqual(failures, [])
+        sts_client.assume_role.assert_not_called()
+
+    def test_assumes_role_for_accounts_other_than_ambient_account(self):
+        sts_client = mocks.build_sts_client_mock()
+        peering_role_name = randoms.role_name()
+        ambient_account_id = randoms.account_id()
+        other_account_id = randoms.account_id()
+
+        _, assume_role_mock = mocks.build_sts_assume_role_mock()
+
+        sts_client.assume_role = assume_role_mock
+
+        session_store = SessionStore(
+            sts_client, peering_role_name, CredentialCache(),
+            ambient_account_id=ambient_account_id)
+
+        session_store.get_session_for(other_account_id)
+
+        sts_client.assume_role.assert_called_once_with(
+            RoleArn=builders.build_role_arn_for(
+                other_account_id, peering_role_name),
+            RoleSessionName="vpc-auto-peering-lambda")
+
+
+class TestUseCredentials(unittest.TestCase):
+    def test_resolves_provided_credentials(self):
+        botocore_session = botocore.session.get_session()
+        credentials = Credentials(
+            randoms.temporary_access_key_id(),
+            randoms.secret_access_key(),
+            randoms.session_token())
+
+        use_credentials(botocore_session, credentials)
+
+        self.assertIs(botocore_session.get_credentials(), credentials)
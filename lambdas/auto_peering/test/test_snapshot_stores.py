@@ -0,0 +1,75 @@
+import io
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import Mock
+
+from botocore.exceptions import ClientError
+
+from auto_peering.snapshot_stores import (
+    FileSystemSnapshotStore,
+    S3SnapshotStore)
+
+
+class TestFileSystemSnapshotStore(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'topology.json.gz')
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_returns_none_when_no_snapshot_written(self):
+        self.assertIsNone(FileSystemSnapshotStore(self.path).read())
+
+    def test_reads_latest_written_snapshot(self):
+        store = FileSystemSnapshotStore(self.path)
+
+        store.write(b'first')
+        store.write(b'second')
+
+        self.assertEqual(FileSystemSnapshotStore(self.path).read(), b'second')
+        self.assertEqual(os.listdir(self.directory), ['topology.json.gz'])
+
+
+class TestS3SnapshotStore(unittest.TestCase):
+    def test_reads_snapshot_object(self):
+        s3_client = Mock(name="S3 client")
+        s3_client.get_object = Mock(
+            return_value={'Body': io.BytesIO(b'snapshot')})
+
+        store = S3SnapshotStore(s3_client, 'bucket', 'topology.json.gz')
+
+        self.assertEqual(store.read(), b'snapshot')
+        s3_client.get_object.assert_called_once_with(
+            Bucket='bucket', Key='topology.json.gz')
+
+    def test_returns_none_when_snapshot_object_missing(self):
+        s3_client = Mock(name="S3 client")
+        s3_client.get_object = Mock(side_effect=ClientError(
+            {'Error': {'Code': 'NoSuchKey'}}, 'GetObject'))
+
+        store = S3SnapshotStore(s3_client, 'bucket', 'topology.json.gz')
+
+        self.assertIsNone(store.read())
+
+    def test_raises_other_read_errors(self):
+        s3_client = Mock(name="S3 client")
+        s3_client.get_object = Mock(side_effect=ClientError(
+            {'Error': {'Code': 'AccessDenied'}}, 'GetObject'))
+
+        store = S3SnapshotStore(s3_client, 'bucket', 'topology.json.gz')
+
+        with self.assertRaises(ClientError):
+            store.read()
+
+    def test_writes_snapshot_object(self):
+        s3_client = Mock(name="S3 client")
+
+        S3SnapshotStore(s3_client, 'bucket', 'topology.json.gz') \
+            .write(b'snapshot')
+
+        s3_client.put_object.assert_called_once_with(
+            Bucket='bucket', Key='topology.json.gz', Body=b'snapshot',
+            ContentType='application/gzip')
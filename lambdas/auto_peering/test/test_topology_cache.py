@@ -0,0 +1,149 @@
+import unittest
+from unittest.mock import Mock
+
+from auto_peering.topology_cache import TopologyCache
+from auto_peering.vpc import VPC
+from test import randoms, mocks, builders
+
+
+def vpc():
+    return VPC(
+        mocks.build_vpc_response_mock(), randoms.account_id(),
+        randoms.region())
+
+
+class TestTopologyCache(unittest.TestCase):
+    def test_returns_put_topology_for_same_key_within_ttl(self):
+        clock = Mock(return_value=1000.0)
+        cache = TopologyCache(clock=clock)
+        vpcs = [vpc(), vpc()]
+        peering_connections = Mock(name="Peering connections")
+
+        cache.put('key', vpcs, peering_connections)
+        clock.return_value = 1030.0
+        topology = cache.get('key', 60)
+
+        self.assertEqual(topology.vpcs, vpcs)
+        self.assertIs(topology.peering_connections, peering_connections)
+        self.assertEqual(topology.built_at, 1000.0)
+
+    def test_returns_none_when_nothing_cached(self):
+        self.assertIsNone(TopologyCache().get('key', 60))
+
+    def test_returns_none_for_different_key(self):
+        cache = TopologyCache(clock=Mock(return_value=1000.0))
+
+        cache.put('key', [vpc()], Mock())
+
+        self.assertIsNone(cache.get('other-key', 60))
+
+    def test_discards_topology_older_than_ttl(self):
+        clock = Mock(return_value=1000.0)
+        cache = TopologyCache(clock=clock)
+
+        cache.put('key', [vpc()], Mock())
+        clock.return_value = 1061.0
+
+        self.assertIsNone(cache.get('key', 60))
+        clock.return_value = 1000.0
+        self.assertIsNone(cache.get('key', 60))
+
+    def test_adds_vpcs_not_already_cached(self):
+        cache = TopologyCache(clock=Mock(return_value=1000.0))
+        vpc_1 = vpc()
+        vpc_2 = vpc()
+
+        cache.put('key', [vpc_1], Mock())
+        cache.update([vpc_1, vpc_2])
+
+        self.assertEqual(cache.get('key', 60).vpcs, [vpc_1, vpc_2])
+
+    def test_replaces_cached_vpcs_whose_tags_changed(self):
+        cache = TopologyCache(clock=Mock(return_value=1000.0))
+        vpc_1 = vpc()
+        vpc_2 = vpc()
+        updated_vpc_1 = VPC(
+            mocks.build_vpc_response_mock(
+                id=vpc_1.id,
+                tags=builders.build_vpc_tags(dependencies=['new-dependency'])),
+            vpc_1.account_id, vpc_1.region)
+
+        cache.put('key', [vpc_1, vpc_2], Mock())
+        cache.update([updated_vpc_1])
+
+        cached_vpcs = cache.get('key', 60).vpcs
+        self.assertEqual(cached_vpcs, [updated_vpc_1, vpc_2])
+        self.assertEqual(cached_vpcs[0].dependencies, ['new-dependency'])
+
+    def test_evicts_vpcs_by_id(self):
+        cache = TopologyCache(clock=Mock(return_value=1000.0))
+        vpc_1 = vpc()
+        vpc_2 = vpc()
+
+        cache.put('key', [vpc_1, vpc_2], Mock())
+        cache.evict([vpc_1.id])
+
+        self.assertEqual(cache.get('key', 60).vpcs, [vpc_2])
+
+    def test_ignores_patches_when_vpcs_are_not_cached(self):
+        cache = TopologyCache(clock=Mock(return_value=1000.0))
+
+        cache.put('key', None, Mock())
+        cache.update([vpc()])
+        cache.evict(['vpc-12345678'])
+
+        self.assertIsNone(cache.get('key', 60).vpcs)
+
+    def test_clears_cached_topology(self):
+        cache = TopologyCache(clock=Mock(return_value=1000.0))
+
+        cache.put('key', [vpc()], Mock())
+        cache.clear()
+
+        self.assertIsNone(cache.get('key', 60))
+
+    def test_is_dirty_when_freshly_built_until_saved(self):
+        cache = TopologyCache(clock=Mock(return_value=1000.0))
+
+        cache.put('key', [vpc()], Mock(revision=0))
+
+        self.assertTrue(cache.dirty)
+        cache.mark_saved()
+        self.assertFalse(cache.dirty)
+
+    def test_is_clean_when_restored_and_not_patched(self):
+        cache = TopologyCache(clock=Mock(return_value=1000.0))
+        vpc_1 = vpc()
+
+        cache.put('key', [vpc_1], Mock(revision=3), built_at=990.0)
+        cache.update([vpc_1])
+        cache.evict(['vpc-12345678'])
+
+        self.assertFalse(cache.dirty)
+
+    def test_is_dirty_when_restored_vpcs_are_patched(self):
+        cache = TopologyCache(clock=Mock(return_value=1000.0))
+        vpc_1 = vpc()
+        vpc_2 = vpc()
+        updated_vpc_1 = VPC(
+            mocks.build_vpc_response_mock(
+                id=vpc_1.id,
+                tags=builders.build_vpc_tags(dependencies=['new-dependency'])),
+            vpc_1.account_id, vpc_1.region)
+
+        cache.put('key', [vpc_1, vpc_2], Mock(revision=0), built_at=990.0)
+        cache.update([updated_vpc_1])
+        self.assertTrue(cache.dirty)
+
+        cache.mark_saved()
+        cache.evict([vpc_2.id])
+        self.assertTrue(cache.dirty)
+
+    def test_is_dirty_when_peering_connections_change(self):
+        cache = TopologyCache(clock=Mock(return_value=1000.0))
+        peering_connections = Mock(revision=3)
+
+        cache.put('key', [vpc()], peering_connections, built_at=990.0)
+        peering_connections.revision = 4
+
+        self.assertTrue(cache.dirty)
@@ -0,0 +1,172 @@
+import gzip
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import Mock
+
+from auto_peering.snapshot_stores import FileSystemSnapshotStore
+from auto_peering.topology_cache import CachedTopology
+from auto_peering.topology_snapshots import (
+    TopologySnapshots,
+    SNAPSHOT_FORMAT_VERSION)
+from auto_peering.vpc import VPC
+from auto_peering.vpc_peering_connections import VPCPeeringConnections
+from test import randoms, mocks, builders
+
+KEY = (('111122223333',), ('eu-west-1', 'eu-west-2'), 'peering-role', 'full')
+
+
+class TestTopologySnapshots(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.store = FileSystemSnapshotStore(
+            os.path.join(self.directory, 'topology.json.gz'))
+
+        self.account_id = randoms.account_id()
+        self.ec2_gateway_1 = mocks.EC2Gateway(self.account_id, 'eu-west-1')
+        self.ec2_gateway_2 = mocks.EC2Gateway(self.account_id, 'eu-west-2')
+        self.ec2_gateways = mocks.EC2Gateways(
+            [self.ec2_gateway_1, self.ec2_gateway_2])
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def topology(self, built_at=1000.0):
+        vpc_1 = VPC(
+            mocks.build_vpc_response_mock(
+                tags=builders.build_vpc_tags(
+                    component='network', deployment_identifier='production',
+                    dependencies=['shared-services'])),
+            self.account_id, 'eu-west-1')
+        vpc_2 = VPC(
+            mocks.build_vpc_response_mock(
+                tags=builders.build_vpc_tags(
+                    component='shared', deployment_identifier='services')),
+            self.account_id, 'eu-west-2')
+
+        connection = mocks.build_vpc_peering_connection_mock(vpc_1, vpc_2)
+        connection.requester_vpc_info = {
+            'VpcId': vpc_1.id, 'OwnerId': self.account_id,
+            'Region': 'eu-west-1'}
+        connection.accepter_vpc_info = {
+            'VpcId': vpc_2.id, 'OwnerId': self.account_id,
+            'Region': 'eu-west-2'}
+
+        peering_connections = VPCPeeringConnections(
+            self.ec2_gateways, Mock())
+        peering_connections.seed([vpc_1.id, vpc_2.id], [connection])
+
+        return CachedTopology(
+            KEY, [vpc_1, vpc_2], peering_connections, built_at)
+
+    def test_restores_saved_vpcs(self):
+        topology = self.topology()
+        snapshots = TopologySnapshots(self.store, self.ec2_gateways, Mock())
+
+        snapshots.save(topology)
+        restored = snapshots.load(KEY, 60, 1030.0)
+
+        self.assertEqual(restored.key, KEY)
+        self.assertEqual(restored.built_at, 1000.0)
+        self.assertEqual(
+            [(vpc.id, vpc.account_id, vpc.region, vpc.cidr_block,
+              vpc.component, vpc.deployment_identifier, vpc.dependencies)
+             for vpc in restored.vpcs],
+            [(vpc.id, vpc.account_id, vpc.region, vpc.cidr_block,
+              vpc.component, vpc.deployment_identifier, vpc.dependencies)
+             for vpc in topology.vpcs])
+
+    def test_restored_vpcs_request_peering_through_their_gateway(self):
+        snapshots = TopologySnapshots(self.store, self.ec2_gateways, Mock())
+
+        snapshots.save(self.topology())
+        vpc_1, _ = snapshots.load(KEY, 60, 1030.0).vpcs
+        vpc_1.request_vpc_peering_connection(PeerVpcId='vpc-12345678')
+
+        ec2_resource = self.ec2_gateway_1.resource()
+        ec2_resource.Vpc.assert_called_once_with(vpc_1.id)
+        ec2_resource.Vpc.return_value.request_vpc_peering_connection \
+            .assert_called_once_with(PeerVpcId='vpc-12345678')
+
+    def test_restores_peering_connections_without_listing(self):
+        topology = self.topology()
+        vpc_1, vpc_2 = topology.vpcs
+        snapshots = TopologySnapshots(self.store, self.ec2_gateways, Mock())
+
+        snapshots.save(topology)
+        restored = snapshots.load(KEY, 60, 1030.0)
+        connection = restored.peering_connections.find_between(
+            restored.vpcs[0], restored.vpcs[1])
+
+        self.assertEqual(
+            connection.id,
+            topology.peering_connections.find_between(vpc_1, vpc_2).id)
+        self.assertEqual(connection.status, {'Code': 'active'})
+        self.assertEqual(connection.requester_vpc_info['VpcId'], vpc_1.id)
+        self.ec2_gateway_2.resource().vpc_peering_connections.filter \
+            .assert_not_called()
+
+        connection.delete()
+
+        ec2_resource = self.ec2_gateway_2.resource()
+        ec2_resource.VpcPeeringConnection.assert_called_once_with(
+            connection.id)
+        ec2_resource.VpcPeeringConnection.return_value.delete \
+            .assert_called_once_with()
+
+    def test_restores_topology_without_vpcs(self):
+        topology = self.topology()
+        topology.vpcs = None
+        snapshots = TopologySnapshots(self.store, self.ec2_gateways, Mock())
+
+        snapshots.save(topology)
+
+        self.assertIsNone(snapshots.load(KEY, 60, 1030.0).vpcs)
+
+    def test_ignores_missing_snapshot(self):
+        snapshots = TopologySnapshots(self.store, self.ec2_gateways, Mock())
+
+        self.assertIsNone(snapshots.load(KEY, 60, 1030.0))
+
+    def test_ignores_snapshot_for_different_key(self):
+        snapshots = TopologySnapshots(self.store, self.ec2_gateways, Mock())
+
+        snapshots.save(self.topology())
+
+        self.assertIsNone(snapshots.load(
+            (('111122223333',), ('eu-west-1',), 'peering-role', 'full'),
+            60, 1030.0))
+
+    def test_ignores_expired_snapshot(self):
+        snapshots = TopologySnapshots(self.store, self.ec2_gateways, Mock())
+
+        snapshots.save(self.topology(built_at=1000.0))
+
+        self.assertIsNone(snapshots.load(KEY, 60, 1061.0))
+
+    def test_ignores_snapshot_with_unsupported_version(self):
+        self.store.write(gzip.compress(json.dumps(
+            {'version': SNAPSHOT_FORMAT_VERSION + 1}).encode('utf-8')))
+        snapshots = TopologySnapshots(self.store, self.ec2_gateways, Mock())
+
+        self.assertIsNone(snapshots.load(KEY, 60, 1030.0))
+
+    def test_ignores_corrupt_snapshot(self):
+        logger = Mock()
+        self.store.write(b'not a snapshot')
+        snapshots = TopologySnapshots(self.store, self.ec2_gateways, logger)
+
+        self.assertIsNone(snapshots.load(KEY, 60, 1030.0))
+        logger.warn.assert_called_once()
+
+    def test_logs_and_continues_when_store_cannot_be_written(self):
+        logger = Mock()
+        store = Mock(name="Snapshot store")
+        store.write = Mock(side_effect=OSError('read-only file system'))
+        snapshots = TopologySnapshots(store, self.ec2_gateways, logger)
+
+        snapshots.save(self.topology())
+
+        logger.warn.assert_called_once()
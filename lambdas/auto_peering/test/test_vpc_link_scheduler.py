@@ -0,0 +1,228 @@
+import threading
+import unittest
+from unittest.mock import Mock
+
+from botocore.exceptions import ClientError
+
+from auto_peering.vpc import VPC
+from auto_peering.vpc_link_scheduler import VPCLinkScheduler
+from auto_peering.vpc_peering_route import VPCPeeringRoute
+from test import randoms, mocks
+
+
+def vpc_in(region):
+    return VPC(mocks.build_vpc_response_mock(), randoms.account_id(), region)
+
+
+def route_between(vpc1, vpc2, perform=None):
+    route = Mock(name="Route from %s to %s" % (vpc1.id, vpc2.id))
+    route.vpc1 = vpc1
+    route.vpc2 = vpc2
+    route.perform = Mock(side_effect=perform, return_value=None)
+    return route
+
+
+def link_between(vpc1, vpc2, routes, perform=None, connection=None):
+    link = Mock(name="Link between %s and %s" % (vpc1.id, vpc2.id))
+    link.between = [vpc1, vpc2]
+    link.peering_relationship.perform = Mock(side_effect=perform)
+    link.peering_relationship.fetch = Mock(
+        return_value=connection or Mock(name="VPC peering connection"))
+    link.peering_routes = routes
+    return link
+
+
+class TestVPCLinkScheduler(unittest.TestCase):
+    def test_provisions_relationship_before_its_routes(self):
+        vpc1 = vpc_in('eu-west-1')
+        vpc2 = vpc_in('eu-west-2')
+        order = []
+
+        routes = [
+            route_between(vpc1, vpc2, lambda action: order.append('route 1')),
+            route_between(vpc2, vpc1, lambda action: order.append('route 2'))]
+        link = link_between(
+            vpc1, vpc2, routes,
+            perform=lambda action: order.append('relationship'))
+
+        VPCLinkScheduler(Mock()).run([link], 'provision')
+
+        self.assertEqual(order[0], 'relationship')
+        self.assertEqual(sorted(order[1:]), ['route 1', 'route 2'])
+        link.peering_relationship.perform.assert_called_once_with('provision')
+        routes[0].perform.assert_called_once_with('provision')
+
+    def test_destroys_routes_before_their_relationship(self):
+        vpc1 = vpc_in('eu-west-1')
+        vpc2 = vpc_in('eu-west-2')
+        order = []
+
+        routes = [
+            route_between(vpc1, vpc2, lambda action: order.append('route 1')),
+            route_between(vpc2, vpc1, lambda action: order.append('route 2'))]
+        link = link_between(
+            vpc1, vpc2, routes,
+            perform=lambda action: order.append('relationship'))
+
+        VPCLinkScheduler(Mock()).run([link], 'destroy')
+
+        self.assertEqual(sorted(order[:2]), ['route 1', 'route 2'])
+        self.assertEqual(order[2], 'relationship')
+
+    def test_skips_routes_when_relationship_has_no_active_connection(self):
+        vpc1 = vpc_in('eu-west-1')
+        vpc2 = vpc_in('eu-west-2')
+
+        route = route_between(vpc1, vpc2)
+        link = link_between(vpc1, vpc2, [route])
+        link.peering_relationship.fetch = Mock(return_value=None)
+
+        summary = VPCLinkScheduler(Mock()).run([link], 'provision')
+
+        route.perform.assert_not_called()
+        self.assertEqual(
+            summary,
+            {'succeeded': 0, 'failed': 1, 'skipped': 1,
+             'failed_vpc_ids': sorted([vpc1.id, vpc2.id])})
+
+    def test_continues_with_other_links_when_a_task_raises(self):
+        vpc1 = vpc_in('eu-west-1')
+        vpc2 = vpc_in('eu-west-2')
+        vpc3 = vpc_in('eu-west-3')
+        logger = Mock()
+        error = Exception('boom')
+
+        def fail(action):
+            raise error
+
+        failing_route = route_between(vpc1, vpc2)
+        failing_link = link_between(vpc1, vpc2, [failing_route], perform=fail)
+        route = route_between(vpc1, vpc3)
+        link = link_between(vpc1, vpc3, [route])
+
+        summary = VPCLinkScheduler(logger).run(
+            [failing_link, link], 'provision')
+
+        failing_route.perform.assert_not_called()
+        route.perform.assert_called_once_with('provision')
+        logger.warn.assert_any_call(
+            "Managing %s failed. Error was: %s",
+            "peering relationship between '%s' and '%s'" % (vpc1.id, vpc2.id),
+            error)
+        self.assertEqual(
+            summary,
+            {'succeeded': 2, 'failed': 1, 'skipped': 1,
+             'failed_vpc_ids': sorted([vpc1.id, vpc2.id])})
+
+    def test_counts_routes_with_failed_mutations_as_failed(self):
+        vpc1 = vpc_in('eu-west-1')
+        vpc2 = vpc_in('eu-west-2')
+
+        route = route_between(vpc1, vpc2)
+        route.perform = Mock(return_value={
+            'created': 1, 'replaced': 0, 'skipped': 0, 'conflicting': 0,
+            'failed': 1})
+        link = link_between(vpc1, vpc2, [route])
+
+        summary = VPCLinkScheduler(Mock()).run([link], 'provision')
+
+        self.assertEqual(
+            summary,
+            {'succeeded': 1, 'failed': 1, 'skipped': 0,
+             'failed_vpc_ids': sorted([vpc1.id, vpc2.id])})
+
+    def test_does_not_perform_relationships_when_told_not_to(self):
+        vpc1 = vpc_in('eu-west-1')
+        vpc2 = vpc_in('eu-west-2')
+
+        route = route_between(vpc1, vpc2)
+        link = link_between(vpc1, vpc2, [route])
+
+        VPCLinkScheduler(Mock()).run(
+            [link], 'provision', perform_relationships=False)
+
+        link.peering_relationship.perform.assert_not_called()
+        route.perform.assert_called_once_with('provision')
+
+    def test_bounds_concurrent_tasks_per_region(self):
+        target_vpc = vpc_in('eu-west-1')
+        lock = threading.Lock()
+        active = [0]
+        peak = [0]
+
+        def hold(action):
+            with lock:
+                active[0] += 1
+                peak[0] = max(peak[0], active[0])
+            threading.Event().wait(0.02)
+            with lock:
+                active[0] -= 1
+
+        links = []
+        for _ in range(6):
+            dependency_vpc = vpc_in('eu-west-1')
+            links.append(link_between(
+                target_vpc, dependency_vpc,
+                [route_between(target_vpc, dependency_vpc, hold)],
+                perform=hold))
+
+        VPCLinkScheduler(Mock(), concurrency=6, region_concurrency=2).run(
+            links, 'provision')
+
+        self.assertEqual(peak[0], 2)
+
+    def test_logs_deterministic_summary(self):
+        vpc1 = vpc_in('eu-west-1')
+        vpc2 = vpc_in('eu-west-2')
+        logger = Mock()
+
+        route = route_between(vpc1, vpc2)
+        link = link_between(vpc1, vpc2, [route])
+
+        VPCLinkScheduler(logger).run([link], 'provision')
+
+        summary_calls = [
+            call for call in logger.info.call_args_list
+            if call[0][0].startswith('Task') or
+            call[0][0].startswith('Completed')]
+        self.assertEqual(
+            [call[0] for call in summary_calls],
+            [("Task '%s' for %s %s.", 'provision',
+              "peering relationship between '%s' and '%s'" %
+              (vpc1.id, vpc2.id),
+              'succeeded'),
+             ("Task '%s' for %s %s.", 'provision',
+              "peering routes from '%s' to '%s'" % (vpc1.id, vpc2.id),
+              'succeeded'),
+             ("Completed %d '%s' tasks. Succeeded: %d, failed: %d, "
+              "skipped: %d.",
+              2, 'provision', 2, 0, 0)])
+
+    def test_skips_relationship_destroy_when_route_deletion_fails(self):
+        vpc1 = vpc_in('eu-west-1')
+        vpc2 = vpc_in('eu-west-2')
+        peering_connection = Mock(name="VPC peering connection")
+        peering_connection.id = randoms.peering_connection_id()
+
+        ec2_gateway = mocks.EC2Gateway(vpc1.account_id, vpc1.region)
+        ec2_gateways = mocks.EC2Gateways([ec2_gateway])
+        route_table = mocks.build_route_table_mock(routes=[{
+            'DestinationCidrBlock': vpc2.cidr_block,
+            'VpcPeeringConnectionId': peering_connection.id,
+            'State': 'active'}])
+        ec2_gateway.resource().route_tables.filter = Mock(
+            return_value=[route_table])
+        ec2_gateway.client().delete_route = Mock(side_effect=ClientError(
+            {'Error': {'Code': 'UnauthorizedOperation'}}, 'DeleteRoute'))
+
+        link = link_between(vpc1, vpc2, [], connection=peering_connection)
+        link.peering_routes = [VPCPeeringRoute(
+            ec2_gateways, Mock(), [vpc1, vpc2], link.peering_relationship)]
+
+        summary = VPCLinkScheduler(Mock()).run([link], 'destroy')
+
+        link.peering_relationship.perform.assert_not_called()
+        self.assertEqual(
+            summary,
+            {'succeeded': 0, 'failed': 1, 'skipped': 1,
+             'failed_vpc_ids': sorted([vpc1.id, vpc2.id])})
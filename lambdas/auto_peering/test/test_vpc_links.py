@@ -470,3 +470,51 @@ class TestVPCLinks(unittest.TestCase):
             "Found dependent VPCs: [%s]",
             "'thing2-silver':'%s', 'thing3-bronze':'%s'" % (
                 dependent_vpc1_id, dependent_vpc2_id))
+
+
+class TestVPCLinksResolveForAll(unittest.TestCase):
+    def test_resolves_each_link_once_across_targets(self):
+        account_id = randoms.account_id()
+        region = randoms.region()
+        vpc_1_id = randoms.vpc_id()
+        vpc_2_id = randoms.vpc_id()
+
+        vpc_1_response = mocks.build_vpc_response_mock(
+            id=vpc_1_id,
+            name='VPC 1',
+            tags=builders.build_vpc_tags(
+                component='thing1',
+                deployment_identifier='gold',
+                dependencies=['thing2-silver']))
+        vpc_2_response = mocks.build_vpc_response_mock(
+            id=vpc_2_id,
+            name='VPC 2',
+            tags=builders.build_vpc_tags(
+                component='thing2',
+                deployment_identifier='silver',
+                dependencies=['thing1-gold']))
+
+        ec2_gateway = mocks.EC2Gateway(account_id, region)
+        ec2_gateways = mocks.EC2Gateways([ec2_gateway])
+        logger = Mock(name="Logger")
+
+        ec2_gateway.resource().vpcs.all = Mock(
+            name='All VPCs',
+            return_value=[vpc_1_response, vpc_2_response])
+
+        VPCLinks(ec2_gateways, logger).resolve_for(account_id, vpc_1_id)
+        single_target_listings = \
+            ec2_gateway.resource().vpcs.all.call_count
+        ec2_gateway.resource().vpcs.all.reset_mock()
+
+        vpc_links = VPCLinks(ec2_gateways, logger)
+        resolved_vpc_links = vpc_links.resolve_for_all(
+            [(account_id, vpc_1_id), (account_id, vpc_2_id)])
+
+        self.assertEqual(len(resolved_vpc_links), 1)
+        vpc_link = next(iter(resolved_vpc_links))
+        self.assertEqual(
+            set(vpc.id for vpc in vpc_link.between), {vpc_1_id, vpc_2_id})
+        self.assertEqual(
+            ec2_gateway.resource().vpcs.all.call_count,
+            single_target_listings)
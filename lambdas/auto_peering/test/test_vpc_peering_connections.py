@@ -0,0 +1,201 @@
+import unittest
+from unittest.mock import Mock, call
+
+from auto_peering.vpc import VPC
+from auto_peering.vpc_peering_connections import VPCPeeringConnections
+from test import randoms, mocks
+
+
+class TestVPCPeeringConnections(unittest.TestCase):
+    def test_loads_connections_once_per_gateway_for_included_vpcs(self):
+        account_id = randoms.account_id()
+        region_1 = "eu-west-1"
+        region_2 = "eu-west-2"
+
+        vpc_1 = VPC(mocks.build_vpc_response_mock(), account_id, region_1)
+        vpc_2 = VPC(mocks.build_vpc_response_mock(), account_id, region_1)
+        vpc_3 = VPC(mocks.build_vpc_response_mock(), account_id, region_2)
+
+        ec2_gateway_1 = mocks.EC2Gateway(account_id, region_1)
+        ec2_gateway_2 = mocks.EC2Gateway(account_id, region_2)
+        ec2_gateways = mocks.EC2Gateways([ec2_gateway_1, ec2_gateway_2])
+
+        connection_1_2 = mocks.build_vpc_peering_connection_mock(
+            vpc_1, vpc_2)
+        connection_1_3 = mocks.build_vpc_peering_connection_mock(
+            vpc_1, vpc_3)
+
+        ec2_gateway_1.resource().vpc_peering_connections.filter = Mock(
+            name="Region 1 VPC peering connections",
+            return_value=iter([connection_1_2]))
+        ec2_gateway_2.resource().vpc_peering_connections.filter = Mock(
+            name="Region 2 VPC peering connections",
+            return_value=iter([connection_1_3]))
+
+        peering_connections = VPCPeeringConnections(
+            ec2_gateways, Mock(name="Logger"))
+        peering_connections.include([vpc_1, vpc_2, vpc_3])
+
+        found_1_2 = peering_connections.find_between(vpc_2, vpc_1)
+        found_1_3 = peering_connections.find_between(vpc_1, vpc_3)
+        found_2_3 = peering_connections.find_between(vpc_2, vpc_3)
+
+        self.assertIs(found_1_2, connection_1_2)
+        self.assertIs(found_1_3, connection_1_3)
+        self.assertIsNone(found_2_3)
+        ec2_gateway_1.resource().vpc_peering_connections.filter.\
+            assert_called_once_with(
+                Filters=[{'Name': 'accepter-vpc-info.vpc-id',
+                          'Values': sorted([vpc_1.id, vpc_2.id])}])
+        ec2_gateway_2.resource().vpc_peering_connections.filter.\
+            assert_called_once_with(
+                Filters=[{'Name': 'accepter-vpc-info.vpc-id',
+                          'Values': [vpc_3.id]}])
+
+    def test_prefers_active_connections_and_ignores_dead_ones(self):
+        account_id = randoms.account_id()
+        region = randoms.region()
+
+        vpc_1 = VPC(mocks.build_vpc_response_mock(), account_id, region)
+        vpc_2 = VPC(mocks.build_vpc_response_mock(), account_id, region)
+
+        ec2_gateway = mocks.EC2Gateway(account_id, region)
+        ec2_gateways = mocks.EC2Gateways([ec2_gateway])
+
+        deleted_connection = mocks.build_vpc_peering_connection_mock(
+            vpc_1, vpc_2, status='deleted')
+        pending_connection = mocks.build_vpc_peering_connection_mock(
+            vpc_1, vpc_2, status='pending-acceptance')
+        active_connection = mocks.build_vpc_peering_connection_mock(
+            vpc_2, vpc_1, status='active')
+
+        ec2_gateway.resource().vpc_peering_connections.filter = Mock(
+            name="VPC peering connections",
+            return_value=iter([
+                deleted_connection, pending_connection, active_connection]))
+
+        peering_connections = VPCPeeringConnections(
+            ec2_gateways, Mock(name="Logger"))
+
+        found = peering_connections.find_between(vpc_1, vpc_2)
+
+        self.assertIs(found, active_connection)
+
+    def test_finds_added_and_forgets_removed_connections(self):
+        account_id = randoms.account_id()
+        region = randoms.region()
+
+        vpc_1 = VPC(mocks.build_vpc_response_mock(), account_id, region)
+        vpc_2 = VPC(mocks.build_vpc_response_mock(), account_id, region)
+
+        ec2_gateway = mocks.EC2Gateway(account_id, region)
+        ec2_gateways = mocks.EC2Gateways([ec2_gateway])
+
+        ec2_gateway.resource().vpc_peering_connections.filter = Mock(
+            name="VPC peering connections",
+            return_value=iter([]))
+
+        peering_connections = VPCPeeringConnections(
+            ec2_gateways, Mock(name="Logger"))
+
+        self.assertIsNone(peering_connections.find_between(vpc_1, vpc_2))
+
+        connection = mocks.build_vpc_peering_connection_mock(
+            vpc_1, vpc_2, status='pending-acceptance')
+        peering_connections.add(connection)
+
+        self.assertIs(
+            peering_connections.find_between(vpc_1, vpc_2), connection)
+
+        peering_connections.remove(connection)
+
+        self.assertIsNone(peering_connections.find_between(vpc_1, vpc_2))
+        self.assertEqual(
+            len(ec2_gateway.resource().vpc_peering_connections.filter.
+                mock_calls),
+            1)
+
+    def test_serves_seeded_connections_without_loading(self):
+        account_id = randoms.account_id()
+        region = "eu-west-1"
+
+        vpc_1 = VPC(mocks.build_vpc_response_mock(), account_id, region)
+        vpc_2 = VPC(mocks.build_vpc_response_mock(), account_id, region)
+        vpc_3 = VPC(mocks.build_vpc_response_mock(), account_id, region)
+
+        ec2_gateway = mocks.EC2Gateway(account_id, region)
+        ec2_gateways = mocks.EC2Gateways([ec2_gateway])
+
+        connection = mocks.build_vpc_peering_connection_mock(vpc_1, vpc_2)
+
+        peering_connections = VPCPeeringConnections(
+            ec2_gateways, Mock(name="Logger"))
+        peering_connections.seed([vpc_1.id, vpc_2.id], [connection])
+
+        self.assertIs(
+            peering_connections.find_between(vpc_1, vpc_2), connection)
+        self.assertEqual(peering_connections.all(), [connection])
+        ec2_gateway.resource().vpc_peering_connections.filter.\
+            assert_not_called()
+
+        peering_connections.include([vpc_3])
+
+        self.assertEqual(
+            peering_connections.loaded_vpc_ids(), set([vpc_1.id, vpc_2.id]))
+
+    def test_chunks_accepter_vpc_id_filters_at_max_filter_values(self):
+        account_id = randoms.account_id()
+        region = randoms.region()
+
+        vpcs = [VPC(mocks.build_vpc_response_mock(), account_id, region)
+                for _ in range(201)]
+        vpc_ids = sorted(vpc.id for vpc in vpcs)
+
+        ec2_gateway = mocks.EC2Gateway(account_id, region)
+        ec2_gateways = mocks.EC2Gateways([ec2_gateway])
+
+        ec2_gateway.resource().vpc_peering_connections.filter = Mock(
+            name="VPC peering connections",
+            return_value=[])
+
+        peering_connections = VPCPeeringConnections(
+            ec2_gateways, Mock(name="Logger"))
+        peering_connections.include(vpcs)
+        peering_connections.load()
+
+        self.assertCountEqual(
+            ec2_gateway.resource().vpc_peering_connections.filter.
+            call_args_list,
+            [call(Filters=[{'Name': 'accepter-vpc-info.vpc-id',
+                            'Values': vpc_ids[:200]}]),
+             call(Filters=[{'Name': 'accepter-vpc-info.vpc-id',
+                            'Values': vpc_ids[200:]}])])
+        self.assertEqual(peering_connections.loaded_vpc_ids(), set(vpc_ids))
+
+    def test_bumps_revision_only_when_connections_change(self):
+        account_id = randoms.account_id()
+        region = randoms.region()
+
+        vpc_1 = VPC(mocks.build_vpc_response_mock(), account_id, region)
+        vpc_2 = VPC(mocks.build_vpc_response_mock(), account_id, region)
+
+        ec2_gateway = mocks.EC2Gateway(account_id, region)
+        ec2_gateways = mocks.EC2Gateways([ec2_gateway])
+
+        ec2_gateway.resource().vpc_peering_connections.filter = Mock(
+            name="VPC peering connections",
+            return_value=[])
+
+        connection = mocks.build_vpc_peering_connection_mock(vpc_1, vpc_2)
+
+        peering_connections = VPCPeeringConnections(
+            ec2_gateways, Mock(name="Logger"))
+        peering_connections.seed([vpc_1.id, vpc_2.id], [connection])
+        revision = peering_connections.revision
+
+        peering_connections.find_between(vpc_1, vpc_2)
+        peering_connections.add(connection)
+        self.assertEqual(peering_connections.revision, revision)
+
+        peering_connections.remove(connection)
+        self.assertEqual(peering_connections.revision, revision + 1)
@@ -421,3 +421,182 @@ class TestVPCPeeringRelationshipDestroy(unittest.TestCase):
         logger.info.assert_any_call(
             "No peering connection to destroy between: '%s' and: '%s'.",
             vpc1.id, vpc2.id)
+
+
+class TestVPCPeeringRelationshipWithPeeringConnections(unittest.TestCase):
+    def test_fetches_from_peering_connections(self):
+        account_id = randoms.account_id()
+        region = randoms.region()
+
+        vpc1 = VPC(mocks.build_vpc_response_mock(), account_id, region)
+        vpc2 = VPC(mocks.build_vpc_response_mock(), account_id, region)
+
+        ec2_gateway = mocks.EC2Gateway(account_id, region)
+        ec2_gateways = mocks.EC2Gateways([ec2_gateway])
+
+        logger = Mock()
+
+        matching_vpc_peering_connection = Mock(
+            name='Matching VPC peering connection')
+        peering_connections = Mock(name='VPC peering connections')
+        peering_connections.find_between = Mock(
+            return_value=matching_vpc_peering_connection)
+
+        vpc_peering_relationship = VPCPeeringRelationship(
+            ec2_gateways, logger, between=[vpc1, vpc2],
+            peering_connections=peering_connections)
+
+        found_peering_connection = vpc_peering_relationship.fetch()
+
+        peering_connections.find_between.assert_called_once_with(vpc1, vpc2)
+        ec2_gateway.resource().vpc_peering_connections.filter.\
+            assert_not_called()
+        self.assertEqual(
+            found_peering_connection, matching_vpc_peering_connection)
+
+    def test_adds_accepted_connection_to_peering_connections(self):
+        account_id = randoms.account_id()
+        region = randoms.region()
+
+        vpc1 = VPC(mocks.build_vpc_response_mock(), account_id, region)
+        vpc2 = VPC(mocks.build_vpc_response_mock(), account_id, region)
+
+        ec2_gateway = mocks.EC2Gateway(account_id, region)
+        ec2_gateways = mocks.EC2Gateways([ec2_gateway])
+
+        logger = Mock()
+
+        accepter_vpc_peering_connection = Mock(
+            name='Accepter VPC peering connection')
+        ec2_gateway.resource().vpc_peering_connections.filter = Mock(
+            return_value=iter([accepter_vpc_peering_connection]))
+        vpc1.request_vpc_peering_connection = Mock()
+
+        peering_connections = Mock(name='VPC peering connections')
+
+        vpc_peering_relationship = VPCPeeringRelationship(
+            ec2_gateways, logger, between=[vpc1, vpc2],
+            peering_connections=peering_connections)
+        vpc_peering_relationship.provision()
+
+        peering_connections.add.assert_called_once_with(
+            accepter_vpc_peering_connection)
+
+    def test_removes_destroyed_connection_from_peering_connections(self):
+        account_id = randoms.account_id()
+        region = randoms.region()
+
+        vpc1 = VPC(mocks.build_vpc_response_mock(), account_id, region)
+        vpc2 = VPC(mocks.build_vpc_response_mock(), account_id, region)
+
+        ec2_gateways = mocks.EC2Gateways(
+            [mocks.EC2Gateway(account_id, region)])
+
+        logger = Mock()
+
+        matching_vpc_peering_connection = Mock(
+            name='Matching VPC peering connection')
+        peering_connections = Mock(name='VPC peering connections')
+        peering_connections.find_between = Mock(
+            return_value=matching_vpc_peering_connection)
+
+        vpc_peering_relationship = VPCPeeringRelationship(
+            ec2_gateways, logger, between=[vpc1, vpc2],
+            peering_connections=peering_connections)
+        vpc_peering_relationship.destroy()
+
+        matching_vpc_peering_connection.delete.assert_called()
+        peering_connections.remove.assert_called_once_with(
+            matching_vpc_peering_connection)
+
+
+class TestVPCPeeringRelationshipCaching(unittest.TestCase):
+    def test_reuses_fetched_peering_connection(self):
+        account_id = randoms.account_id()
+        region = randoms.region()
+
+        vpc1 = VPC(mocks.build_vpc_response_mock(), account_id, region)
+        vpc2 = VPC(mocks.build_vpc_response_mock(), account_id, region)
+
+        ec2_gateway = mocks.EC2Gateway(account_id, region)
+        ec2_gateways = mocks.EC2Gateways([ec2_gateway])
+
+        logger = Mock()
+
+        matching_vpc_peering_connection = Mock(
+            name='Matching VPC peering connection')
+        ec2_gateway.resource().vpc_peering_connections.filter = Mock(
+            side_effect=lambda **kwargs: iter(
+                [matching_vpc_peering_connection]))
+
+        vpc_peering_relationship = VPCPeeringRelationship(
+            ec2_gateways, logger, between=[vpc1, vpc2])
+
+        first_peering_connection = vpc_peering_relationship.fetch()
+        second_peering_connection = vpc_peering_relationship.fetch()
+
+        self.assertIs(first_peering_connection, second_peering_connection)
+        self.assertEqual(
+            len(ec2_gateway.resource().vpc_peering_connections.filter.
+                mock_calls),
+            1)
+
+    def test_caches_peering_connection_accepted_on_provision(self):
+        account_id = randoms.account_id()
+        region = randoms.region()
+
+        vpc1 = VPC(mocks.build_vpc_response_mock(), account_id, region)
+        vpc2 = VPC(mocks.build_vpc_response_mock(), account_id, region)
+
+        ec2_gateway = mocks.EC2Gateway(account_id, region)
+        ec2_gateways = mocks.EC2Gateways([ec2_gateway])
+
+        logger = Mock()
+
+        accepter_vpc_peering_connection = Mock(
+            name='Accepter VPC peering connection')
+        ec2_gateway.resource().vpc_peering_connections.filter = Mock(
+            return_value=iter([accepter_vpc_peering_connection]))
+        vpc1.request_vpc_peering_connection = Mock()
+
+        vpc_peering_relationship = VPCPeeringRelationship(
+            ec2_gateways, logger, between=[vpc1, vpc2])
+        vpc_peering_relationship.provision()
+
+        found_peering_connection = vpc_peering_relationship.fetch()
+
+        self.assertIs(
+            found_peering_connection, accepter_vpc_peering_connection)
+        self.assertEqual(
+            len(ec2_gateway.resource().vpc_peering_connections.filter.
+                mock_calls),
+            1)
+
+    def test_fetches_again_after_destroy(self):
+        account_id = randoms.account_id()
+        region = randoms.region()
+
+        vpc1 = VPC(mocks.build_vpc_response_mock(), account_id, region)
+        vpc2 = VPC(mocks.build_vpc_response_mock(), account_id, region)
+
+        ec2_gateway = mocks.EC2Gateway(account_id, region)
+        ec2_gateways = mocks.EC2Gateways([ec2_gateway])
+
+        logger = Mock()
+
+        matching_vpc_peering_connection = Mock(
+            name='Matching VPC peering connection')
+        ec2_gateway.resource().vpc_peering_connections.filter = Mock(
+            side_effect=[
+                iter([matching_vpc_peering_connection]),
+                iter([]),
+                iter([])])
+
+        vpc_peering_relationship = VPCPeeringRelationship(
+            ec2_gateways, logger, between=[vpc1, vpc2])
+        vpc_peering_relationship.destroy()
+
+        found_peering_connection = vpc_peering_relationship.fetch()
+
+        matching_vpc_peering_connection.delete.assert_called()
+        self.assertIsNone(found_peering_connection)
@@ -0,0 +1,229 @@
+import unittest
+from unittest.mock import Mock, call
+from botocore.exceptions import ClientError
+
+from auto_peering.vpc import VPC
+from auto_peering.vpc_peering_relationship import VPCPeeringRelationship
+from auto_peering.vpc_peering_relationships import VPCPeeringRelationships
+from test import randoms, mocks
+
+
+def describe_response_for(statuses):
+    return {
+        'VpcPeeringConnections': [
+            {'VpcPeeringConnectionId': vpc_peering_connection_id,
+             'Status': {'Code': status}}
+            for vpc_peering_connection_id, status in statuses.items()
+        ]
+    }
+
+
+def requested_connection_for(vpc):
+    requester_vpc_peering_connection = Mock(
+        name="Requested connection from %s" % vpc.id)
+    requester_vpc_peering_connection.id = randoms.peering_connection_id()
+    vpc.request_vpc_peering_connection = Mock(
+        return_value=requester_vpc_peering_connection)
+    return requester_vpc_peering_connection
+
+
+def acceptor_connection_for(requester_vpc_peering_connection):
+    acceptor_vpc_peering_connection = Mock(
+        name="Acceptor connection for %s" %
+             requester_vpc_peering_connection.id)
+    acceptor_vpc_peering_connection.id = requester_vpc_peering_connection.id
+    return acceptor_vpc_peering_connection
+
+
+class TestVPCPeeringRelationshipsProvision(unittest.TestCase):
+    def test_requests_all_waits_once_per_accepter_region_and_accepts_all(self):
+        account_id = randoms.account_id()
+        region_1 = 'eu-west-1'
+        region_2 = 'eu-west-2'
+
+        target_vpc = VPC(mocks.build_vpc_response_mock(), account_id, region_1)
+        vpc_1 = VPC(mocks.build_vpc_response_mock(), account_id, region_2)
+        vpc_2 = VPC(mocks.build_vpc_response_mock(), account_id, region_2)
+
+        ec2_gateway_1 = mocks.EC2Gateway(account_id, region_1)
+        ec2_gateway_2 = mocks.EC2Gateway(account_id, region_2)
+        ec2_gateways = mocks.EC2Gateways([ec2_gateway_1, ec2_gateway_2])
+        logger = Mock()
+
+        requester_connection_1 = requested_connection_for(target_vpc)
+        requester_connection_2 = requested_connection_for(vpc_1)
+        acceptor_connection_1 = acceptor_connection_for(requester_connection_1)
+        acceptor_connection_2 = acceptor_connection_for(requester_connection_2)
+
+        ec2_gateway_2.client().describe_vpc_peering_connections = Mock(
+            return_value=describe_response_for({
+                requester_connection_1.id: 'pending-acceptance',
+                requester_connection_2.id: 'pending-acceptance'}))
+        ec2_gateway_2.resource().vpc_peering_connections.filter = Mock(
+            return_value=iter([acceptor_connection_1, acceptor_connection_2]))
+
+        relationship_1 = VPCPeeringRelationship(
+            ec2_gateways, logger, between=[target_vpc, vpc_2])
+        relationship_2 = VPCPeeringRelationship(
+            ec2_gateways, logger, between=[vpc_1, vpc_2])
+
+        relationships = VPCPeeringRelationships(
+            ec2_gateways, logger, sleep=Mock())
+        relationships.provision([relationship_1, relationship_2])
+
+        target_vpc.request_vpc_peering_connection.assert_called_once_with(
+            PeerOwnerId=account_id, PeerVpcId=vpc_2.id, PeerRegion=region_2)
+        vpc_1.request_vpc_peering_connection.assert_called_once_with(
+            PeerOwnerId=account_id, PeerVpcId=vpc_2.id, PeerRegion=region_2)
+        ec2_gateway_2.client().describe_vpc_peering_connections.\
+            assert_called_once_with(
+                Filters=[{'Name': 'vpc-peering-connection-id',
+                          'Values': sorted([requester_connection_1.id,
+                                            requester_connection_2.id])}])
+        ec2_gateway_2.resource().vpc_peering_connections.filter.\
+            assert_called_once_with(
+                VpcPeeringConnectionIds=sorted([requester_connection_1.id,
+                                                requester_connection_2.id]))
+        acceptor_connection_1.accept.assert_called_once_with()
+        acceptor_connection_2.accept.assert_called_once_with()
+        self.assertIs(relationship_1.fetch(), acceptor_connection_1)
+        self.assertIs(relationship_2.fetch(), acceptor_connection_2)
+
+    def test_polls_until_connections_are_ready_for_acceptance(self):
+        account_id = randoms.account_id()
+        region = randoms.region()
+
+        vpc_1 = VPC(mocks.build_vpc_response_mock(), account_id, region)
+        vpc_2 = VPC(mocks.build_vpc_response_mock(), account_id, region)
+
+        ec2_gateway = mocks.EC2Gateway(account_id, region)
+        ec2_gateways = mocks.EC2Gateways([ec2_gateway])
+        logger = Mock()
+
+        requester_connection = requested_connection_for(vpc_1)
+        acceptor_connection = acceptor_connection_for(requester_connection)
+
+        ec2_gateway.client().describe_vpc_peering_connections = Mock(
+            side_effect=[
+                describe_response_for({}),
+                describe_response_for(
+                    {requester_connection.id: 'initiating-request'}),
+                describe_response_for(
+                    {requester_connection.id: 'pending-acceptance'})])
+        ec2_gateway.resource().vpc_peering_connections.filter = Mock(
+            return_value=iter([acceptor_connection]))
+
+        sleep = Mock()
+        relationship = VPCPeeringRelationship(
+            ec2_gateways, logger, between=[vpc_1, vpc_2])
+
+        relationships = VPCPeeringRelationships(
+            ec2_gateways, logger, wait_delay=3, sleep=sleep)
+        relationships.provision([relationship])
+
+        self.assertEqual(sleep.call_args_list, [call(3), call(3)])
+        acceptor_connection.accept.assert_called_once_with()
+
+    def test_deletes_connections_that_never_become_ready(self):
+        account_id = randoms.account_id()
+        region = randoms.region()
+
+        vpc_1 = VPC(mocks.build_vpc_response_mock(), account_id, region)
+        vpc_2 = VPC(mocks.build_vpc_response_mock(), account_id, region)
+
+        ec2_gateway = mocks.EC2Gateway(account_id, region)
+        ec2_gateways = mocks.EC2Gateways([ec2_gateway])
+        logger = Mock()
+
+        requester_connection = requested_connection_for(vpc_1)
+
+        ec2_gateway.client().describe_vpc_peering_connections = Mock(
+            return_value=describe_response_for(
+                {requester_connection.id: 'initiating-request'}))
+
+        relationship = VPCPeeringRelationship(
+            ec2_gateways, logger, between=[vpc_1, vpc_2])
+
+        relationships = VPCPeeringRelationships(
+            ec2_gateways, logger, wait_max_attempts=4, sleep=Mock())
+        relationships.provision([relationship])
+
+        self.assertEqual(
+            ec2_gateway.client().describe_vpc_peering_connections.call_count,
+            4)
+        ec2_gateway.resource().vpc_peering_connections.filter.\
+            assert_not_called()
+        requester_connection.delete.assert_called_once_with()
+        logger.warn.assert_any_call(
+            "Could not accept peering connection between: '%s' and: '%s'. "
+            "Error was: %s",
+            vpc_1.id, vpc_2.id,
+            "Peering connection: '%s' did not become ready for acceptance." %
+            requester_connection.id)
+
+    def test_stops_waiting_for_connections_that_fail(self):
+        account_id = randoms.account_id()
+        region = randoms.region()
+
+        vpc_1 = VPC(mocks.build_vpc_response_mock(), account_id, region)
+        vpc_2 = VPC(mocks.build_vpc_response_mock(), account_id, region)
+
+        ec2_gateway = mocks.EC2Gateway(account_id, region)
+        ec2_gateways = mocks.EC2Gateways([ec2_gateway])
+        logger = Mock()
+
+        requester_connection = requested_connection_for(vpc_1)
+
+        ec2_gateway.client().describe_vpc_peering_connections = Mock(
+            return_value=describe_response_for(
+                {requester_connection.id: 'failed'}))
+
+        relationship = VPCPeeringRelationship(
+            ec2_gateways, logger, between=[vpc_1, vpc_2])
+
+        relationships = VPCPeeringRelationships(
+            ec2_gateways, logger, sleep=Mock())
+        relationships.provision([relationship])
+
+        self.assertEqual(
+            ec2_gateway.client().describe_vpc_peering_connections.call_count,
+            1)
+        requester_connection.delete.assert_called_once_with()
+
+    def test_continues_with_other_relationships_when_request_fails(self):
+        account_id = randoms.account_id()
+        region = randoms.region()
+
+        vpc_1 = VPC(mocks.build_vpc_response_mock(), account_id, region)
+        vpc_2 = VPC(mocks.build_vpc_response_mock(), account_id, region)
+        vpc_3 = VPC(mocks.build_vpc_response_mock(), account_id, region)
+
+        ec2_gateway = mocks.EC2Gateway(account_id, region)
+        ec2_gateways = mocks.EC2Gateways([ec2_gateway])
+        logger = Mock()
+
+        request_error = ClientError({'Error': {'Code': '123'}}, 'something')
+        vpc_1.request_vpc_peering_connection = Mock(side_effect=request_error)
+        requester_connection = requested_connection_for(vpc_3)
+        acceptor_connection = acceptor_connection_for(requester_connection)
+
+        ec2_gateway.client().describe_vpc_peering_connections = Mock(
+            return_value=describe_response_for(
+                {requester_connection.id: 'pending-acceptance'}))
+        ec2_gateway.resource().vpc_peering_connections.filter = Mock(
+            return_value=iter([acceptor_connection]))
+
+        failing_relationship = VPCPeeringRelationship(
+            ec2_gateways, logger, between=[vpc_1, vpc_2])
+        relationship = VPCPeeringRelationship(
+            ec2_gateways, logger, between=[vpc_3, vpc_2])
+
+        relationships = VPCPeeringRelationships(
+            ec2_gateways, logger, sleep=Mock())
+        relationships.provision([failing_relationship, relationship])
+
+        logger.warn.assert_any_call(
+            "Could not request peering connection between: '%s' and: '%s'. "
+            "Error was: %s",
+            vpc_1.id, vpc_2.id, request_error)
+        acceptor_connection.accept.assert_called_once_with()
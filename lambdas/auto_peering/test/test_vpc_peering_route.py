@@ -1,22 +1,20 @@
+import threading
 import unittest
 from unittest.mock import Mock
 from botocore.exceptions import ClientError
 
+from auto_peering.concurrency import ConcurrencyLimits
 from auto_peering.vpc import VPC
 from auto_peering.vpc_peering_route import VPCPeeringRoute
 from test import randoms, mocks
 
-def mock_route_for(*definitions):
-    def route_constructor(route_table_id, destination_cidr):
-        for definition in definitions:
-            if definition['arguments'] == [route_table_id, destination_cidr]:
-                return definition['return']
 
-        raise Exception(
-            "No matching route for arguments: {}, {}".format(
-                route_table_id, destination_cidr))
-
-    return route_constructor
+def route_via(destination_cidr_block, peering_connection_id):
+    return {
+        'DestinationCidrBlock': destination_cidr_block,
+        'VpcPeeringConnectionId': peering_connection_id,
+        'State': 'active'
+    }
 
 
 class TestVPCPeeringRoutesProvision(unittest.TestCase):
@@ -34,8 +32,8 @@ class TestVPCPeeringRoutesProvision(unittest.TestCase):
 
         logger = Mock()
 
-        vpc1_route_table_1 = Mock(name="VPC 1 route table 1")
-        vpc1_route_table_2 = Mock(name="VPC 1 route table 2")
+        vpc1_route_table_1 = mocks.build_route_table_mock(name="VPC 1 route table 1")
+        vpc1_route_table_2 = mocks.build_route_table_mock(name="VPC 1 route table 2")
 
         ec2_gateway_1.resource().route_tables = Mock(
             name="VPC route tables")
@@ -55,11 +53,13 @@ class TestVPCPeeringRoutesProvision(unittest.TestCase):
             peering_relationship=vpc_peering_relationship)
 
         vpc_peering_route.provision()
-        vpc1_route_table_1.create_route.assert_called_with(
+        ec2_gateway_1.client().create_route.assert_any_call(
+            RouteTableId=vpc1_route_table_1.id,
             DestinationCidrBlock=vpc2.cidr_block,
             VpcPeeringConnectionId=vpc_peering_connection.id)
 
-        vpc1_route_table_2.create_route.assert_called_with(
+        ec2_gateway_1.client().create_route.assert_any_call(
+            RouteTableId=vpc1_route_table_2.id,
             DestinationCidrBlock=vpc2.cidr_block,
             VpcPeeringConnectionId=vpc_peering_connection.id)
 
@@ -113,7 +113,7 @@ class TestVPCPeeringRoutesProvision(unittest.TestCase):
         ec2_gateways = mocks.EC2Gateways([ec2_gateway_1, ec2_gateway_2])
         logger = Mock()
 
-        vpc1_route_table_1 = Mock(name="VPC 1 route table 1")
+        vpc1_route_table_1 = mocks.build_route_table_mock(name="VPC 1 route table 1")
 
         ec2_gateway_1.resource().route_tables = Mock(
             name="VPC route tables")
@@ -152,7 +152,7 @@ class TestVPCPeeringRoutesProvision(unittest.TestCase):
 
         logger = Mock()
 
-        vpc1_route_table_1 = Mock(name="VPC 1 route table 1")
+        vpc1_route_table_1 = mocks.build_route_table_mock(name="VPC 1 route table 1")
 
         ec2_gateway_1.resource().route_tables = Mock(
             name="VPC route tables")
@@ -191,7 +191,7 @@ class TestVPCPeeringRoutesProvision(unittest.TestCase):
 
         logger = Mock()
 
-        vpc1_route_table_1 = Mock(name="VPC 1 route table 1")
+        vpc1_route_table_1 = mocks.build_route_table_mock(name="VPC 1 route table 1")
 
         ec2_gateway_1.resource().route_tables = Mock(
             name="VPC route tables")
@@ -206,7 +206,7 @@ class TestVPCPeeringRoutesProvision(unittest.TestCase):
 
         create_route_error = \
             ClientError({'Error': {'Code': '123'}}, 'something')
-        vpc1_route_table_1.create_route = Mock(
+        ec2_gateway_1.client().create_route = Mock(
             side_effect=create_route_error)
 
         vpc_peering_routes = VPCPeeringRoute(
@@ -238,18 +238,12 @@ class TestVPCPeeringRoutesDestroy(unittest.TestCase):
 
         logger = Mock()
 
-        vpc1_route_table_1 = Mock(name="VPC 1 route table 1")
-        vpc1_route_table_2 = Mock(name="VPC 1 route table 2")
-
-        vpc1_route_table_1.id = randoms.route_table_id()
-        vpc1_route_table_2.id = randoms.route_table_id()
-
-        vpc1_route_table_1_route = Mock(name="VPC 1 route table 1 route")
-        vpc1_route_table_2_route = Mock(name="VPC 1 route table 2 route")
-        vpc1_route_table_1_route.vpc_peering_connection_id = \
-            peering_connection_id
-        vpc1_route_table_2_route.vpc_peering_connection_id = \
-            peering_connection_id
+        vpc1_route_table_1 = mocks.build_route_table_mock(
+            name="VPC 1 route table 1",
+            routes=[route_via(vpc2.cidr_block, peering_connection_id)])
+        vpc1_route_table_2 = mocks.build_route_table_mock(
+            name="VPC 1 route table 2",
+            routes=[route_via(vpc2.cidr_block, peering_connection_id)])
 
         ec2_gateway_1.resource().route_tables = Mock(
             name="VPC route tables")
@@ -257,14 +251,6 @@ class TestVPCPeeringRoutesDestroy(unittest.TestCase):
             name="Filtered VPC route tables",
             return_value=[vpc1_route_table_1, vpc1_route_table_2])
 
-        ec2_gateway_1.resource().Route = Mock(
-            name="Route constructor",
-            side_effect=mock_route_for(
-                {'arguments': [vpc1_route_table_1.id, vpc2.cidr_block],
-                 'return': vpc1_route_table_1_route},
-                {'arguments': [vpc1_route_table_2.id, vpc2.cidr_block],
-                 'return': vpc1_route_table_2_route}))
-
         vpc_peering_connection = Mock(name="VPC peering connection")
         vpc_peering_connection.id = peering_connection_id
         vpc_peering_relationship = Mock()
@@ -279,8 +265,18 @@ class TestVPCPeeringRoutesDestroy(unittest.TestCase):
 
         vpc_peering_routes.destroy()
 
-        vpc1_route_table_1_route.delete.assert_called()
-        vpc1_route_table_2_route.delete.assert_called()
+        ec2_gateway_1.resource().route_tables.filter.assert_called_once_with(
+            Filters=[
+                {'Name': 'vpc-id', 'Values': [vpc1.id]},
+                {'Name': 'tag:Tier', 'Values': ['private']},
+                {'Name': 'route.vpc-peering-connection-id',
+                 'Values': [peering_connection_id]}])
+        ec2_gateway_1.client().delete_route.assert_any_call(
+            RouteTableId=vpc1_route_table_1.id,
+            DestinationCidrBlock=vpc2.cidr_block)
+        ec2_gateway_1.client().delete_route.assert_any_call(
+            RouteTableId=vpc1_route_table_2.id,
+            DestinationCidrBlock=vpc2.cidr_block)
 
     def test_retains_routes_in_vpc1_for_vpc2_if_not_for_peering_connection(self):
         region_1 = randoms.region()
@@ -298,32 +294,17 @@ class TestVPCPeeringRoutesDestroy(unittest.TestCase):
 
         logger = Mock()
 
-        vpc1_route_table_1 = Mock(name="VPC 1 route table 1")
-        vpc1_route_table_2 = Mock(name="VPC 1 route table 2")
-
-        vpc1_route_table_1.id = randoms.route_table_id()
-        vpc1_route_table_2.id = randoms.route_table_id()
-
-        vpc1_route_table_1_route = Mock(name="VPC 1 route table 1 route")
-        vpc1_route_table_2_route = Mock(name="VPC 1 route table 2 route")
-        vpc1_route_table_1_route.vpc_peering_connection_id = \
-            other_peering_connection_id
-        vpc1_route_table_2_route.vpc_peering_connection_id = \
-            other_peering_connection_id
+        vpc1_route_table_1 = mocks.build_route_table_mock(
+            name="VPC 1 route table 1",
+            routes=[
+                route_via(vpc2.cidr_block, other_peering_connection_id),
+                route_via('10.9.0.0/16', target_peering_connection_id)])
 
         ec2_gateway_1.resource().route_tables = Mock(
             name="VPC route tables")
         ec2_gateway_1.resource().route_tables.filter = Mock(
             name="Filtered VPC route tables",
-            return_value=[vpc1_route_table_1, vpc1_route_table_2])
-
-        ec2_gateway_1.resource().Route = Mock(
-            name="Route constructor",
-            side_effect=mock_route_for(
-                {'arguments': [vpc1_route_table_1.id, vpc2.cidr_block],
-                 'return': vpc1_route_table_1_route},
-                {'arguments': [vpc1_route_table_2.id, vpc2.cidr_block],
-                 'return': vpc1_route_table_2_route}))
+            return_value=[vpc1_route_table_1])
 
         vpc_peering_connection = Mock(name="VPC peering connection")
         vpc_peering_connection.id = target_peering_connection_id
@@ -339,8 +320,7 @@ class TestVPCPeeringRoutesDestroy(unittest.TestCase):
 
         vpc_peering_routes.destroy()
 
-        vpc1_route_table_1_route.delete.assert_not_called()
-        vpc1_route_table_2_route.delete.assert_not_called()
+        ec2_gateway_1.client().delete_route.assert_not_called()
 
     def test_handles_no_matching_route_tables(self):
         region_1 = randoms.region()
@@ -395,10 +375,9 @@ class TestVPCPeeringRoutesDestroy(unittest.TestCase):
         ec2_gateways = mocks.EC2Gateways([ec2_gateway_1, ec2_gateway_2])
         logger = Mock()
 
-        vpc1_route_table_1 = Mock(name="VPC 1 route table 1")
-        vpc1_route_table_1_route = Mock(name="VPC 1 route table 1 route")
-        vpc1_route_table_1_route.vpc_peering_connection_id = \
-            peering_connection_id
+        vpc1_route_table_1 = mocks.build_route_table_mock(
+            name="VPC 1 route table 1",
+            routes=[route_via(vpc2.cidr_block, peering_connection_id)])
 
         ec2_gateway_1.resource().route_tables = Mock(
             name="VPC route tables")
@@ -406,12 +385,6 @@ class TestVPCPeeringRoutesDestroy(unittest.TestCase):
             name="Filtered VPC route tables",
             return_value=[vpc1_route_table_1])
 
-        ec2_gateway_1.resource().Route = Mock(
-            name="Route constructor",
-            side_effect=mock_route_for(
-                {'arguments': [vpc1_route_table_1.id, vpc2.cidr_block],
-                 'return': vpc1_route_table_1_route}))
-
         vpc_peering_connection = Mock(name="VPC peering connection")
         vpc_peering_connection.id = peering_connection_id
         vpc_peering_relationship = Mock()
@@ -445,10 +418,9 @@ class TestVPCPeeringRoutesDestroy(unittest.TestCase):
         ec2_gateways = mocks.EC2Gateways([ec2_gateway_1, ec2_gateway_2])
         logger = Mock()
 
-        vpc1_route_table_1 = Mock(name="VPC 1 route table 1")
-        vpc1_route_table_1_route = Mock(name="VPC 1 route table 1 route")
-        vpc1_route_table_1_route.vpc_peering_connection_id = \
-            peering_connection_id
+        vpc1_route_table_1 = mocks.build_route_table_mock(
+            name="VPC 1 route table 1",
+            routes=[route_via(vpc2.cidr_block, peering_connection_id)])
 
         ec2_gateway_1.resource().route_tables = Mock(
             name="VPC route tables")
@@ -456,12 +428,6 @@ class TestVPCPeeringRoutesDestroy(unittest.TestCase):
             name="Filtered VPC route tables",
             return_value=[vpc1_route_table_1])
 
-        ec2_gateway_1.resource().Route = Mock(
-            name="Route constructor",
-            side_effect=mock_route_for(
-                {'arguments': [vpc1_route_table_1.id, vpc2.cidr_block],
-                 'return': vpc1_route_table_1_route}))
-
         vpc_peering_connection = Mock(name="VPC peering connection")
         vpc_peering_connection.id = peering_connection_id
         vpc_peering_relationship = Mock()
@@ -495,10 +461,9 @@ class TestVPCPeeringRoutesDestroy(unittest.TestCase):
         ec2_gateways = mocks.EC2Gateways([ec2_gateway_1, ec2_gateway_2])
         logger = Mock()
 
-        vpc1_route_table_1 = Mock(name="VPC 1 route table 1")
-        vpc1_route_table_1_route = Mock(name="VPC 1 route table 1 route")
-        vpc1_route_table_1_route.vpc_peering_connection_id = \
-            other_peering_connection_id
+        vpc1_route_table_1 = mocks.build_route_table_mock(
+            name="VPC 1 route table 1",
+            routes=[route_via(vpc2.cidr_block, other_peering_connection_id)])
 
         ec2_gateway_1.resource().route_tables = Mock(
             name="VPC route tables")
@@ -506,12 +471,6 @@ class TestVPCPeeringRoutesDestroy(unittest.TestCase):
             name="Filtered VPC route tables",
             return_value=[vpc1_route_table_1])
 
-        ec2_gateway_1.resource().Route = Mock(
-            name="Route constructor",
-            side_effect=mock_route_for(
-                {'arguments': [vpc1_route_table_1.id, vpc2.cidr_block],
-                 'return': vpc1_route_table_1_route}))
-
         vpc_peering_connection = Mock(name="VPC peering connection")
         vpc_peering_connection.id = target_peering_connection_id
         vpc_peering_relationship = Mock()
@@ -527,7 +486,7 @@ class TestVPCPeeringRoutesDestroy(unittest.TestCase):
         vpc_peering_routes.destroy()
 
         logger.info.assert_any_call(
-            "Route deletion skipped for '%s' as route does not pertain to " 
+            "Route deletion skipped for '%s' as route does not pertain to "
             "VPC peering connection '%s'. Continuing.",
             vpc1_route_table_1.id, target_peering_connection_id)
 
@@ -546,22 +505,18 @@ class TestVPCPeeringRoutesDestroy(unittest.TestCase):
 
         logger = Mock()
 
-        vpc1_route_table_1 = Mock(name="VPC 1 route table 1")
-        vpc1_route_table_1_route = Mock(name="VPC 1 route table 1 route")
-        vpc1_route_table_1_route.vpc_peering_connection_id = \
-            peering_connection_id
+        vpc1_route_table_1 = mocks.build_route_table_mock(
+            name="VPC 1 route table 1",
+            routes=[route_via(vpc2.cidr_block, peering_connection_id)])
+        vpc1_route_table_2 = mocks.build_route_table_mock(
+            name="VPC 1 route table 2",
+            routes=[route_via(vpc2.cidr_block, peering_connection_id)])
 
         ec2_gateway_1.resource().route_tables = Mock(
             name="VPC route tables")
         ec2_gateway_1.resource().route_tables.filter = Mock(
             name="Filtered VPC route tables",
-            return_value=[vpc1_route_table_1])
-
-        ec2_gateway_1.resource().Route = Mock(
-            name="Route constructor",
-            side_effect=mock_route_for(
-                {'arguments': [vpc1_route_table_1.id, vpc2.cidr_block],
-                 'return': vpc1_route_table_1_route}))
+            return_value=[vpc1_route_table_1, vpc1_route_table_2])
 
         vpc_peering_connection = Mock(name="VPC peering connection")
         vpc_peering_connection.id = peering_connection_id
@@ -570,8 +525,12 @@ class TestVPCPeeringRoutesDestroy(unittest.TestCase):
             return_value=vpc_peering_connection)
 
         delete_error = ClientError({'Error': {'Code': '123'}}, 'something')
-        vpc1_route_table_1_route.delete = Mock(
-            side_effect=delete_error)
+
+        def delete_route(**kwargs):
+            if kwargs['RouteTableId'] == vpc1_route_table_1.id:
+                raise delete_error
+
+        ec2_gateway_1.client().delete_route = Mock(side_effect=delete_route)
 
         vpc_peering_routes = VPCPeeringRoute(
             ec2_gateways,
@@ -579,8 +538,220 @@ class TestVPCPeeringRoutesDestroy(unittest.TestCase):
             between=[vpc1, vpc2],
             peering_relationship=vpc_peering_relationship)
 
-        vpc_peering_routes.destroy()
+        counts = vpc_peering_routes.destroy()
 
         logger.warn.assert_any_call(
             "Route deletion failed for '%s'. Error was: %s",
             vpc1_route_table_1.id, delete_error)
+        logger.info.assert_any_call(
+            "Route deletion succeeded for '%s'. Continuing.",
+            vpc1_route_table_2.id)
+        self.assertEqual(counts, {'deleted': 1, 'skipped': 0, 'failed': 1})
+
+
+class TestVPCPeeringRoutesWithRouteTables(unittest.TestCase):
+    def test_uses_route_tables_from_shared_route_tables(self):
+        account_id = randoms.account_id()
+        region = randoms.region()
+
+        vpc1 = VPC(mocks.build_vpc_response_mock(), account_id, region)
+        vpc2 = VPC(mocks.build_vpc_response_mock(), account_id, region)
+
+        ec2_gateway = mocks.EC2Gateway(account_id, region)
+        ec2_gateways = mocks.EC2Gateways([ec2_gateway])
+
+        logger = Mock()
+
+        vpc1_route_table = mocks.build_route_table_mock(name="VPC 1 route table")
+        route_tables = Mock(name="Private route tables")
+        route_tables.find_for = Mock(return_value=[vpc1_route_table])
+
+        vpc_peering_connection = Mock(name="VPC peering connection")
+        vpc_peering_relationship = Mock()
+        vpc_peering_relationship.fetch = Mock(
+            return_value=vpc_peering_connection)
+
+        vpc_peering_route = VPCPeeringRoute(
+            ec2_gateways,
+            logger,
+            between=[vpc1, vpc2],
+            peering_relationship=vpc_peering_relationship,
+            route_tables=route_tables)
+
+        vpc_peering_route.provision()
+
+        route_tables.find_for.assert_called_once_with(vpc1)
+        ec2_gateway.resource().route_tables.filter.assert_not_called()
+        ec2_gateway.client().create_route.assert_called_with(
+            RouteTableId=vpc1_route_table.id,
+            DestinationCidrBlock=vpc2.cidr_block,
+            VpcPeeringConnectionId=vpc_peering_connection.id)
+
+
+class TestVPCPeeringRoutesReconciliation(unittest.TestCase):
+    def test_only_mutates_route_tables_that_differ(self):
+        account_id = randoms.account_id()
+        region = randoms.region()
+
+        vpc1 = VPC(mocks.build_vpc_response_mock(), account_id, region)
+        vpc2 = VPC(mocks.build_vpc_response_mock(), account_id, region)
+
+        ec2_gateway = mocks.EC2Gateway(account_id, region)
+        ec2_gateways = mocks.EC2Gateways([ec2_gateway])
+
+        logger = Mock()
+
+        vpc_peering_connection = Mock(name="VPC peering connection")
+        vpc_peering_connection.id = randoms.peering_connection_id()
+        vpc_peering_relationship = Mock()
+        vpc_peering_relationship.fetch = Mock(
+            return_value=vpc_peering_connection)
+
+        missing_route_table = mocks.build_route_table_mock(
+            name="Missing route table")
+        up_to_date_route_table = mocks.build_route_table_mock(
+            name="Up to date route table",
+            routes=[{'DestinationCidrBlock': vpc2.cidr_block,
+                     'VpcPeeringConnectionId': vpc_peering_connection.id,
+                     'State': 'active'}])
+        stale_route_table = mocks.build_route_table_mock(
+            name="Stale route table",
+            routes=[{'DestinationCidrBlock': vpc2.cidr_block,
+                     'VpcPeeringConnectionId':
+                         randoms.peering_connection_id(),
+                     'State': 'blackhole'}])
+        conflicting_route_table = mocks.build_route_table_mock(
+            name="Conflicting route table",
+            routes=[{'DestinationCidrBlock': vpc2.cidr_block,
+                     'GatewayId': 'igw-12345678',
+                     'State': 'active'}])
+
+        ec2_gateway.resource().route_tables.filter = Mock(
+            name="Filtered VPC route tables",
+            return_value=iter([
+                missing_route_table, up_to_date_route_table,
+                stale_route_table, conflicting_route_table]))
+
+        vpc_peering_route = VPCPeeringRoute(
+            ec2_gateways,
+            logger,
+            between=[vpc1, vpc2],
+            peering_relationship=vpc_peering_relationship)
+
+        counts = vpc_peering_route.provision()
+
+        ec2_gateway.client().create_route.assert_called_once_with(
+            RouteTableId=missing_route_table.id,
+            DestinationCidrBlock=vpc2.cidr_block,
+            VpcPeeringConnectionId=vpc_peering_connection.id)
+        ec2_gateway.client().replace_route.assert_called_once_with(
+            RouteTableId=stale_route_table.id,
+            DestinationCidrBlock=vpc2.cidr_block,
+            VpcPeeringConnectionId=vpc_peering_connection.id)
+        self.assertEqual(
+            counts,
+            {'created': 1, 'replaced': 1, 'skipped': 1, 'conflicting': 1,
+             'failed': 0})
+        logger.info.assert_any_call(
+            "Route reconciliation in: '%s' for '%s' complete. Created: %d, "
+            "replaced: %d, skipped: %d, conflicting: %d, failed: %d.",
+            vpc1.id, vpc2.cidr_block, 1, 1, 1, 1, 0)
+
+    def test_skips_route_creation_when_no_peering_connection_exists(self):
+        account_id = randoms.account_id()
+        region = randoms.region()
+
+        vpc1 = VPC(mocks.build_vpc_response_mock(), account_id, region)
+        vpc2 = VPC(mocks.build_vpc_response_mock(), account_id, region)
+
+        ec2_gateway = mocks.EC2Gateway(account_id, region)
+        ec2_gateways = mocks.EC2Gateways([ec2_gateway])
+
+        logger = Mock()
+
+        vpc_peering_relationship = Mock()
+        vpc_peering_relationship.fetch = Mock(return_value=None)
+
+        vpc_peering_route = VPCPeeringRoute(
+            ec2_gateways,
+            logger,
+            between=[vpc1, vpc2],
+            peering_relationship=vpc_peering_relationship)
+
+        vpc_peering_route.provision()
+
+        ec2_gateway.resource().route_tables.filter.assert_not_called()
+        logger.warn.assert_any_call(
+            "No peering connection between: '%s' and: '%s'. Skipping "
+            "route creation.",
+            vpc1.id, vpc2.id)
+
+
+class TestVPCPeeringRoutesMutationLimits(unittest.TestCase):
+    def test_bounds_concurrent_route_mutations_per_account_and_region(self):
+        account_id = randoms.account_id()
+        region = randoms.region()
+
+        vpc1 = VPC(mocks.build_vpc_response_mock(), account_id, region)
+        vpc2 = VPC(mocks.build_vpc_response_mock(), account_id, region)
+
+        ec2_gateway = mocks.EC2Gateway(account_id, region)
+        ec2_gateways = mocks.EC2Gateways([ec2_gateway])
+        logger = Mock()
+
+        lock = threading.Lock()
+        active = [0]
+        peak = [0]
+
+        def create_route(**_):
+            with lock:
+                active[0] += 1
+                peak[0] = max(peak[0], active[0])
+            threading.Event().wait(0.02)
+            with lock:
+                active[0] -= 1
+
+        route_tables = [
+            mocks.build_route_table_mock(name="VPC 1 route table %d" % index)
+            for index in range(6)]
+        ec2_gateway.client().create_route = Mock(side_effect=create_route)
+
+        ec2_gateway.resource().route_tables.filter = Mock(
+            name="Filtered VPC route tables",
+            return_value=route_tables)
+
+        vpc_peering_connection = Mock(name="VPC peering connection")
+        vpc_peering_relationship = Mock()
+        vpc_peering_relationship.fetch = Mock(
+            return_value=vpc_peering_connection)
+
+        mutation_limits = ConcurrencyLimits(2)
+
+        first_route = VPCPeeringRoute(
+            ec2_gateways,
+            logger,
+            between=[vpc1, vpc2],
+            peering_relationship=vpc_peering_relationship,
+            mutation_limits=mutation_limits)
+        second_route = VPCPeeringRoute(
+            ec2_gateways,
+            logger,
+            between=[vpc1, vpc2],
+            peering_relationship=vpc_peering_relationship,
+            mutation_limits=mutation_limits)
+
+        threads = [
+            threading.Thread(target=route.provision)
+            for route in [first_route, second_route]]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        created_in = [
+            kwargs['RouteTableId']
+            for _, kwargs
+            in ec2_gateway.client().create_route.call_args_list]
+        for route_table in route_tables:
+            self.assertEqual(created_in.count(route_table.id), 2)
+        self.assertEqual(peak[0], 2)
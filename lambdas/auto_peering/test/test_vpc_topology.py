@@ -0,0 +1,76 @@
+import unittest
+
+from auto_peering.vpc import VPC
+from auto_peering.vpc_topology import VPCTopology
+
+from test import randoms, mocks, builders
+
+
+def build_vpc(**kwargs):
+    return VPC(
+        mocks.build_vpc_response_mock(
+            name=kwargs.get('name', 'VPC'),
+            tags=builders.build_vpc_tags(**kwargs)),
+        randoms.account_id(),
+        randoms.region())
+
+
+class TestVPCTopology(unittest.TestCase):
+    def test_finds_vpc_by_component_instance_identifier(self):
+        vpc_1 = build_vpc(
+            component='thing1', deployment_identifier='gold')
+        vpc_2 = build_vpc(
+            component='thing2', deployment_identifier='silver')
+
+        topology = VPCTopology([vpc_1, vpc_2])
+
+        self.assertEqual(
+            topology.find_by_component_instance_identifier('thing2-silver'),
+            vpc_2)
+
+    def test_returns_none_for_unknown_component_instance_identifier(self):
+        topology = VPCTopology([
+            build_vpc(component='thing1', deployment_identifier='gold')])
+
+        self.assertIsNone(
+            topology.find_by_component_instance_identifier('thing2-silver'))
+
+    def test_prefers_first_discovered_vpc_for_duplicate_identifiers(self):
+        vpc_1 = build_vpc(
+            name='VPC 1', component='thing1', deployment_identifier='gold')
+        vpc_2 = build_vpc(
+            name='VPC 2', component='thing1', deployment_identifier='gold')
+
+        topology = VPCTopology([vpc_1, vpc_2])
+
+        self.assertEqual(
+            topology.find_by_component_instance_identifier('thing1-gold'),
+            vpc_1)
+
+    def test_finds_dependencies_in_dependency_order_ignoring_missing(self):
+        target_vpc = build_vpc(
+            dependencies=['thing3-bronze', 'missing-thing', 'thing2-silver'])
+        vpc_2 = build_vpc(
+            component='thing2', deployment_identifier='silver')
+        vpc_3 = build_vpc(
+            component='thing3', deployment_identifier='bronze')
+
+        topology = VPCTopology([target_vpc, vpc_2, vpc_3])
+
+        self.assertEqual(
+            topology.find_dependencies_of(target_vpc),
+            [vpc_3, vpc_2])
+
+    def test_finds_dependents_in_discovery_order(self):
+        target_vpc = build_vpc(
+            component='target', deployment_identifier='default',
+            dependencies=[])
+        vpc_1 = build_vpc(dependencies=['other-thing', 'target-default'])
+        vpc_2 = build_vpc(dependencies=[])
+        vpc_3 = build_vpc(dependencies=['target-default', 'target-default'])
+
+        topology = VPCTopology([vpc_1, target_vpc, vpc_2, vpc_3])
+
+        self.assertEqual(
+            topology.find_dependents_of(target_vpc),
+            [vpc_1, vpc_3])
@@ -3,10 +3,48 @@ import logging
 import json
 import os
 
+from botocore.config import Config
+
+from auto_peering.all_vpcs import (
+    AllVPCs,
+    DEFAULT_SEARCH_CONCURRENCY,
+    DEFAULT_DISCOVERY_MODE,
+    BUCKET_DISCOVERY,
+    TARGETED_DISCOVERY)
+from auto_peering.bucket_vpcs import BucketVPCs, DEFAULT_INVENTORY_PREFIX
+from auto_peering.ec2_gateway import DEFAULT_MAX_POOL_CONNECTIONS
+from auto_peering.event_coalescer import (
+    EventCoalescer,
+    DEFAULT_COALESCING_WINDOW_SECONDS)
+from auto_peering.event_stores import (
+    event_store_for,
+    DEFAULT_EVENT_STORE,
+    DEFAULT_EVENT_STORE_PATH)
 from auto_peering.ec2_gateways import EC2Gateways
-from auto_peering.s3_event_sns_message import S3EventSNSMessage
+from auto_peering.s3_event_sns_message import S3EventSNSMessages
+from auto_peering.s3_event_sqs_messages import S3EventSQSMessages
 from auto_peering.session_store import SessionStore
+from auto_peering.snapshot_stores import (
+    FileSystemSnapshotStore,
+    S3SnapshotStore,
+    FILESYSTEM_SNAPSHOT_STORE,
+    S3_SNAPSHOT_STORE,
+    DEFAULT_SNAPSHOT_STORE,
+    DEFAULT_SNAPSHOT_PATH,
+    DEFAULT_SNAPSHOT_KEY)
+from auto_peering.topology_cache import (
+    topology_cache,
+    DEFAULT_TOPOLOGY_CACHE_TTL_SECONDS)
+from auto_peering.topology_snapshots import TopologySnapshots
+from auto_peering.vpc_link_scheduler import (
+    VPCLinkScheduler,
+    DEFAULT_LINK_CONCURRENCY,
+    DEFAULT_LINK_REGION_CONCURRENCY)
 from auto_peering.vpc_links import VPCLinks
+from auto_peering.vpc_peering_relationships import (
+    BATCHED_PROVISIONING,
+    DEFAULT_PROVISIONING_MODE)
+from auto_peering.vpc_peering_route import DEFAULT_ROUTE_MUTATION_CONCURRENCY
 from auto_peering.utils import split_and_strip
 
 logging.getLogger('botocore').setLevel(logging.CRITICAL)
@@ -16,54 +54,321 @@ logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
 
-def peer_vpcs_for(event, _):
-    logger.info('Processing event: {}'.format(json.dumps(event)))
+class VPCPeeringError(Exception):
+    def __init__(self, failed_targets):
+        super(VPCPeeringError, self).__init__(
+            "Could not manage peering for: [%s]." % ', '.join(
+                "'{}' ('{}')".format(vpc_id, action)
+                for _, vpc_id, action in failed_targets))
+        self.failed_targets = failed_targets
+
+
+def targets_by_action(targets):
+    grouped = []
+    for account_id, vpc_id, action in targets:
+        if action not in ('provision', 'destroy'):
+            logger.info(
+                "Ignoring event with unknown action for '%s'.", vpc_id)
+            continue
+        if not grouped or grouped[-1][0] != action:
+            grouped.append((action, []))
+        grouped[-1][1].append((account_id, vpc_id))
+    return grouped
+
+
+def manage_links_for(vpc_links, scheduler, action, targets,
+                     provisioning_mode):
+    vpc_links_for_targets = vpc_links.resolve_for_all(targets)
+    logger.info(
+        "Found %d VPC links for VPCs with IDs: [%s].",
+        len(vpc_links_for_targets),
+        ', '.join("'{}'".format(vpc_id) for _, vpc_id in targets))
+
+    batched = \
+        action == 'provision' and \
+        provisioning_mode == BATCHED_PROVISIONING
+    if batched:
+        logger.info(
+            "Provisioning %d peering relationships in a batch.",
+            len(vpc_links_for_targets))
+        vpc_links.peering_relationships.provision([
+            vpc_link.peering_relationship
+            for vpc_link in vpc_links_for_targets])
+
+    return scheduler.run(
+        vpc_links_for_targets, action,
+        perform_relationships=not batched)
+
+
+def snapshot_store_for(kind, region):
+    if kind == S3_SNAPSHOT_STORE:
+        return S3SnapshotStore(
+            boto3.client('s3', region_name=region),
+            os.environ.get('AWS_TOPOLOGY_SNAPSHOT_BUCKET'),
+            os.environ.get('AWS_TOPOLOGY_SNAPSHOT_KEY') or
+            DEFAULT_SNAPSHOT_KEY)
+    if kind == FILESYSTEM_SNAPSHOT_STORE:
+        return FileSystemSnapshotStore(
+            os.environ.get('AWS_TOPOLOGY_SNAPSHOT_PATH') or
+            DEFAULT_SNAPSHOT_PATH)
+    return None
+
+
+def bucket_vpcs_for(targets, ec2_gateways, search_concurrency, region):
+    bucket = os.environ.get('AWS_INFRASTRUCTURE_EVENTS_BUCKET')
+    if not bucket:
+        logger.warn(
+            "No infrastructure events bucket configured. Falling back to "
+            "listing VPCs in EC2.")
+        return None
+
+    bucket_vpcs = BucketVPCs(
+        boto3.client('s3', region_name=region), bucket, ec2_gateways, logger,
+        prefix=(
+            os.environ.get('AWS_INFRASTRUCTURE_EVENTS_PREFIX') or
+            DEFAULT_INVENTORY_PREFIX),
+        read_metadata=(
+            os.environ.get('AWS_READ_INFRASTRUCTURE_EVENTS_METADATA') or
+            'false').lower() == 'true',
+        search_concurrency=search_concurrency)
+    vpcs = bucket_vpcs.find_all()
+    if vpcs is None:
+        return None
+
+    # The objects of destroyed VPCs are removed before their events arrive,
+    # so targets missing from the bucket are looked up in EC2.
+    found_vpc_ids = set(vpc.id for vpc in vpcs)
+    for account_id, vpc_id, _ in targets:
+        if vpc_id not in found_vpc_ids:
+            found_vpc_ids.add(vpc_id)
+            vpc = bucket_vpcs.all_vpcs.fetch_by_account_id_and_vpc_id(
+                account_id, vpc_id)
+            if vpc is not None:
+                vpcs.append(vpc)
+
+    return vpcs
+
+
+def cached_topology_for(key, ttl_seconds, targets, ec2_gateways,
+                        search_concurrency, topology_snapshots=None):
+    if ttl_seconds <= 0:
+        return None
+
+    cached_topology = topology_cache.get(key, ttl_seconds)
+    if cached_topology is None and topology_snapshots is not None:
+        snapshot = topology_snapshots.load(
+            key, ttl_seconds, topology_cache.clock())
+        if snapshot is not None:
+            cached_topology = topology_cache.put(
+                key, snapshot.vpcs, snapshot.peering_connections,
+                built_at=snapshot.built_at)
+    if cached_topology is None:
+        return None
+
+    if cached_topology.vpcs is not None:
+        all_vpcs = AllVPCs(
+            ec2_gateways, logger, search_concurrency=search_concurrency)
+        provisioned_vpcs = [
+            all_vpcs.fetch_by_account_id_and_vpc_id(account_id, vpc_id)
+            for account_id, vpc_id, action in targets
+            if action == 'provision'
+        ]
+        topology_cache.update(
+            [vpc for vpc in provisioned_vpcs if vpc is not None])
+
+    logger.info(
+        "Reusing topology cached %d seconds ago.",
+        topology_cache.clock() - cached_topology.built_at)
+
+    return cached_topology
+
+
+def manage_peering_for(targets):
+    coalescing_window_seconds = float(
+        os.environ.get('AWS_COALESCING_WINDOW_SECONDS') or
+        DEFAULT_COALESCING_WINDOW_SECONDS)
+    event_store = event_store_for(
+        os.environ.get('AWS_EVENT_STORE') or DEFAULT_EVENT_STORE,
+        os.environ.get('AWS_EVENT_STORE_PATH') or DEFAULT_EVENT_STORE_PATH)
+    event_coalescer = EventCoalescer(
+        event_store, logger,
+        window_seconds=coalescing_window_seconds)
+
+    targets = event_coalescer.coalesce(targets)
+    if not targets:
+        logger.info("No events left to process after coalescing.")
+        return []
 
     default_region = os.environ.get('AWS_REGION')
     default_peering_role_name = 'vpc-auto-peering-role'
 
-    sts_client = boto3.client('sts')
+    search_concurrency = int(
+        os.environ.get('AWS_SEARCH_CONCURRENCY') or
+        DEFAULT_SEARCH_CONCURRENCY)
+
+    sts_client = boto3.client(
+        'sts',
+        region_name=default_region,
+        config=Config(max_pool_connections=search_concurrency))
     current_account_id = sts_client.get_caller_identity()["Account"]
 
     search_regions = split_and_strip(
         os.environ.get('AWS_SEARCH_REGIONS') or default_region)
     search_accounts = split_and_strip(
         os.environ.get('AWS_SEARCH_ACCOUNTS') or current_account_id)
+    max_pool_connections = int(
+        os.environ.get('AWS_EC2_MAX_POOL_CONNECTIONS') or
+        DEFAULT_MAX_POOL_CONNECTIONS)
+    route_mutation_concurrency = int(
+        os.environ.get('AWS_ROUTE_MUTATION_CONCURRENCY') or
+        DEFAULT_ROUTE_MUTATION_CONCURRENCY)
+    link_concurrency = int(
+        os.environ.get('AWS_LINK_CONCURRENCY') or
+        DEFAULT_LINK_CONCURRENCY)
+    link_region_concurrency = int(
+        os.environ.get('AWS_LINK_REGION_CONCURRENCY') or
+        DEFAULT_LINK_REGION_CONCURRENCY)
+    discovery_mode = \
+        os.environ.get('AWS_DISCOVERY_MODE') or DEFAULT_DISCOVERY_MODE
+    provisioning_mode = \
+        os.environ.get('AWS_PROVISIONING_MODE') or DEFAULT_PROVISIONING_MODE
     peering_role_name = \
         os.environ.get('AWS_PEERING_ROLE_NAME') or default_peering_role_name
+    skip_assume_role_in_current_account = \
+        (os.environ.get('AWS_SKIP_ASSUME_ROLE_IN_CURRENT_ACCOUNT') or
+         'false').lower() == 'true'
+    topology_cache_ttl_seconds = float(
+        os.environ.get('AWS_TOPOLOGY_CACHE_TTL_SECONDS') or
+        DEFAULT_TOPOLOGY_CACHE_TTL_SECONDS)
+    snapshot_store = snapshot_store_for(
+        os.environ.get('AWS_TOPOLOGY_SNAPSHOT_STORE') or
+        DEFAULT_SNAPSHOT_STORE,
+        default_region)
 
-    session_store = SessionStore(sts_client, peering_role_name)
-    ec2_gateways = EC2Gateways(session_store, search_accounts, search_regions)
+    session_store = SessionStore(
+        sts_client, peering_role_name,
+        ambient_account_id=(
+            current_account_id
+            if skip_assume_role_in_current_account
+            else None))
+    failed_prefetches = session_store.prefetch_credentials_for(
+        search_accounts, search_concurrency)
+    for account_id, error in failed_prefetches:
+        logger.warn(
+            "Could not assume peering role in account: '%s'. Skipping it "
+            "for this invocation. Error was: %s",
+            account_id, error)
 
-    s3_event_sns_message = S3EventSNSMessage(event)
-    target_account_id = s3_event_sns_message.account_id()
-    target_vpc_id = s3_event_sns_message.vpc_id()
-    action = s3_event_sns_message.action()
-    logger.info(
-        "'%s'ing peering connections for '%s'.",
-        action,
-        target_vpc_id)
+    # Accounts whose peering role cannot be assumed are left out of the
+    # search, and their targets reported as failed, so that one broken
+    # account does not abort the work in every other.
+    unreachable_account_ids = set(
+        account_id for account_id, _ in failed_prefetches)
+    search_accounts = [
+        account_id
+        for account_id in search_accounts
+        if account_id not in unreachable_account_ids]
+    unreachable_targets = [
+        target for target in targets
+        if target[0] in unreachable_account_ids]
+    targets = [
+        target for target in targets
+        if target[0] not in unreachable_account_ids]
 
-    vpc_links = VPCLinks(ec2_gateways, logger)
-    logger.info(
-        "Looking up VPC links for VPC with ID: '%s'.",
-        target_vpc_id)
+    ec2_gateways = EC2Gateways(
+        session_store, search_accounts, search_regions,
+        max_pool_connections=max_pool_connections)
+    topology_snapshots = \
+        TopologySnapshots(
+            snapshot_store, ec2_gateways, logger,
+            search_concurrency=search_concurrency) \
+        if snapshot_store is not None \
+        else None
 
-    vpc_links_for_target = vpc_links.resolve_for(
-        target_account_id, target_vpc_id)
-    logger.info(
-        "Found %d VPC links for VPC with ID: '%s'.",
-        len(vpc_links_for_target), target_vpc_id)
+    topology_key = (
+        tuple(search_accounts), tuple(search_regions),
+        peering_role_name, discovery_mode)
+    cached_topology = cached_topology_for(
+        topology_key, topology_cache_ttl_seconds, targets, ec2_gateways,
+        search_concurrency, topology_snapshots)
+    vpcs = cached_topology.vpcs if cached_topology else None
+    if vpcs is None and discovery_mode == BUCKET_DISCOVERY:
+        vpcs = bucket_vpcs_for(
+            targets, ec2_gateways, search_concurrency, default_region)
 
-    for vpc_link in vpc_links_for_target:
-        logger.info(
-            "Managing peering relationship between '%s' and '%s'.",
-            vpc_link.vpc1.id,
-            vpc_link.vpc2.id)
-        vpc_link.peering_relationship.perform(action)
+    vpc_links = VPCLinks(
+        ec2_gateways, logger,
+        search_concurrency=search_concurrency,
+        discovery_mode=discovery_mode,
+        route_mutation_concurrency=route_mutation_concurrency,
+        vpcs=vpcs,
+        peering_connections=(
+            cached_topology.peering_connections
+            if cached_topology
+            else None))
+    scheduler = VPCLinkScheduler(
+        logger,
+        concurrency=link_concurrency,
+        region_concurrency=link_region_concurrency)
 
+    failed_targets = []
+    for action, action_targets in targets_by_action(targets):
+        target_vpc_ids = [vpc_id for _, vpc_id in action_targets]
         logger.info(
-            "Managing peering routes between '%s' and '%s'.",
-            vpc_link.vpc1.id,
-            vpc_link.vpc2.id)
-        vpc_link.peering_routes.perform(action)
+            "'%s'ing peering connections for [%s].",
+            action,
+            ', '.join("'{}'".format(vpc_id) for vpc_id in target_vpc_ids))
+
+        summary = manage_links_for(
+            vpc_links, scheduler, action, action_targets, provisioning_mode)
+
+        failed_targets.extend(
+            (account_id, vpc_id, action)
+            for account_id, vpc_id in action_targets
+            if vpc_id in summary['failed_vpc_ids'])
+
+    if topology_cache_ttl_seconds > 0:
+        if cached_topology is None:
+            topology_cache.put(
+                topology_key,
+                vpc_links.all_vpcs.find_all()
+                if discovery_mode != TARGETED_DISCOVERY
+                else None,
+                vpc_links.peering_connections)
+        topology_cache.evict(
+            vpc_id
+            for account_id, vpc_id, action in targets
+            if action == 'destroy' and
+            (account_id, vpc_id, action) not in failed_targets)
+
+        current_topology = topology_cache.get(
+            topology_key, topology_cache_ttl_seconds)
+        if topology_snapshots is not None and current_topology is not None \
+                and topology_cache.dirty:
+            topology_snapshots.save(current_topology)
+            topology_cache.mark_saved()
+
+    event_coalescer.record(
+        (account_id, vpc_id, action)
+        for action, action_targets in targets_by_action(targets)
+        for account_id, vpc_id in action_targets
+        if (account_id, vpc_id, action) not in failed_targets)
+
+    return unreachable_targets + failed_targets
+
+
+def peer_vpcs_for(event, _):
+    logger.info('Processing event: {}'.format(json.dumps(event)))
+
+    # Raising hands the event back to Lambda's asynchronous retries. Targets
+    # that succeeded are safe to run again as provisioning and destroying
+    # are idempotent.
+    failed_targets = manage_peering_for(S3EventSNSMessages(event).targets())
+    if failed_targets:
+        raise VPCPeeringError(failed_targets)
+
+
+def peer_vpcs_for_queue_messages(event, _):
+    logger.info('Processing event: {}'.format(json.dumps(event)))
+
+    return S3EventSQSMessages(event, logger).process_with(manage_peering_for)
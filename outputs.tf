@@ -1,3 +1,11 @@
 output "lambda_role_arn" {
   value = aws_iam_role.vpc_auto_peering_lambda.arn
 }
+
+output "infrastructure_events_queue_arn" {
+  value = var.use_queue_trigger ? aws_sqs_queue.infrastructure_events[0].arn : ""
+}
+
+output "infrastructure_events_dead_letter_queue_arn" {
+  value = var.use_queue_trigger ? aws_sqs_queue.infrastructure_events_dead_letter[0].arn : ""
+}
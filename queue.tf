@@ -0,0 +1,66 @@
+resource "aws_sqs_queue" "infrastructure_events_dead_letter" {
+  count = var.use_queue_trigger ? 1 : 0
+
+  name = "vpc-auto-peering-events-dlq-${var.region}-${var.deployment_identifier}"
+  message_retention_seconds = 1209600
+}
+
+resource "aws_sqs_queue" "infrastructure_events" {
+  count = var.use_queue_trigger ? 1 : 0
+
+  name = "vpc-auto-peering-events-${var.region}-${var.deployment_identifier}"
+  visibility_timeout_seconds = 6 * aws_lambda_function.auto_peering.timeout
+  message_retention_seconds = 1209600
+
+  redrive_policy = jsonencode({
+    deadLetterTargetArn = aws_sqs_queue.infrastructure_events_dead_letter[0].arn
+    maxReceiveCount = var.queue_max_receive_count
+  })
+}
+
+data "aws_iam_policy_document" "infrastructure_events_queue_policy" {
+  count = var.use_queue_trigger ? 1 : 0
+
+  statement {
+    effect = "Allow"
+    resources = [aws_sqs_queue.infrastructure_events[0].arn]
+
+    actions = ["sqs:SendMessage"]
+
+    principals {
+      identifiers = ["sns.amazonaws.com"]
+      type = "Service"
+    }
+
+    condition {
+      test = "ArnEquals"
+      variable = "aws:SourceArn"
+      values = [var.infrastructure_events_topic_arn]
+    }
+  }
+}
+
+resource "aws_sqs_queue_policy" "infrastructure_events" {
+  count = var.use_queue_trigger ? 1 : 0
+
+  queue_url = aws_sqs_queue.infrastructure_events[0].id
+  policy = data.aws_iam_policy_document.infrastructure_events_queue_policy[0].json
+}
+
+resource "aws_sns_topic_subscription" "infrastructure_events_topic_auto_peering_queue" {
+  count = var.use_queue_trigger ? 1 : 0
+
+  topic_arn = var.infrastructure_events_topic_arn
+  protocol = "sqs"
+  endpoint = aws_sqs_queue.infrastructure_events[0].arn
+}
+
+resource "aws_lambda_event_source_mapping" "infrastructure_events_queue_auto_peering_lambda" {
+  count = var.use_queue_trigger ? 1 : 0
+
+  event_source_arn = aws_sqs_queue.infrastructure_events[0].arn
+  function_name = aws_lambda_function.auto_peering.arn
+  batch_size = var.queue_batch_size
+  maximum_batching_window_in_seconds = var.queue_maximum_batching_window_in_seconds
+  function_response_types = ["ReportBatchItemFailures"]
+}
@@ -1,4 +1,6 @@
 resource "aws_lambda_permission" "infrastructure_events_topic_auto_peering_lambda" {
+  count = var.use_queue_trigger ? 0 : 1
+
   statement_id = "AllowExecutionFromSNS"
   action = "lambda:InvokeFunction"
   function_name = aws_lambda_function.auto_peering.arn
@@ -7,6 +9,8 @@ resource "aws_lambda_permission" "infrastructure_events_topic_auto_peering_lambd
 }
 
 resource "aws_sns_topic_subscription" "infrastructure_events_topic_auto_peering_lambda" {
+  count = var.use_queue_trigger ? 0 : 1
+
   topic_arn = var.infrastructure_events_topic_arn
   protocol = "lambda"
   endpoint = aws_lambda_function.auto_peering.arn
@@ -22,8 +22,118 @@ variable "search_accounts" {
   type = list(string)
   default = []
 }
+variable "search_concurrency" {
+  description = "The maximum number of account and region pairs to search for VPCs concurrently."
+  type = number
+  default = 10
+}
+variable "ec2_max_pool_connections" {
+  description = "The maximum number of HTTP connections to keep open to EC2 per account and region."
+  type = number
+  default = 10
+}
+variable "route_mutation_concurrency" {
+  description = "The maximum number of route creations, replacements and deletions to perform concurrently per account and region."
+  type = number
+  default = 5
+}
+variable "link_concurrency" {
+  description = "The maximum number of peering relationship and route tasks to run concurrently."
+  type = number
+  default = 5
+}
+variable "link_region_concurrency" {
+  description = "The maximum number of peering relationship and route tasks to run concurrently per region."
+  type = number
+  default = 3
+}
+variable "discovery_mode" {
+  description = "How to discover related VPCs: \"full\" lists every VPC in every search account and region, \"targeted\" queries for related VPCs using EC2 filters, \"bucket\" lists the VPC objects in the infrastructure events bucket."
+  type = string
+  default = "full"
+}
+variable "infrastructure_events_bucket_name" {
+  description = "The S3 bucket whose object events are published to the infrastructure events topic, listed when discovery_mode is \"bucket\"."
+  type = string
+  default = ""
+}
+variable "infrastructure_events_prefix" {
+  description = "The key prefix of the VPC objects in the infrastructure events bucket."
+  type = string
+  default = "vpc-existence/"
+}
+variable "read_infrastructure_events_metadata" {
+  description = "Whether to build VPCs from the region, cidr-block, component, deployment-identifier and dependencies metadata of the VPC objects, only looking up VPCs without it in EC2."
+  type = bool
+  default = false
+}
+variable "provisioning_mode" {
+  description = "How to provision peering connections: \"serial\" requests, waits for and accepts one connection at a time, \"batched\" requests all connections, waits for them together and accepts them concurrently."
+  type = string
+  default = "serial"
+}
+variable "coalescing_window_seconds" {
+  description = "The window within which repeated events for the same VPC are collapsed and create/destroy pairs are dropped. 0 disables coalescing."
+  type = number
+  default = 0
+}
+variable "event_store" {
+  description = "Where coalescing state is kept between warm invocations: \"memory\" or \"sqlite\" (a database file under /tmp)."
+  type = string
+  default = "memory"
+}
+variable "event_store_path" {
+  description = "The path of the coalescing state database when event_store is \"sqlite\"."
+  type = string
+  default = "/tmp/vpc-auto-peering-events.sqlite"
+}
+variable "topology_cache_ttl_seconds" {
+  description = "How long discovered VPCs and peering connections are reused across warm invocations, in seconds (0 disables)."
+  type = number
+  default = 0
+}
+variable "topology_snapshot_store" {
+  description = "Where the discovered topology is persisted between cold starts: \"none\", \"filesystem\" (a file under /tmp) or \"s3\". Requires topology_cache_ttl_seconds."
+  type = string
+  default = "none"
+}
+variable "topology_snapshot_bucket" {
+  description = "The S3 bucket holding the topology snapshot when topology_snapshot_store is \"s3\"."
+  type = string
+  default = ""
+}
+variable "topology_snapshot_key" {
+  description = "The S3 key of the topology snapshot when topology_snapshot_store is \"s3\"."
+  type = string
+  default = "vpc-auto-peering/topology.json.gz"
+}
 variable "peering_role_name" {
   description = "The name of the role to assume to create peering relationships and routes."
   type = string
   default = ""
 }
+variable "skip_assume_role_in_current_account" {
+  description = "Whether to use the lambda's own role, rather than the peering role, in the account the lambda is deployed into. When true, the lambda role is granted the EC2 permissions needed for peering."
+  type = bool
+  default = false
+}
+variable "use_queue_trigger" {
+  description = "Whether to deliver infrastructure events to the lambda in batches through an SQS queue, rather than invoking it directly from SNS."
+  type = bool
+  default = false
+}
+variable "queue_batch_size" {
+  description = "The maximum number of queued events to deliver to the lambda in one batch."
+  type = number
+  default = 10
+}
+variable "queue_maximum_batching_window_in_seconds" {
+  description = "The maximum time to wait while gathering a batch of queued events."
+  type = number
+  default = 30
+}
+variable "queue_max_receive_count" {
+  description = "The number of times a queued event is received before it is moved to the dead letter queue. The lambda runs one invocation at a time, so receives throttled while another batch is processed count too, each costing a visibility timeout (six lambda timeouts). Lower values move events that always fail to the dead letter queue sooner, at the risk of moving valid events there during a backlog."
+  type = number
+  default = 100
+}